@@ -16,7 +16,7 @@ from config import BenchmarkConfig
 
 ensure_project_root_on_path()
 
-from src.mvo_compiler.mvo_compiler import compile
+from src.mvo_compiler.mvo_compiler import compile_many
 
 def _generate_script_from_template(template_path: Path, output_path: Path, loop_count: int):
     """
@@ -30,6 +30,37 @@ def prepare_target(target_name: str, result_dir: Path, config: BenchmarkConfig,
     """
     Prepare the specified benchmark target.
     """
+    return prepare_targets([(target_name, result_dir, compile_strategy)], config)[0]
+
+def prepare_targets(targets: list[tuple[str, Path, str]], config: BenchmarkConfig) -> list[bool]:
+    """
+    Prepare (target name, result directory, strategy) entries together.
+    All transpilations run as one compile_many() batch; returns whether each entry was prepared.
+    """
+    plans = [_plan_target(target_name, result_dir, config, compile_strategy) for target_name, result_dir, compile_strategy in targets]
+    jobs = [plan[0] for plan in plans if plan is not None]
+    log(f"Transpile {len(jobs)} target(s) in one batch")
+    compile_results = iter(compile_many(jobs))
+
+    prepared = []
+    for plan in plans:
+        if plan is None:
+            prepared.append(False)
+            continue
+        compile_result = next(compile_results)
+        if not compile_result.succeeded:
+            log(f"Error: Failed to transpile {compile_result.input_dir}: {compile_result.error}")
+            prepared.append(False)
+            continue
+        log(f"  Transpiled {compile_result.input_dir} in {compile_result.elapsed_ms:.1f} ms")
+        plan[1]()
+        prepared.append(True)
+    return prepared
+
+def _plan_target(target_name: str, result_dir: Path, config: BenchmarkConfig, compile_strategy: str):
+    """
+    Return the compile job of a target and the step that finishes its preparation after the transpile.
+    """
     log(f"Preparing files: target={target_name}, mode={config.mode}, strategy={compile_strategy}")
     base_path = TARGETS_ROOT / MODE_DIR_MAP[config.mode]
 
@@ -41,39 +72,43 @@ def prepare_target(target_name: str, result_dir: Path, config: BenchmarkConfig,
 
         if not mvo_source_path.is_dir() or not vanilla_source_path.is_dir():
             log(f"Error: Benchmark target '{target_name}' is incomplete.")
-            return False
+            return None
 
         transpiled_run_path = result_dir / TRANSPILED_DIR_NAME
         vanilla_run_path = result_dir / VANILLA_DIR_NAME
         transpiled_run_path.mkdir(parents=True)
         vanilla_run_path.mkdir(parents=True)
-        
-        # 1. Transpile & Copy
-        log(f"  Transpile: {mvo_source_path} -> {transpiled_run_path}")
-        compile(mvo_source_path, transpiled_run_path)
-        log(f"  Copy: {vanilla_source_path} -> {vanilla_run_path}")
-        shutil.copytree(vanilla_source_path, vanilla_run_path, dirs_exist_ok=True)
-        
-        # 2. Generate Scripts from templates
-        log(f"  Generate templates (loop={config.loop_count})")
-        _generate_script_from_template(
-            transpiled_run_path / "main.py", 
-            transpiled_run_path / "main.py", 
-            config.loop_count
-        )
-        _generate_script_from_template(
-            vanilla_source_path / "main.py", 
-            vanilla_run_path / "main.py",
-            config.loop_count
-        )
-    else:
-        mvo_source_path = target_path
-        transpiled_run_path = result_dir
+
+        def finish():
+            # 1. Copy
+            log(f"  Copy: {vanilla_source_path} -> {vanilla_run_path}")
+            shutil.copytree(vanilla_source_path, vanilla_run_path, dirs_exist_ok=True)
+
+            # 2. Generate Scripts from templates
+            log(f"  Generate templates (loop={config.loop_count})")
+            _generate_script_from_template(
+                transpiled_run_path / "main.py", 
+                transpiled_run_path / "main.py", 
+                config.loop_count
+            )
+            _generate_script_from_template(
+                vanilla_source_path / "main.py", 
+                vanilla_run_path / "main.py",
+                config.loop_count
+            )
+
         log(f"  Transpile: {mvo_source_path} -> {transpiled_run_path}")
-        compile(mvo_source_path, transpiled_run_path, version_selection_strategy=compile_strategy)
+        return (mvo_source_path, transpiled_run_path, {}), finish
+
+    mvo_source_path = target_path
+    transpiled_run_path = result_dir
+
+    def finish():
         _generate_script_from_template(
             transpiled_run_path / "main.py", 
             transpiled_run_path / "main.py", 
             SWITCH_LOOP_COUNT
         )
-    return True
+
+    log(f"  Transpile: {mvo_source_path} -> {transpiled_run_path}")
+    return (mvo_source_path, transpiled_run_path, {"version_selection_strategy": compile_strategy}), finish
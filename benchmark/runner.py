@@ -7,7 +7,7 @@ from bench_constants import MODE_DIR_MAP, RESULTS_CSV_NAME, STRATEGY_CONTINUITY,
 from bench_log import log
 from bench_paths import RESULTS_ROOT, TARGETS_ROOT
 from config import BenchmarkConfig
-from preparer import prepare_target
+from preparer import prepare_targets
 from executor import execute_and_measure, execute_and_measure_for_switch_count
 
 
@@ -43,34 +43,43 @@ def run_benchmarks(bench_config: BenchmarkConfig) -> Path | None:
     targets_to_run = _resolve_targets(bench_config)
     log(f"Targets to run ({bench_config.mode}): {', '.join(targets_to_run) if targets_to_run else '(none)'}")
 
-    # 3. 各ターゲットについて「準備」と「測定」を順番に実行
+    # 3. 全ターゲットをまとめて「準備」してから、順番に「測定」
     if bench_config.mode == 'switch':
-        for target_name in targets_to_run:
-            log(f"Preparing target: {target_name} (continuity)")
-            target_result_dir0 = result_dir / target_name / STRATEGY_CONTINUITY
-            target_result_dir1 = result_dir / target_name / STRATEGY_LATEST
-            if not prepare_target(target_name, target_result_dir0, bench_config, compile_strategy=STRATEGY_CONTINUITY):
-                log(f"Skipped target: {target_name} (continuity)")
-                continue
-            log(f"Preparing target: {target_name} (latest)")
-            if not prepare_target(target_name, target_result_dir1, bench_config, compile_strategy=STRATEGY_LATEST):
-                log(f"Skipped target: {target_name} (latest)")
+        strategies = (STRATEGY_CONTINUITY, STRATEGY_LATEST)
+        log(f"Preparing {len(targets_to_run)} target(s) ({', '.join(strategies)})")
+        prepared = prepare_targets(
+            [
+                (target_name, result_dir / target_name / strategy, strategy)
+                for target_name in targets_to_run
+                for strategy in strategies
+            ],
+            bench_config,
+        )
+        for i, target_name in enumerate(targets_to_run):
+            skipped = [
+                strategy for strategy, ok in zip(strategies, prepared[i * len(strategies):(i + 1) * len(strategies)])
+                if not ok
+            ]
+            if skipped:
+                log(f"Skipped target: {target_name} ({', '.join(skipped)})")
                 continue
 
             log(f"Executing target: {target_name} (switch count)")
             result = execute_and_measure_for_switch_count(target_name, result_dir / target_name, bench_config)
             results_data.append(result)
     else:
-        for target_name in targets_to_run:
-            log(f"Preparing target: {target_name}")
-            target_result_dir = result_dir / target_name
-            
-            if not prepare_target(target_name, target_result_dir, bench_config):
+        log(f"Preparing {len(targets_to_run)} target(s)")
+        prepared = prepare_targets(
+            [(target_name, result_dir / target_name, STRATEGY_CONTINUITY) for target_name in targets_to_run],
+            bench_config,
+        )
+        for target_name, ok in zip(targets_to_run, prepared):
+            if not ok:
                 log(f"Skipped target: {target_name}")
                 continue
             
             log(f"Executing target: {target_name}")
-            result = execute_and_measure(target_name, target_result_dir, bench_config)
+            result = execute_and_measure(target_name, result_dir / target_name, bench_config)
             results_data.append(result)
     
     # 4. 総合結果をCSVファイルに保存
@@ -1,7 +1,7 @@
 import argparse
 from pathlib import Path
 
-from mvo_compiler.mvo_compiler import compile, execute
+from mvo_compiler.mvo_compiler import compile, execute, watch
 from mvo_compiler.util import logger
 from mvo_compiler.util.constants import DEFAULT_VERSION_SELECTION_STRATEGY, VERSION_SELECTION_STRATEGIES
 
@@ -15,26 +15,68 @@ def main():
     parser.add_argument(
         "--strategy",
         choices=list(VERSION_SELECTION_STRATEGIES),
-        default=DEFAULT_VERSION_SELECTION_STRATEGY,
-        help="Version selection strategy (default: continuity).",
+        default=None,
+        help=(
+            "Version selection strategy: continuity, latest, adaptive or static "
+            f"(default: [tool.mvo] strategy, otherwise {DEFAULT_VERSION_SELECTION_STRATEGY})."
+        ),
     )
     parser.add_argument("--debug", action="store_true", help="Enable debug logging.")
+    parser.add_argument("--report", action="store_true", help="Print optimization reports.")
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running, recompiling and re-running the entry file whenever the target directory changes.",
+    )
+    parser.add_argument(
+        "--socket", type=Path, default=None,
+        help="With --watch, accept status/build/run/stop commands on this UNIX socket.",
+    )
+    parser.add_argument(
+        "--in-process", action="store_true",
+        help="Run the generated entry file inside this process instead of starting a new interpreter.",
+    )
+    parser.add_argument(
+        "--log-json", type=Path, default=None,
+        help="Append structured compiler events (per-class and per-module timings, messages) to this JSON Lines file.",
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=None,
+        help="Reuse generated classes from this transform cache directory (default: $MVO_CACHE_DIR, otherwise [tool.mvo] cache_dir).",
+    )
     
     args = parser.parse_args()
 
+    if args.log_json:
+        logger.open_event_sink(args.log_json)
     if args.debug:
-        logger.DEBUG_MODE = True
+        logger.set_level(logger.DEBUG)
         logger.debug_log("Debug mode enabled.")
-    
+    elif args.report:
+        logger.set_level(logger.REPORT)
+
+    if args.watch:
+        watch(
+            input_dir=INPUT_BASE_PATH / args.target_dir,
+            output_dir=OUTPUT_BASE_PATH,
+            version_selection_strategy=args.strategy,
+            entry_file=ENTRY_FILE_NAME,
+            socket_path=args.socket,
+            cache_dir=args.cache_dir,
+            in_process=args.in_process,
+        )
+        return
+
     compile(
         input_dir=INPUT_BASE_PATH / args.target_dir,
         output_dir=OUTPUT_BASE_PATH,
         version_selection_strategy=args.strategy,
-        delete_output_dir=True
+        delete_output_dir=True,
+        cache_dir=args.cache_dir,
     )
     output = execute(
         entry_file=ENTRY_FILE_NAME,
-        dir=OUTPUT_BASE_PATH
+        dir=OUTPUT_BASE_PATH,
+        in_process=args.in_process,
     )
     logger.log(output)
 
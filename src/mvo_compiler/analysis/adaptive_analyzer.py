@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+
+from ..symbol_table.class_info import ClassInfo
+from ..util.ast_util import get_sync_function_version_info
+from ..util.constants import (
+    ADAPTIVE_PINGPONG_THRESHOLD,
+    INITIALIZE_METHOD_NAME,
+    SYNC_OPTION_ADAPTIVE_THRESHOLD,
+)
+from ..util import logger
+
+@dataclass
+class AdaptivePlan:
+    """adaptive 戦略でミス時の往復（ping-pong）に対処するための静的な情報を保持する。"""
+    class_name: str
+    # 往復と判定するまでの連続した逆向きのミス回数
+    threshold: int = ADAPTIVE_PINGPONG_THRESHOLD
+    # (直前にミスしたメソッド, 今回ミスしたメソッド) -> 両方を定義するバージョン
+    cover_versions: dict[tuple[str, str], int] = field(default_factory=dict)
+    # 同期関数を伴わない (現在のバージョン, 切替先) の組。切り替えずに切替先の実装を借りられる
+    borrowable_pairs: set[tuple[int, int]] = field(default_factory=set)
+
+def analyze_adaptive_switching(
+    class_info: ClassInfo,
+    state_sync_components: tuple | None,
+) -> AdaptivePlan:
+    """
+    adaptive 戦略のスタブが実行時に使う表を求める。
+
+    2つのメソッドのミスが交互に続く場合、両方を定義するバージョンがあればそこへ切り替える。
+    なければ、同期関数のない切替に限り、切り替えずに切替先のバージョンの実装を呼び出す。
+    """
+    plan = AdaptivePlan(
+        class_name=class_info.class_name,
+        threshold=_get_threshold(state_sync_components),
+    )
+
+    # --- 交互にミスするメソッドの組を両方定義するバージョン ---
+    defining_versions = {
+        method_name: {int(m.version) for m in overloads}
+        for method_name, overloads in class_info.methods.items()
+        if method_name != INITIALIZE_METHOD_NAME and class_info.has_consistent_signature(method_name)
+    }
+    all_versions = {int(v) for v in class_info.get_all_versions()}
+    for first_name, first_versions in defining_versions.items():
+        for second_name, second_versions in defining_versions.items():
+            if first_name == second_name:
+                continue
+            covers = first_versions & second_versions
+            # 定義バージョンが同じ組は互いのミスで往復しない
+            if covers and first_versions != second_versions:
+                plan.cover_versions[(first_name, second_name)] = min(covers)
+
+    # --- 同期関数を伴わない切替 ---
+    synced_pairs = set()
+    for func_node in (state_sync_components[1] if state_sync_components else []):
+        from_ver, to_ver = get_sync_function_version_info(func_node)
+        if from_ver is not None:
+            synced_pairs.add((from_ver, to_ver))
+    plan.borrowable_pairs = {
+        (current, target)
+        for current in all_versions for target in all_versions
+        if current != target and (current, target) not in synced_pairs
+    }
+    return plan
+
+
+# --- ヘルパー関数 ---
+def _get_threshold(state_sync_components: tuple | None) -> int:
+    if not state_sync_components:
+        return ADAPTIVE_PINGPONG_THRESHOLD
+    threshold = state_sync_components[2].get(SYNC_OPTION_ADAPTIVE_THRESHOLD, ADAPTIVE_PINGPONG_THRESHOLD)
+    if not isinstance(threshold, int) or isinstance(threshold, bool) or threshold < 1:
+        logger.warning_log(f"Ignoring {SYNC_OPTION_ADAPTIVE_THRESHOLD}: expected a positive integer.")
+        return ADAPTIVE_PINGPONG_THRESHOLD
+    return threshold
@@ -0,0 +1,120 @@
+import ast
+from dataclasses import dataclass, field
+
+from ..symbol_table.class_info import ClassInfo
+from ..symbol_table.method_info import MethodInfo
+from ..util.ast_util import UNVERSIONED_CLASS_TAG
+from ..util.constants import INITIALIZE_METHOD_NAME, VERSION_SELECTION_LATEST
+
+@dataclass
+class CollapsePlan:
+    """通常クラスへ縮退できる統合クラスの情報を保持する。"""
+    class_name: str
+    reason: str
+    bases: list[str] = field(default_factory=list)
+    methods: list[MethodInfo] = field(default_factory=list)
+
+def analyze_collapsibility(
+    class_info: ClassInfo,
+    state_sync_components: tuple | None,
+    incompatibility: dict | None,
+    version_selection_strategy: str,
+    is_versioned_parent: bool = False,
+) -> CollapsePlan | None:
+    """
+    マルチバージョン化が不要な統合クラスを検出し、縮退計画を返す。
+
+    縮退できるのは次のいずれかの場合:
+      - バージョンが1つしかない
+      - 全バージョンが同じフィールド・同じメソッド集合・一致するシグネチャを持ち、
+        どのメソッド呼び出しでも切替が発生しない
+    縮退できない場合は None を返す。
+    """
+    if is_versioned_parent or incompatibility:
+        return None
+    if state_sync_components and state_sync_components[1]:
+        return None
+
+    versions = sorted(class_info.get_all_versions(), key=int)
+    if not versions:
+        return None
+
+    bases = _get_common_unversioned_bases(class_info, versions)
+    if bases is None:
+        return None
+
+    if len(versions) == 1:
+        return CollapsePlan(
+            class_name=class_info.class_name,
+            reason="single version",
+            bases=bases,
+            methods=class_info.get_methods_for_version(versions[0]),
+        )
+
+    # --- 全バージョンが同一のメソッド集合を持つか ---
+    method_names_by_version = {
+        version: {m.name for m in class_info.get_methods_for_version(version)}
+        for version in versions
+    }
+    first_method_names = method_names_by_version[versions[0]]
+    if any(names != first_method_names for names in method_names_by_version.values()):
+        return None
+
+    # --- シグネチャ不一致のメソッドは引数次第で切替が起こりうる ---
+    if not all(class_info.has_consistent_signature(name) for name in first_method_names):
+        return None
+
+    # --- 全バージョンが同一のフィールド集合を持つか ---
+    fields_by_version = [_collect_self_fields(class_info.get_methods_for_version(v)) for v in versions]
+    if any(fields != fields_by_version[0] for fields in fields_by_version[1:]):
+        return None
+
+    # 統合クラスが実際に呼び出す実装を選ぶ:
+    #   - コンストラクタは常に初期バージョン（最小バージョン）で実行される
+    #   - その他は continuity なら初期バージョン、latest なら最新バージョン
+    initial_version = versions[0]
+    method_version = versions[-1] if version_selection_strategy == VERSION_SELECTION_LATEST else initial_version
+    methods: list[MethodInfo] = []
+    for method_name in class_info.methods:
+        target_version = initial_version if method_name == INITIALIZE_METHOD_NAME else method_version
+        for method_info in class_info.methods[method_name]:
+            if method_info.version == target_version:
+                methods.append(method_info)
+                break
+
+    return CollapsePlan(
+        class_name=class_info.class_name,
+        reason="versions share fields and no method requires a switch",
+        bases=bases,
+        methods=methods,
+    )
+
+
+# --- ヘルパー関数 ---
+def _get_common_unversioned_bases(class_info: ClassInfo, versions: list[str]) -> list[str] | None:
+    """全バージョンで共通かつ非バージョンの親クラス名一覧を返す。そうでなければ None。"""
+    base_lists = [class_info.versioned_bases.get(version, []) for version in versions]
+    first_bases = base_lists[0]
+    if any(bases != first_bases for bases in base_lists[1:]):
+        return None
+    if any(parent_version != UNVERSIONED_CLASS_TAG for _, parent_version in first_bases):
+        return None
+    return [parent_base_name for parent_base_name, _ in first_bases]
+
+def _collect_self_fields(methods: list[MethodInfo]) -> set[str]:
+    """メソッド群の中で self.<attr> へ代入される属性名の集合を返す。"""
+    fields: set[str] = set()
+    for method_info in methods:
+        method_node = method_info.ast_node
+        if not method_node or not method_node.args.args:
+            continue
+        self_name = method_node.args.args[0].arg
+        for node in ast.walk(method_node):
+            if (
+                isinstance(node, ast.Attribute)
+                and isinstance(node.ctx, (ast.Store, ast.Del))
+                and isinstance(node.value, ast.Name)
+                and node.value.id == self_name
+            ):
+                fields.add(node.attr)
+    return fields
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from .project_usage import ProjectUsage
+from ..symbol_table.class_info import ClassInfo
+from ..symbol_table.method_info import MethodInfo
+from ..util.ast_util import get_sync_function_version_info
+from ..util.constants import BUILD_COLUMNS_METHOD_NAME, BUILD_MANY_METHOD_NAME, INITIALIZE_METHOD_NAME
+
+@dataclass
+class ConstructorFactoryPlan:
+    """バージョンごとの生成用ファクトリと、呼び出し形からの選択規則を保持する。"""
+    class_name: str
+    initial_version: str
+    init_overloads: list[MethodInfo] = field(default_factory=list)
+    factory_versions: set[str] = field(default_factory=set)
+    # 定義元モジュール名（呼び出し箇所の import 解決に使う）
+    module_name: str | None = None
+    # 生成したオブジェクトを migrate_all() の対象として追跡するか
+    track_instances: bool = False
+
+    def resolve(self, num_positional: int, keyword_names: Iterable[str]) -> str | None:
+        """呼び出し形から生成されるバージョンを求め、ファクトリがあればそのバージョンを返す。"""
+        version = resolve_constructor_version(
+            self.init_overloads, self.initial_version, num_positional, keyword_names
+        )
+        return version if version in self.factory_versions else None
+
+def resolve_constructor_version(
+    init_overloads: list[MethodInfo],
+    initial_version: str,
+    num_positional: int,
+    keyword_names: Iterable[str],
+) -> str | None:
+    """
+    統合クラスの __init__ と同じ規則で、呼び出し形から初期化されるバージョンを返す。
+    初期バージョンが受け付ければ初期バージョン、そうでなければ受け付ける最小のバージョン。
+    """
+    keyword_names = list(keyword_names)
+    sorted_overloads = sorted(init_overloads, key=lambda m: int(m.version))
+    for method_info in sorted_overloads:
+        if method_info.version == initial_version and method_info.accepts(num_positional, keyword_names):
+            return initial_version
+    for method_info in sorted_overloads:
+        if method_info.accepts(num_positional, keyword_names):
+            return method_info.version
+    return None
+
+def analyze_constructor_factories(
+    class_info: ClassInfo,
+    state_sync_components: tuple | None,
+) -> ConstructorFactoryPlan | None:
+    """
+    呼び出し箇所から直接使えるバージョンごとのファクトリを決める。
+
+    ファクトリは object.__new__ で確保し、バージョンを一度だけ設定して初期化子を呼ぶため、
+    親クラスを持つクラスと、初期バージョンからの同期関数が必要なバージョンは対象外とする。
+    """
+    if any(class_info.versioned_bases.values()):
+        return None
+    init_overloads = class_info.methods.get(INITIALIZE_METHOD_NAME, [])
+    if not init_overloads:
+        return None
+
+    initial_version = min(class_info.get_all_versions(), key=int)
+    synced_versions = set()
+    for func_node in (state_sync_components[1] if state_sync_components else []):
+        from_ver, to_ver = get_sync_function_version_info(func_node)
+        if from_ver is not None and str(from_ver) == initial_version:
+            synced_versions.add(str(to_ver))
+
+    factory_versions = {
+        method_info.version for method_info in init_overloads
+        if method_info.version not in synced_versions
+    }
+    if not factory_versions:
+        return None
+    return ConstructorFactoryPlan(
+        class_name=class_info.class_name,
+        initial_version=initial_version,
+        init_overloads=sorted(init_overloads, key=lambda m: int(m.version)),
+        factory_versions=factory_versions,
+    )
+
+def analyze_bulk_construction(class_info: ClassInfo, usage: ProjectUsage | None) -> bool:
+    """
+    統合クラスに build_many()/build_columns() を生成するかを返す。
+
+    クラス自身がどちらも定義しておらず、入力内でいずれかが参照されうる場合に限り生成する。
+    """
+    method_names = (BUILD_MANY_METHOD_NAME, BUILD_COLUMNS_METHOD_NAME)
+    if usage is None or any(name in class_info.methods for name in method_names):
+        return False
+    return any(usage.is_attr_referenced(name) for name in method_names)
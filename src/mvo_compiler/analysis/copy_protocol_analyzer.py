@@ -0,0 +1,17 @@
+from .project_usage import ProjectUsage
+from ..symbol_table.class_info import ClassInfo
+from ..util.constants import COPY_PROTOCOL_METHOD_NAMES
+
+def analyze_copy_protocol(class_info: ClassInfo, usage: ProjectUsage | None) -> bool:
+    """
+    統合クラスに pickle/copy 用の __reduce_ex__・__copy__・__deepcopy__ を生成するかを返す。
+
+    状態の持ち方が他のクラスと結びつく、バージョン付きの親を持つクラス・バージョン付きで継承される
+    クラスと、いずれかのバージョンが独自に pickle/copy の振る舞いを定義するクラスは対象外とする。
+    継承関係を確認できないため、使用状況がない場合も生成しない。
+    """
+    if usage is None or class_info.class_name in usage.versioned_parent_names:
+        return False
+    if any(class_info.versioned_bases.values()):
+        return False
+    return not any(name in class_info.methods for name in COPY_PROTOCOL_METHOD_NAMES)
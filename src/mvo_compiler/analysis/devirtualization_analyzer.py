@@ -0,0 +1,183 @@
+import ast
+from dataclasses import dataclass, field
+
+from ..symbol_table.class_info import ClassInfo
+from ..symbol_table.method_info import MethodInfo
+from .project_usage import ProjectUsage
+from ..util.constants import INITIALIZE_METHOD_NAME, VERSION_SELECTION_ADAPTIVE, VERSION_SELECTION_LATEST
+
+# 呼び出してもバージョン切替を起こさないとみなす組み込み関数
+_NON_SWITCHING_BUILTINS = {
+    "abs", "bool", "chr", "dict", "divmod", "enumerate", "float", "int", "isinstance",
+    "len", "list", "max", "min", "ord", "print", "range", "round", "set", "str", "tuple", "zip",
+}
+
+@dataclass
+class DevirtualizationPlan:
+    """`self.method()` 呼び出しを同一バージョンの実装へ直接結び付ける計画。"""
+    class_name: str
+    # バージョン -> 直接呼び出しできるメソッド名とその MethodInfo
+    targets: dict[str, dict[str, MethodInfo]] = field(default_factory=dict)
+    # (バージョン, メソッド名) -> 実行中にバージョンが切り替わりうるか
+    may_switch: dict[tuple[str, str], bool] = field(default_factory=dict)
+
+    def get_target(self, version: str, call: ast.Call, self_name: str) -> MethodInfo | None:
+        """呼び出しが直接呼び出しへ書き換えられる場合、その呼び出し先を返す。"""
+        func = call.func
+        if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == self_name):
+            return None
+        method_info = self.targets.get(version, {}).get(func.attr)
+        if method_info is None:
+            return None
+        if any(isinstance(arg, ast.Starred) for arg in call.args):
+            return None
+        if any(keyword.arg is None for keyword in call.keywords):
+            return None
+        if not method_info.accepts(len(call.args), [keyword.arg for keyword in call.keywords]):
+            return None
+        return method_info
+
+    def needs_guard(self, version: str, method_name: str) -> bool:
+        """呼び出し元のメソッドで現在のバージョンを確認する必要があるかを返す。"""
+        return self.may_switch.get((version, method_name), True)
+
+def analyze_devirtualization(
+    class_info: ClassInfo,
+    usage: ProjectUsage | None,
+    incompatibility: dict | None,
+    version_selection_strategy: str,
+) -> DevirtualizationPlan | None:
+    """
+    versionedメソッド内の `self.method()` を同一バージョンの実装へ直接呼び出せるか解析する。
+
+    直接呼び出しにできるのは、呼び出し時点でスタブが同じバージョンの実装を選ぶことが
+    静的に分かる場合に限る。安全に判定できない場合は None を返す。
+    """
+    if usage is None or not usage.is_whole_program or usage.has_dynamic_attribute_access:
+        return None
+    class_name = class_info.class_name
+    # 子クラスによる上書き・名前マングリングされる内部名は扱わない
+    if class_name in usage.base_class_names or class_name.startswith("_"):
+        return None
+
+    plan = DevirtualizationPlan(class_name=class_name)
+    for version in class_info.get_all_versions():
+        plan.targets[version] = {
+            method_info.name: method_info
+            for method_info in class_info.get_methods_for_version(version)
+            if _is_devirtualizable(class_info, method_info, usage, version_selection_strategy)
+        }
+
+    # --- 実行中に切替が起こりうるメソッドの不動点計算 ---
+    # 互換性属性のプロパティや演算子のスタブは任意の箇所で切替を起こしうる
+    # adaptive 戦略では他バージョンの実装を切り替えずに借りるため、実行中のバージョンを常に確認する
+    has_implicit_switch = version_selection_strategy == VERSION_SELECTION_ADAPTIVE or bool(incompatibility) or any(
+        _is_dunder(name) and name != INITIALIZE_METHOD_NAME for name in class_info.methods
+    )
+    dependencies: dict[tuple[str, str], set[tuple[str, str]]] = {}
+    for version in class_info.get_all_versions():
+        for method_info in class_info.get_methods_for_version(version):
+            key = (version, method_info.name)
+            callees = _collect_switch_dependencies(plan, version, method_info)
+            if has_implicit_switch or callees is None:
+                plan.may_switch[key] = True
+            else:
+                plan.may_switch[key] = False
+                dependencies[key] = callees
+
+    changed = True
+    while changed:
+        changed = False
+        for key, callees in dependencies.items():
+            if not plan.may_switch[key] and any(plan.needs_guard(*callee) for callee in callees):
+                plan.may_switch[key] = True
+                changed = True
+
+    return plan
+
+
+# --- ヘルパー関数 ---
+def _is_dunder(name: str) -> bool:
+    return name.startswith("__") and name.endswith("__")
+
+def _is_devirtualizable(
+    class_info: ClassInfo,
+    method_info: MethodInfo,
+    usage: ProjectUsage,
+    version_selection_strategy: str,
+) -> bool:
+    """このメソッドへの `self.method()` 呼び出しを直接呼び出しにできるかを返す。"""
+    name = method_info.name
+    node = method_info.ast_node
+    if name == INITIALIZE_METHOD_NAME or name.startswith("__"):
+        return False
+    if node is None or node.decorator_list or not node.args.args:
+        return False
+    # インスタンス属性やクラス属性で上書きされうる
+    if name in usage.stored_attrs:
+        return False
+    # latest 戦略ではスタブが最新の定義バージョンへ切り替えるため、それ以外は対象外
+    if version_selection_strategy == VERSION_SELECTION_LATEST:
+        latest_version = max((m.version for m in class_info.methods[name]), key=int)
+        if method_info.version != latest_version:
+            return False
+    return True
+
+def has_self_or_class_rebinding(node: ast.FunctionDef, class_name: str) -> bool:
+    """
+    メソッド内で self やクラス名が再束縛されているかを返す。
+    再束縛されている場合は呼び出しを書き換えない。
+    """
+    self_name = node.args.args[0].arg
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and isinstance(child.ctx, (ast.Store, ast.Del)):
+            if child.id in (self_name, class_name):
+                return True
+        elif isinstance(child, ast.arg) and child is not node.args.args[0]:
+            if child.arg in (self_name, class_name):
+                return True
+        elif isinstance(child, (ast.Global, ast.Nonlocal)):
+            if self_name in child.names or class_name in child.names:
+                return True
+    return False
+
+def _collect_switch_dependencies(
+    plan: DevirtualizationPlan,
+    version: str,
+    method_info: MethodInfo,
+) -> set[tuple[str, str]] | None:
+    """
+    メソッド本体で切替を起こしうる呼び出しを調べる。
+    直接呼び出しにできる `self.method()` のみを含む場合はその呼び出し先集合を返し、
+    それ以外の呼び出し（他オブジェクトのメソッド・super()・未知の関数など）を含む場合は None を返す。
+    """
+    node = method_info.ast_node
+    if node is None or node.decorator_list or not node.args.args:
+        return None
+    if has_self_or_class_rebinding(node, plan.class_name):
+        return None
+
+    self_name = node.args.args[0].arg
+    local_names = {
+        child.id for child in ast.walk(node)
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store)
+    }
+    callees: set[tuple[str, str]] = set()
+    for child in ast.walk(ast.Module(body=node.body, type_ignores=[])):
+        if isinstance(child, (ast.Yield, ast.YieldFrom, ast.Await)):
+            return None
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            # 内側の関数はいつ呼ばれるか分からないため保守的に扱う
+            return None
+        if not isinstance(child, ast.Call):
+            continue
+        target = plan.get_target(version, child, self_name)
+        if target is not None:
+            callees.add((version, target.name))
+        elif not (
+            isinstance(child.func, ast.Name)
+            and child.func.id in _NON_SWITCHING_BUILTINS
+            and child.func.id not in local_names
+        ):
+            return None
+    return callees
@@ -0,0 +1,199 @@
+import ast
+
+from ..symbol_table.class_info import ClassInfo
+from .devirtualization_analyzer import has_self_or_class_rebinding
+from .project_usage import ProjectUsage
+from ..util.ast_util import get_sync_function_version_info
+from ..util.constants import SYNC_OPTION_DIRTY_TRACKING
+from ..util import logger
+
+# 属性アクセスを横取りするため、書き込みを追跡できなくなる特殊メソッド
+_ATTRIBUTE_HOOK_METHODS = {"__setattr__", "__delattr__", "__getattribute__"}
+# 引数を変更しない組み込み関数（フィールドの値を渡しても書き込みとみなさない）
+_NON_MUTATING_FUNCTIONS = {
+    "abs", "all", "any", "bool", "dict", "float", "format", "frozenset", "hash", "id", "int", "isinstance",
+    "len", "list", "max", "min", "print", "repr", "round", "set", "sorted", "str", "sum", "tuple",
+}
+
+def analyze_dirty_tracking(
+    class_info: ClassInfo,
+    state_sync_components: tuple | None,
+    usage: ProjectUsage | None,
+) -> bool:
+    """
+    同期モジュールで `DIRTY_TRACKING = True` が指定されたクラスに、書き込み追跡による
+    切り戻し時の同期省略を適用できるかを返す。
+
+    切替後に一度も書き込みがなければ、逆向きの同期関数を呼ばずに切替前の状態を戻す。
+    そのため互いに逆向きの同期関数の組が必要で、書き込みをすべて検出できるクラスに限る。
+    """
+    if not state_sync_components or not state_sync_components[2].get(SYNC_OPTION_DIRTY_TRACKING):
+        return False
+
+    reason = _get_unsupported_reason(class_info, state_sync_components, usage)
+    if reason:
+        logger.warning_log(f"Dirty tracking is disabled for '{class_info.class_name}': {reason}.")
+        return False
+    return True
+
+def get_reversible_sync_pairs(sync_asts: list[ast.FunctionDef]) -> set[tuple[int, int]]:
+    """逆向きの同期関数も定義されている (from, to) の組を返す。"""
+    pairs = set()
+    for func_node in sync_asts:
+        from_ver, to_ver = get_sync_function_version_info(func_node)
+        if from_ver is not None:
+            pairs.add((from_ver, to_ver))
+    return {(from_ver, to_ver) for from_ver, to_ver in pairs if (to_ver, from_ver) in pairs}
+
+def writes_through_self(node: ast.AST, self_name: str) -> bool:
+    """
+    ノード内に self を起点とする書き込みがあるかを返す。
+    属性・添字への代入と削除に加え、`self.items.append(...)` のようなフィールドのメソッド呼び出しも書き込みとみなす。
+    `items = self.items`・`f(self.items)`・`return self.items` のようにフィールドの値がローカル変数・引数・
+    呼び出し元へ渡る場合も、その先での変更を追えないため書き込みとみなす。
+    """
+    for child in ast.walk(node):
+        if isinstance(child, (ast.Attribute, ast.Subscript)) and isinstance(child.ctx, (ast.Store, ast.Del)):
+            if _is_rooted_at(child, self_name):
+                return True
+        elif isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute):
+            receiver = child.func.value
+            if isinstance(receiver, (ast.Attribute, ast.Subscript)) and _is_rooted_at(receiver, self_name):
+                return True
+        if any(_is_field_value(value, self_name) for value in _get_escaping_values(child, self_name)):
+            return True
+    return False
+
+
+# --- ヘルパー関数 ---
+def _is_rooted_at(expr: ast.expr, name: str) -> bool:
+    while isinstance(expr, (ast.Attribute, ast.Subscript)):
+        expr = expr.value
+    return isinstance(expr, ast.Name) and expr.id == name
+
+def _get_escaping_values(node: ast.AST, self_name: str) -> list[ast.expr]:
+    """ノードがローカル変数への束縛・関数の引数・戻り値として渡す値の式を返す。"""
+    if isinstance(node, ast.Assign):
+        # `self.b = self.a` のようなフィールド間の代入は、値を self の外へ渡さない
+        if all(isinstance(target, ast.Attribute) and _is_rooted_at(target, self_name) for target in node.targets):
+            return []
+        return [node.value]
+    if isinstance(node, (ast.AnnAssign, ast.NamedExpr)):
+        return [node.value] if node.value is not None else []
+    if isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+        return [node.iter]
+    if isinstance(node, ast.withitem):
+        return [node.context_expr] if node.optional_vars is not None else []
+    if isinstance(node, ast.Call):
+        if isinstance(node.func, ast.Name) and node.func.id in _NON_MUTATING_FUNCTIONS:
+            return []
+        return [*node.args, *(keyword.value for keyword in node.keywords)]
+    if isinstance(node, (ast.Return, ast.Yield, ast.YieldFrom)):
+        return [node.value] if node.value is not None else []
+    if isinstance(node, ast.Lambda):
+        return [node.body]
+    return []
+
+def _is_field_value(expr: ast.expr, self_name: str) -> bool:
+    """式の値が self のフィールド（またはその要素）そのものになりうるかを返す。"""
+    if isinstance(expr, (ast.Tuple, ast.List, ast.Set)):
+        return any(_is_field_value(elt, self_name) for elt in expr.elts)
+    if isinstance(expr, ast.Starred):
+        return _is_field_value(expr.value, self_name)
+    if isinstance(expr, ast.IfExp):
+        return _is_field_value(expr.body, self_name) or _is_field_value(expr.orelse, self_name)
+    if isinstance(expr, ast.BoolOp):
+        return any(_is_field_value(value, self_name) for value in expr.values)
+    if isinstance(expr, ast.NamedExpr):
+        return _is_field_value(expr.value, self_name)
+    return isinstance(expr, (ast.Attribute, ast.Subscript)) and _is_rooted_at(expr, self_name)
+
+def _get_unsupported_reason(
+    class_info: ClassInfo,
+    state_sync_components: tuple,
+    usage: ProjectUsage | None,
+) -> str | None:
+    class_name = class_info.class_name
+    # 名前マングリングされる内部名は実装クラスとwrapperで名前が食い違う
+    if class_name.startswith("_"):
+        return "class names starting with '_' are not supported"
+    # 親クラスのメソッドによる書き込みは追跡できない
+    if any(class_info.versioned_bases.values()):
+        return "the class has base classes"
+    if usage is not None and class_name in usage.base_class_names:
+        return "the class is used as a base class"
+    if _ATTRIBUTE_HOOK_METHODS & set(class_info.methods):
+        return "the class defines attribute access hooks"
+    if not get_reversible_sync_pairs(state_sync_components[1]):
+        return "no pair of mutually inverse sync functions is defined"
+    # クラス外からの書き込みは書き込みフラグを立てない
+    if usage is None or not usage.is_whole_program or usage.has_dynamic_attribute_access:
+        return "writes from outside the class cannot be ruled out"
+    externally_written = sorted(_get_field_names(class_info, state_sync_components[1]) & usage.external_stored_attrs)
+    if externally_written:
+        return f"field '{externally_written[0]}' is written outside the class's methods"
+    # 切り戻し用の状態は辞書の浅い複製のため、同期関数がフィールドの値を直接変更すると壊れる
+    for func_node in state_sync_components[1]:
+        if func_node.args.args and _mutates_field_in_place(func_node, func_node.args.args[0].arg):
+            return f"sync function '{func_node.name}' mutates a field value in place"
+
+    for version in class_info.get_all_versions():
+        for method_info in class_info.get_methods_for_version(version):
+            node = method_info.ast_node
+            if node is None or not node.args.args:
+                continue
+            self_name = node.args.args[0].arg
+            if node.decorator_list:
+                if writes_through_self(node, self_name):
+                    return f"decorated method '{method_info.name}' writes through its first argument"
+                continue
+            if has_self_or_class_rebinding(node, class_name):
+                return f"method '{method_info.name}' rebinds '{self_name}'"
+            if _has_nested_self_write(node, self_name):
+                return f"a nested function in '{method_info.name}' writes through '{self_name}'"
+    return None
+
+def _get_field_names(class_info: ClassInfo, sync_asts: list[ast.FunctionDef]) -> set[str]:
+    """メソッドの self・同期関数の第1引数を通して代入・削除される属性名を返す。"""
+    field_names = set()
+    roots = [
+        (method_info.ast_node, method_info.ast_node.args.args[0].arg)
+        for version in class_info.get_all_versions()
+        for method_info in class_info.get_methods_for_version(version)
+        if method_info.ast_node is not None and method_info.ast_node.args.args
+    ]
+    roots += [(func_node, func_node.args.args[0].arg) for func_node in sync_asts if func_node.args.args]
+    for node, self_name in roots:
+        for child in ast.walk(node):
+            if (isinstance(child, ast.Attribute) and isinstance(child.ctx, (ast.Store, ast.Del))
+                    and isinstance(child.value, ast.Name) and child.value.id == self_name):
+                field_names.add(child.attr)
+    return field_names
+
+def _mutates_field_in_place(node: ast.FunctionDef, self_name: str) -> bool:
+    """`w.items.append(...)`・`w.items[0] = ...` のように、フィールドの値を直接変更しうるかを返す。"""
+    for child in ast.walk(node):
+        if isinstance(child, ast.Attribute) and isinstance(child.ctx, (ast.Store, ast.Del)):
+            # `w.x = ...` はフィールドの差し替えで、切り戻し用の状態には影響しない
+            if isinstance(child.value, ast.Name):
+                continue
+            if _is_rooted_at(child, self_name):
+                return True
+        elif isinstance(child, ast.Subscript) and isinstance(child.ctx, (ast.Store, ast.Del)):
+            if _is_rooted_at(child, self_name):
+                return True
+        elif isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute):
+            receiver = child.func.value
+            if isinstance(receiver, (ast.Attribute, ast.Subscript)) and _is_rooted_at(receiver, self_name):
+                return True
+        if any(_is_field_value(value, self_name) for value in _get_escaping_values(child, self_name)):
+            return True
+    return False
+
+def _has_nested_self_write(node: ast.FunctionDef, self_name: str) -> bool:
+    """内側の関数・ラムダ・クラスの中に self を起点とする書き込みがあるかを返す。"""
+    for child in ast.walk(ast.Module(body=node.body, type_ignores=[])):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            if writes_through_self(child, self_name):
+                return True
+    return False
@@ -0,0 +1,13 @@
+from .project_usage import ProjectUsage
+from ..symbol_table.class_info import ClassInfo
+from ..util.constants import MIGRATE_ALL_METHOD_NAME
+
+def analyze_migration(class_info: ClassInfo, usage: ProjectUsage | None) -> bool:
+    """
+    統合クラスに migrate_all() と生存インスタンスの追跡を生成するかを返す。
+
+    クラス自身が migrate_all を定義しておらず、入力内で `migrate_all` が参照されうる場合に限り生成する。
+    """
+    if usage is None or MIGRATE_ALL_METHOD_NAME in class_info.methods:
+        return False
+    return usage.is_attr_referenced(MIGRATE_ALL_METHOD_NAME)
@@ -0,0 +1,13 @@
+from .project_usage import ProjectUsage
+from ..symbol_table.class_info import ClassInfo
+from ..util.constants import PINNED_METHOD_NAME
+
+def analyze_pinning(class_info: ClassInfo, usage: ProjectUsage | None) -> bool:
+    """
+    統合クラスに pinned() を生成するかを返す。
+
+    クラス自身が pinned を定義しておらず、入力内で `pinned` が参照されうる場合に限り生成する。
+    """
+    if usage is None or PINNED_METHOD_NAME in class_info.methods:
+        return False
+    return usage.is_attr_referenced(PINNED_METHOD_NAME)
@@ -0,0 +1,246 @@
+import ast
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from .static_switch_analyzer import CallSequence
+from ..util.ast_util import get_all_class_defs, get_class_version_info, get_class_version_info_from_name
+
+# 任意の属性へ動的にアクセスしうる組み込み関数
+_DYNAMIC_ATTRIBUTE_FUNCTIONS = {"getattr", "hasattr", "setattr", "delattr"}
+# クラスを渡してもインスタンスを生成しない組み込み関数
+_NON_CONSTRUCTING_FUNCTIONS = {"isinstance", "issubclass", "hasattr"}
+
+# コンストラクタ呼び出しの形: (位置引数の数, キーワード引数名の集合)
+CallShape = tuple[int, frozenset[str]]
+
+@dataclass
+class ProjectUsage:
+    """プロジェクト全体でのクラス・属性の使われ方を保持する。"""
+    referenced_attrs: set[str] = field(default_factory=set)
+    # 代入・削除される属性名（`obj.x = ...` / `setattr(obj, "x", ...)`）
+    stored_attrs: set[str] = field(default_factory=set)
+    # versionedクラスのメソッドの self 以外を通して書き込まれる属性名
+    # （`obj.x = ...` や `obj.items.append(...)` のように、属性の値を変更しうるものを含む）
+    external_stored_attrs: set[str] = field(default_factory=set)
+    constructor_calls: dict[str, set[CallShape]] = field(default_factory=dict)
+    dynamic_constructor_names: set[str] = field(default_factory=set)
+    base_class_names: set[str] = field(default_factory=set)
+    versioned_parents: dict[str, set[str]] = field(default_factory=dict)
+    # 通常ファイル内で参照される属性名（同期関数からの参照を除く）
+    source_attrs: set[str] = field(default_factory=set)
+    # static 戦略で使う、クライアントのループ内の呼び出し列（クラス名 -> 呼び出し列）
+    call_sequences: dict[str, list[CallSequence]] = field(default_factory=dict)
+    has_dynamic_attribute_access: bool = False
+    # versionedクラスの外で `type(obj)(...)` / `obj.__class__(...)` のように、どのクラスか決まらない生成があるか
+    has_untyped_construction: bool = False
+    # プロジェクト全体を走査して得た情報か（単一モジュールのみの場合は False）
+    is_whole_program: bool = True
+
+    @property
+    def versioned_parent_names(self) -> set[str]:
+        """`Foo__1__` のようにバージョン付きで継承されるベース名の集合。"""
+        return set(self.versioned_parents)
+
+    def is_attr_referenced(self, attr: str) -> bool:
+        """属性名がプロジェクト内のどこかから参照されうるかを返す。"""
+        return self.has_dynamic_attribute_access or attr in self.referenced_attrs
+
+def collect_project_usage(
+    source_asts: Iterable[ast.AST],
+    sync_functions_dict: dict | None = None,
+    *,
+    is_whole_program: bool = True,
+) -> ProjectUsage:
+    """
+    全通常ファイル（と同期関数）を走査し、ProjectUsage を構築する。
+    source_asts は1回だけ走査するため、ファイルごとに解析するジェネレータでもよい。
+    """
+    usage = ProjectUsage(is_whole_program=is_whole_program)
+    for source_ast in source_asts:
+        _UsageCollector(usage).visit(source_ast)
+        _collect_base_classes(usage, source_ast)
+    usage.source_attrs = set(usage.referenced_attrs)
+
+    for state_sync_components in (sync_functions_dict or {}).values():
+        for func_node in state_sync_components[1]:
+            # 同期関数は wrapper を通して書き込むが、クラス外からの書き込みとはみなさない
+            _UsageCollector(usage, is_sync_function=True).visit(func_node)
+
+    return usage
+
+
+# --- ヘルパー ---
+def _collect_base_classes(usage: ProjectUsage, source_ast: ast.AST):
+    # `from m import Base__1__ as B1` で取り込んだ名前は元の名前で数える
+    aliases = {
+        alias.asname: alias.name
+        for node in ast.walk(source_ast) if isinstance(node, ast.ImportFrom)
+        for alias in node.names if alias.asname
+    }
+    for class_node in get_all_class_defs(source_ast):
+        for base_node in class_node.bases:
+            if isinstance(base_node, ast.Name):
+                name = aliases.get(base_node.id, base_node.id)
+            elif isinstance(base_node, ast.Attribute):
+                name = base_node.attr
+            else:
+                continue
+            base_name, version = get_class_version_info_from_name(name)
+            if base_name:
+                usage.versioned_parents.setdefault(base_name, set()).add(version)
+                usage.base_class_names.add(base_name)
+            else:
+                usage.base_class_names.add(name)
+
+class _UsageCollector(ast.NodeVisitor):
+    """1モジュール分の属性参照・コンストラクタ呼び出しを収集する。"""
+    def __init__(self, usage: ProjectUsage, *, is_sync_function: bool = False):
+        self.usage = usage
+        self.is_sync_function = is_sync_function
+        self.aliases: dict[str, str] = {}
+        # 生成とみなさないクラス名参照（呼び出し先・属性アクセスの対象など）
+        self.non_constructing_refs: set[int] = set()
+        # 走査中の versionedクラスのベース名と、classmethod の第1引数名
+        self.class_names: list[str | None] = []
+        self.classmethod_params: list[str | None] = []
+        # versionedクラスのメソッドの第1引数名（入れ子の関数では外側のメソッドのもの）
+        self.method_self_params: list[str | None] = []
+        self.versioned_method_ids: set[int] = set()
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        if _is_self_construction(node.func, self.classmethod_params[-1] if self.classmethod_params else None):
+            # 受け手自身のクラスの生成は、呼び出しの形からどのクラスか決まらない
+            class_name = self.class_names[-1] if self.class_names else None
+            if class_name:
+                self.usage.dynamic_constructor_names.add(class_name)
+            else:
+                self.usage.has_untyped_construction = True
+        if isinstance(node.func, ast.Name):
+            callee = self.aliases.get(node.func.id, node.func.id)
+            self.non_constructing_refs.add(id(node.func))
+            if callee in _DYNAMIC_ATTRIBUTE_FUNCTIONS and len(node.args) >= 2:
+                if not (isinstance(node.args[1], ast.Constant) and isinstance(node.args[1].value, str)):
+                    self.usage.has_dynamic_attribute_access = True
+            if callee in ("setattr", "delattr") and len(node.args) >= 2:
+                if isinstance(node.args[1], ast.Constant) and isinstance(node.args[1].value, str):
+                    self.usage.stored_attrs.add(node.args[1].value)
+            if callee in _NON_CONSTRUCTING_FUNCTIONS:
+                self.non_constructing_refs.update(id(arg) for arg in node.args)
+        elif isinstance(node.func, ast.Attribute):
+            callee = node.func.attr
+            # `obj.items.append(...)` は属性 items の値を変更しうる
+            if isinstance(node.func.value, (ast.Attribute, ast.Subscript)):
+                self._record_external_write(node.func.value)
+        else:
+            callee = None
+
+        if callee:
+            shape = _get_call_shape(node)
+            if shape is None:
+                self.usage.dynamic_constructor_names.add(callee)
+            else:
+                self.usage.constructor_calls.setdefault(callee, set()).add(shape)
+
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        # 呼び出し以外でクラス名が参照された場合（代入・引数渡しなど）は動的に生成されうる
+        if isinstance(node.ctx, ast.Load) and id(node) not in self.non_constructing_refs:
+            self.usage.dynamic_constructor_names.add(self.aliases.get(node.id, node.id))
+
+    def visit_arg(self, node: ast.arg):
+        # 型注釈はインスタンス生成に関係しない
+        return
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        class_name, _ = get_class_version_info(node)
+        if class_name:
+            self.versioned_method_ids.update(
+                id(child) for child in node.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+            )
+        self.class_names.append(class_name)
+        self.generic_visit(node)
+        self.class_names.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        for child in node.decorator_list:
+            self.visit(child)
+        is_classmethod = any(isinstance(d, ast.Name) and d.id == "classmethod" for d in node.decorator_list)
+        params = [*node.args.posonlyargs, *node.args.args]
+        if is_classmethod and params:
+            classmethod_param = params[0].arg
+        else:
+            # 入れ子の関数からも外側の classmethod の cls を使える
+            classmethod_param = self.classmethod_params[-1] if self.classmethod_params else None
+        if id(node) in self.versioned_method_ids:
+            method_self_param = params[0].arg if params else None
+        else:
+            method_self_param = self.method_self_params[-1] if self.method_self_params else None
+        self.classmethod_params.append(classmethod_param)
+        self.method_self_params.append(method_self_param)
+        for child in [node.args, *node.body]:
+            self.visit(child)
+        self.classmethod_params.pop()
+        self.method_self_params.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        self.visit(node.target)
+        if node.value:
+            self.visit(node.value)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        self.usage.referenced_attrs.add(node.attr)
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            self.usage.stored_attrs.add(node.attr)
+            self._record_external_write(node)
+        self.non_constructing_refs.add(id(node.value))
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript):
+        # `obj.items[0] = ...` は属性 items の値を変更する
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            self._record_external_write(node)
+        self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant):
+        if isinstance(node.value, str) and node.value.isidentifier():
+            self.usage.referenced_attrs.add(node.value)
+
+    def _record_external_write(self, target: ast.expr):
+        """書き込み先の式に含まれる属性名を、メソッドの self を起点としなければ記録する。"""
+        if self.is_sync_function:
+            return
+        attrs = []
+        expr = target
+        while isinstance(expr, (ast.Attribute, ast.Subscript)):
+            if isinstance(expr, ast.Attribute):
+                attrs.append(expr.attr)
+            expr = expr.value
+        self_param = self.method_self_params[-1] if self.method_self_params else None
+        if self_param is not None and isinstance(expr, ast.Name) and expr.id == self_param:
+            return
+        self.usage.external_stored_attrs.update(attrs)
+
+def _is_self_construction(func: ast.expr, classmethod_param: str | None) -> bool:
+    """`type(x)(...)`・`x.__class__(...)`・classmethod の `cls(...)` の呼び出し先かを返す。"""
+    if isinstance(func, ast.Call):
+        return isinstance(func.func, ast.Name) and func.func.id == "type" and len(func.args) == 1 and not func.keywords
+    if isinstance(func, ast.Attribute):
+        return func.attr == "__class__"
+    return isinstance(func, ast.Name) and classmethod_param is not None and func.id == classmethod_param
+
+def _get_call_shape(node: ast.Call) -> CallShape | None:
+    """呼び出しの形を返す。*args / **kwargs を含む場合は None。"""
+    if any(isinstance(arg, ast.Starred) for arg in node.args):
+        return None
+    if any(keyword.arg is None for keyword in node.keywords):
+        return None
+    return (len(node.args), frozenset(keyword.arg for keyword in node.keywords))
@@ -0,0 +1,204 @@
+from dataclasses import dataclass, field
+
+from .constructor_analyzer import analyze_bulk_construction, resolve_constructor_version
+from .migration_analyzer import analyze_migration
+from .pinning_analyzer import analyze_pinning
+from .project_usage import ProjectUsage
+from .switch_cost_analyzer import analyze_miss_targets
+from ..symbol_table.class_info import ClassInfo
+from ..util.ast_util import get_current_state_field_name, get_switch_to_version_method_name, get_sync_function_version_info
+from ..util.constants import (
+    INITIALIZE_METHOD_NAME,
+    VERSION_SELECTION_ADAPTIVE,
+    VERSION_SELECTION_LATEST,
+    VERSION_SELECTION_STATIC,
+)
+
+@dataclass
+class ReachabilityResult:
+    """到達可能性解析の結果を保持する。"""
+    reachable_versions: set[str] = field(default_factory=set)
+    pruned_versions: set[str] = field(default_factory=set)
+    pruned_methods: set[str] = field(default_factory=set)
+
+def analyze_reachability(
+    class_info: ClassInfo,
+    usage: ProjectUsage,
+    state_sync_components: tuple | None,
+    incompatibility: dict | None,
+    version_selection_strategy: str,
+) -> ReachabilityResult | None:
+    """
+    プロジェクト全体の呼び出し箇所・スタブ・同期関数・選択戦略から、
+    オブジェクトが取りうるバージョンと呼び出されうるメソッドを求める。
+    安全に判定できない場合は None を返す。
+    """
+    if not usage.is_whole_program:
+        return None
+    class_name = class_info.class_name
+    # 継承されるクラスは子クラス側から任意に利用されうる
+    if class_name in usage.base_class_names:
+        return None
+    # 生成される内部APIへ直接触れるコードがある場合も解析しない
+    if (
+        get_switch_to_version_method_name(class_name) in usage.referenced_attrs
+        or get_current_state_field_name(class_name) in usage.referenced_attrs
+    ):
+        return None
+
+    versions = sorted(class_info.get_all_versions(), key=int)
+    if not versions:
+        return None
+
+    # 切替先の推定に使う、プロジェクト内から呼ばれうるメソッド
+    referenced_methods = {
+        name for name in class_info.methods
+        if name == INITIALIZE_METHOD_NAME or _is_dunder(name) or usage.is_attr_referenced(name)
+    }
+
+    reachable = _get_constructed_versions(class_info, usage, versions, state_sync_components)
+    # pinned()・build_many()・migrate_all() では任意のバージョンを指定できる
+    if (
+        analyze_pinning(class_info, usage)
+        or analyze_bulk_construction(class_info, usage)
+        or analyze_migration(class_info, usage)
+    ):
+        reachable.update(versions)
+
+    # --- 不一致シグネチャ・latest 戦略・互換性属性による切替先 ---
+    for method_name in referenced_methods:
+        if method_name == INITIALIZE_METHOD_NAME:
+            continue
+        defining_versions = sorted({m.version for m in class_info.methods[method_name]}, key=int)
+        # adaptive 戦略では往復を避けるため任意の定義バージョンへ移る・実装を借りることがある
+        # static 戦略ではクライアントのループに合わせて任意の定義バージョンへ移ることがある
+        if not class_info.has_consistent_signature(method_name) or version_selection_strategy in (
+            VERSION_SELECTION_ADAPTIVE, VERSION_SELECTION_STATIC
+        ):
+            reachable.update(defining_versions)
+        elif version_selection_strategy == VERSION_SELECTION_LATEST:
+            reachable.add(defining_versions[-1])
+
+    for version, attrs in (incompatibility or {}).items():
+        if any(usage.is_attr_referenced(attr) for attr in attrs):
+            reachable.add(str(version))
+
+    # --- スタブのミスによる切替先（不動点計算）---
+    # latest 戦略では一致シグネチャのスタブは常に事前切替するためミスしない
+    miss_targets = analyze_miss_targets(class_info, state_sync_components)
+    changed = version_selection_strategy != VERSION_SELECTION_LATEST
+    while changed:
+        changed = False
+        for method_name in referenced_methods:
+            if method_name == INITIALIZE_METHOD_NAME:
+                continue
+            defining_versions = {m.version for m in class_info.methods[method_name]}
+            targets = {miss_targets[method_name][v] for v in reachable if v not in defining_versions}
+            if targets - reachable:
+                reachable.update(targets)
+                changed = True
+
+    if not reachable:
+        reachable.add(versions[0])
+
+    # 到達可能なバージョンのメソッドは、参照がなくても組み込み関数・ライブラリから呼ばれうるため残す
+    pruned_methods = {
+        name for name, overloads in class_info.methods.items()
+        if not any(m.version in reachable for m in overloads)
+    }
+    return ReachabilityResult(
+        reachable_versions=reachable,
+        pruned_versions=set(versions) - reachable,
+        pruned_methods=pruned_methods,
+    )
+
+def prune_class_info(class_info: ClassInfo, result: ReachabilityResult) -> ClassInfo:
+    """到達不能なバージョンとメソッドを取り除いた ClassInfo を返す。"""
+    methods = {}
+    for method_name, overloads in class_info.methods.items():
+        if method_name in result.pruned_methods:
+            continue
+        kept = [m for m in overloads if m.version in result.reachable_versions]
+        if kept:
+            methods[method_name] = kept
+
+    return ClassInfo(
+        class_name=class_info.class_name,
+        is_versioned=class_info.is_versioned,
+        versioned_bases={
+            version: bases for version, bases in class_info.versioned_bases.items()
+            if version in result.reachable_versions
+        },
+        methods=methods,
+        versions=set(class_info.versions) & result.reachable_versions,
+        imported_bases=class_info.imported_bases,
+    )
+
+def prune_sync_components(state_sync_components: tuple | None, result: ReachabilityResult) -> tuple | None:
+    """到達不能なバージョンに関わる同期関数を取り除く。"""
+    if not state_sync_components:
+        return state_sync_components
+    sync_imports, sync_functions, sync_options = state_sync_components
+    kept = []
+    for func_node in sync_functions:
+        from_ver, to_ver = get_sync_function_version_info(func_node)
+        if from_ver is not None and (str(from_ver) in result.pruned_versions or str(to_ver) in result.pruned_versions):
+            continue
+        kept.append(func_node)
+    return (sync_imports, kept, sync_options)
+
+def prune_incompatibility(incompatibility: dict | None, result: ReachabilityResult) -> dict | None:
+    """到達不能なバージョンの互換性定義を取り除く。"""
+    if incompatibility is None:
+        return None
+    return {
+        version: attrs for version, attrs in incompatibility.items()
+        if str(version) not in result.pruned_versions
+    }
+
+
+# --- ヘルパー関数 ---
+def _is_dunder(name: str) -> bool:
+    return name.startswith("__") and name.endswith("__")
+
+def _get_constructed_versions(
+    class_info: ClassInfo,
+    usage: ProjectUsage,
+    versions: list[str],
+    state_sync_components: tuple | None,
+) -> set[str]:
+    """コンストラクタ呼び出しの結果として取りうるバージョン集合を返す。"""
+    initial_version = versions[0]
+    init_overloads = sorted(class_info.methods.get(INITIALIZE_METHOD_NAME, []), key=lambda m: int(m.version))
+    if not init_overloads:
+        return {initial_version}
+
+    class_name = class_info.class_name
+    # 基底クラスのメソッドの `type(self)(...)` は派生クラスのインスタンスも生成する
+    parent_names = {
+        parent_name for parents in class_info.versioned_bases.values() for parent_name, _ in parents
+    }
+    if (
+        usage.has_untyped_construction
+        or class_name in usage.dynamic_constructor_names
+        or parent_names & usage.dynamic_constructor_names
+    ):
+        reachable = {m.version for m in init_overloads}
+        reachable.add(initial_version)
+        return reachable
+
+    reachable: set[str] = set()
+    for num_positional, keyword_names in usage.constructor_calls.get(class_name, set()):
+        version = resolve_constructor_version(init_overloads, initial_version, num_positional, keyword_names)
+        if version is not None:
+            reachable.add(version)
+
+    # 初期バージョンからの同期関数は生成直後の切替でも実行されるため残す
+    if reachable - {initial_version} and state_sync_components:
+        for func_node in state_sync_components[1]:
+            from_ver, _ = get_sync_function_version_info(func_node)
+            if from_ver is not None and str(from_ver) == initial_version:
+                reachable.add(initial_version)
+                break
+
+    return reachable
@@ -0,0 +1,313 @@
+import ast
+import math
+from dataclasses import dataclass, field
+
+from .switch_cost_analyzer import compute_switch_costs
+from ..symbol_table.class_info import ClassInfo
+from ..util.ast_util import get_class_version_info
+from ..util.constants import INITIALIZE_METHOD_NAME
+
+# ループとして扱う文
+_LOOP_TYPES = (ast.For, ast.AsyncFor, ast.While)
+# 別のスコープを作る（中の束縛・ループを呼び出し元の関数のものとみなさない）ノード
+_SCOPE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+
+@dataclass
+class CallSequence:
+    """クライアント関数のループ本体で、同じ受け手に対して順に呼ばれるメソッドの列。"""
+    class_name: str
+    # 受け手のローカル変数名（関数内で `obj = Foo(...)` により一度だけ束縛される）
+    receiver: str
+    loop: ast.stmt
+    method_names: list[str] = field(default_factory=list)
+
+@dataclass
+class StaticSwitchPlan:
+    """static 戦略で、クライアントのループに合わせて決めたミス時の切替先とループ入口の切替先。"""
+    class_name: str
+    # { メソッド名: { 現在のバージョン: 切替先のバージョン } }（analyze_miss_targets と同じ形）
+    miss_targets: dict[str, dict[str, str]] = field(default_factory=dict)
+    # (ループ, ループ入口で切り替えておくバージョン)
+    loop_entry_versions: list[tuple[CallSequence, str]] = field(default_factory=list)
+    # ループごとの1反復あたりの切替回数
+    switches_per_iteration: list[int] = field(default_factory=list)
+
+def collect_call_sequences(
+    source_asts: list[ast.AST],
+    unique_class_names: set[str] | None = None,
+) -> dict[str, list[CallSequence]]:
+    """
+    全通常ファイルのクライアント関数から、統合クラスのインスタンスに対するループ内の
+    メソッド呼び出し列を集める。
+
+    受け手は関数本体の先頭レベルの `obj = Foo(...)` でのみ束縛されるローカル変数に限り、
+    その文より後ろにあるループを対象とする。ループ本体の各文は受け手を使わないか、
+    `obj.m(...)` を1回だけ呼ぶ単純な文でなければならない（ループの条件式の呼び出しも含める）。
+    unique_class_names には、ただ1つのモジュールで定義されるversionedクラスの名前を渡す。
+    省略時は source_asts から求める。
+    """
+    if unique_class_names is None:
+        unique_class_names = _get_unique_class_names(source_asts)
+    # 複数のモジュールで定義される名前はどのクラスを指すか決まらない。
+    # `_` で始まる名前は生成される内部名がクラス内で名前マングリングされる
+    versioned_class_names = {
+        class_name for class_name in unique_class_names if not class_name.startswith("_")
+    }
+
+    sequences: dict[str, list[CallSequence]] = {}
+    for source_ast in source_asts:
+        class_names_by_local_name = _get_class_names(source_ast, versioned_class_names)
+        if not class_names_by_local_name:
+            continue
+        for node in ast.walk(source_ast):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                for sequence in _collect_function_sequences(node, class_names_by_local_name):
+                    sequences.setdefault(sequence.class_name, []).append(sequence)
+    return sequences
+
+def analyze_static_switching(
+    class_info: ClassInfo,
+    state_sync_components: tuple | None,
+    sequences: list[CallSequence],
+    miss_targets: dict[str, dict[str, str]],
+) -> StaticSwitchPlan | None:
+    """
+    クライアントのループごとに、1反復あたりの切替回数が最小となるバージョンの遷移を求め、
+    ミス時の切替先とループ入口での切替先を決める。
+
+    呼び出しごとに現在のバージョンを状態とする動的計画法で、現在のバージョンが呼ばれた
+    メソッドを定義していればそのまま、定義していなければ定義バージョンのいずれかへ移る。
+    1反復後に入口のバージョンへ戻る遷移のうち、切替回数・切替コスト・入口のバージョンが
+    最小のものを選ぶ。複数のループで切替先が食い違う場合は多数決（同数なら小さいバージョン）とする。
+    """
+    defining_versions = {
+        method_name: {m.version for m in overloads}
+        for method_name, overloads in class_info.methods.items()
+        if method_name != INITIALIZE_METHOD_NAME and class_info.has_consistent_signature(method_name)
+    }
+    versions = sorted(class_info.get_all_versions(), key=int)
+    switch_costs = compute_switch_costs(versions, state_sync_components)
+
+    plan = StaticSwitchPlan(class_name=class_info.class_name)
+    votes: dict[tuple[str, str], dict[str, int]] = {}
+    for sequence in sequences:
+        # 不一致シグネチャのメソッドや未知の属性の呼び出しを含むループは扱わない
+        if any(name not in defining_versions for name in sequence.method_names):
+            continue
+        best = _plan_loop(sequence.method_names, defining_versions, versions, switch_costs)
+        if best is None:
+            continue
+        entry_version, misses = best
+        plan.loop_entry_versions.append((sequence, entry_version))
+        plan.switches_per_iteration.append(len(misses))
+        for method_name, current, target in misses:
+            counts = votes.setdefault((method_name, current), {})
+            counts[target] = counts.get(target, 0) + 1
+
+    if not plan.loop_entry_versions:
+        return None
+    plan.miss_targets = {method_name: dict(table) for method_name, table in miss_targets.items()}
+    for (method_name, current), counts in votes.items():
+        target = min(counts, key=lambda v: (-counts[v], int(v)))
+        plan.miss_targets[method_name][current] = target
+    return plan
+
+
+# --- ヘルパー関数 ---
+def _get_unique_class_names(source_asts: list[ast.AST]) -> set[str]:
+    defining_module_counts: dict[str, int] = {}
+    for source_ast in source_asts:
+        module_class_names = set()
+        for node in source_ast.body:
+            if isinstance(node, ast.ClassDef):
+                class_name, _ = get_class_version_info(node)
+                if class_name:
+                    module_class_names.add(class_name)
+        for class_name in module_class_names:
+            defining_module_counts[class_name] = defining_module_counts.get(class_name, 0) + 1
+    return {class_name for class_name, count in defining_module_counts.items() if count == 1}
+
+def _plan_loop(
+    method_names: list[str],
+    defining_versions: dict[str, set[str]],
+    versions: list[str],
+    switch_costs: dict[tuple[str, str], float],
+) -> tuple[str, list[tuple[str, str, str]]] | None:
+    """
+    ループ1反復分の最適な遷移を返す。
+    戻り値: (入口のバージョン, [(ミスするメソッド, ミス時のバージョン, 切替先)])
+    入口へ戻る遷移がなければ None。
+    """
+    best = None
+    for entry_version in versions:
+        # 現在のバージョン -> (切替回数, 切替コスト, ミスの列)
+        states = {entry_version: (0, 0, ())}
+        for method_name in method_names:
+            next_states = {}
+            for current, (count, cost, misses) in states.items():
+                if current in defining_versions[method_name]:
+                    candidates = [(current, (count, cost, misses))]
+                else:
+                    candidates = [
+                        (target, (count + 1, cost + switch_costs.get((current, target), math.inf),
+                                  misses + ((method_name, current, target),)))
+                        for target in defining_versions[method_name]
+                    ]
+                for target, value in candidates:
+                    if target not in next_states or value[:2] < next_states[target][:2]:
+                        next_states[target] = value
+            states = next_states
+        if entry_version not in states:
+            continue
+        count, cost, misses = states[entry_version]
+        key = (count, cost, int(entry_version))
+        if best is None or key < best[0]:
+            best = (key, entry_version, list(misses))
+    if best is None:
+        return None
+    return best[1], best[2]
+
+def _get_class_names(source_ast: ast.AST, versioned_class_names: set[str]) -> dict[str, str]:
+    """モジュール内で統合クラスを指す名前 -> クラス名。別の束縛を持つ名前は除く。"""
+    candidates: dict[str, str] = {}
+    class_def_names: set[str] = set()
+    for node in source_ast.body:
+        if isinstance(node, ast.ClassDef):
+            class_name, _ = get_class_version_info(node)
+            if class_name in versioned_class_names:
+                candidates[class_name] = class_name
+                class_def_names.add(node.name)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name in versioned_class_names:
+                    candidates[alias.asname or alias.name] = alias.name
+
+    rebound: set[str] = set()
+    for node in ast.walk(source_ast):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            rebound.add(node.id)
+        elif isinstance(node, ast.arg):
+            rebound.add(node.arg)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if node.name not in class_def_names:
+                rebound.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            rebound.update(node.names)
+        elif isinstance(node, ast.Import):
+            rebound.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            rebound.update(
+                alias.asname or alias.name for alias in node.names
+                if alias.name not in versioned_class_names
+            )
+    return {name: class_name for name, class_name in candidates.items() if name not in rebound}
+
+def _collect_function_sequences(
+    func_node: ast.FunctionDef | ast.AsyncFunctionDef,
+    class_names_by_local_name: dict[str, str],
+) -> list[CallSequence]:
+    binding_counts = _count_bindings(func_node)
+    sequences = []
+    for index, stmt in enumerate(func_node.body):
+        receiver_info = _get_constructed_receiver(stmt, class_names_by_local_name)
+        if receiver_info is None:
+            continue
+        receiver, class_name = receiver_info
+        if binding_counts.get(receiver) != 1:
+            continue
+        for later_stmt in func_node.body[index + 1:]:
+            for loop in _iter_loops(later_stmt):
+                method_names = _get_loop_call_sequence(loop, receiver)
+                if method_names:
+                    sequences.append(CallSequence(class_name, receiver, loop, method_names))
+    return sequences
+
+def _get_constructed_receiver(stmt: ast.stmt, class_names_by_local_name: dict[str, str]) -> tuple[str, str] | None:
+    """`obj = Foo(...)` であれば (obj, Foo のクラス名) を返す。"""
+    if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)):
+        return None
+    value = stmt.value
+    if not (isinstance(value, ast.Call) and isinstance(value.func, ast.Name)):
+        return None
+    class_name = class_names_by_local_name.get(value.func.id)
+    if class_name is None:
+        return None
+    return stmt.targets[0].id, class_name
+
+def _count_bindings(func_node: ast.FunctionDef | ast.AsyncFunctionDef) -> dict[str, int]:
+    """関数内（内側のスコープを含む）で各名前が束縛される箇所の数を返す。"""
+    counts: dict[str, int] = {}
+    def add(name: str, count: int = 1):
+        counts[name] = counts.get(name, 0) + count
+
+    for arg in ast.walk(func_node.args):
+        if isinstance(arg, ast.arg):
+            add(arg.arg)
+    for node in ast.walk(ast.Module(body=func_node.body, type_ignores=[])):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            add(node.id)
+        elif isinstance(node, ast.arg):
+            add(node.arg)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            add(node.name)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                add((alias.asname or alias.name).split(".")[0])
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            # 束縛が関数外と共有されるため対象外にする
+            for name in node.names:
+                add(name, 2)
+    return counts
+
+def _iter_loops(node: ast.AST):
+    """内側のスコープに入らずにループ文を列挙する。"""
+    if isinstance(node, _LOOP_TYPES):
+        yield node
+    for child in ast.iter_child_nodes(node):
+        if not isinstance(child, _SCOPE_TYPES):
+            yield from _iter_loops(child)
+
+def _get_loop_call_sequence(loop: ast.stmt, receiver: str) -> list[str] | None:
+    """ループ1反復で受け手に対して呼ばれるメソッド名の列。扱えない使い方があれば None。"""
+    method_names = []
+    if isinstance(loop, ast.While):
+        head = loop.test
+    else:
+        # for 文の反復対象はループ入口より前に一度だけ評価される
+        if _uses_name(loop.iter, receiver) or _uses_name(loop.target, receiver):
+            return None
+        head = None
+    for node in ([head] if head is not None else []) + loop.body:
+        if not _uses_name(node, receiver):
+            continue
+        method_name = _get_receiver_call(node, receiver)
+        if method_name is None:
+            return None
+        method_names.append(method_name)
+    return method_names or None
+
+def _get_receiver_call(node: ast.AST, receiver: str) -> str | None:
+    """受け手を `obj.m(...)` の1回だけ使う単純な文・式であればメソッド名を返す。"""
+    if isinstance(node, ast.Expr):
+        value = node.value
+    elif isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+        if any(_uses_name(target, receiver) for target in _get_targets(node)):
+            return None
+        value = node.value
+    else:
+        value = node
+    if not (isinstance(value, ast.Call) and isinstance(value.func, ast.Attribute)):
+        return None
+    if not (isinstance(value.func.value, ast.Name) and value.func.value.id == receiver):
+        return None
+    if any(_uses_name(arg, receiver) for arg in [*value.args, *value.keywords]):
+        return None
+    return value.func.attr
+
+def _get_targets(node: ast.Assign | ast.AugAssign | ast.AnnAssign) -> list[ast.expr]:
+    return node.targets if isinstance(node, ast.Assign) else [node.target]
+
+def _uses_name(node: ast.AST, name: str) -> bool:
+    return any(isinstance(child, ast.Name) and child.id == name for child in ast.walk(node))
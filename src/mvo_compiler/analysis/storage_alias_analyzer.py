@@ -0,0 +1,127 @@
+import ast
+from dataclasses import dataclass, field
+
+from ..symbol_table.class_info import ClassInfo
+from .project_usage import ProjectUsage
+from ..util.ast_util import get_sync_function_version_info
+
+@dataclass
+class StorageAliasPlan:
+    """名前の付け替えのみを行う同期関数を、共有ストレージへの別名に置き換える計画。"""
+    class_name: str
+    # 互換性属性名 -> 値を格納する属性名（別名どうしで同じ格納先を共有する）
+    storage_names: dict[str, str] = field(default_factory=dict)
+    # 不要になった同期関数名
+    removed_sync_functions: set[str] = field(default_factory=set)
+
+def analyze_storage_aliases(
+    class_info: ClassInfo,
+    state_sync_components: tuple | None,
+    incompatibility: dict | None,
+    usage: ProjectUsage | None,
+) -> StorageAliasPlan | None:
+    """
+    互換性属性の格納先を付け替えるだけの同期関数の組を見つけ、付け替え前後の属性を
+    同じ格納先の別名にする計画を返す。
+
+    対象は2バージョンのクラスで、互いに逆向きの同期関数がどちらも互換性属性の付け替え
+    （`w._b = w._a; del w._a`）のみからなる場合に限る。このとき格納先の有無は現在のバージョンと
+    一致するため、getter/setter はバージョン番号で切替を判定でき、同期関数は不要になる。
+    """
+    if usage is None or not usage.is_whole_program or usage.has_dynamic_attribute_access:
+        return None
+    if not incompatibility or not state_sync_components:
+        return None
+    versions = sorted(class_info.get_all_versions(), key=int)
+    if len(versions) != 2:
+        return None
+
+    sync_by_pair: dict[tuple[str, str], ast.FunctionDef] = {}
+    for func_node in state_sync_components[1]:
+        from_ver, to_ver = get_sync_function_version_info(func_node)
+        if from_ver is None:
+            continue
+        sync_by_pair[(str(from_ver), str(to_ver))] = func_node
+
+    first, second = versions
+    forward = sync_by_pair.get((first, second))
+    backward = sync_by_pair.get((second, first))
+    if forward is None or backward is None or len(sync_by_pair) != 2:
+        return None
+    forward_renames = _get_renames(forward)
+    backward_renames = _get_renames(backward)
+    if not forward_renames or backward_renames != {dst: src for src, dst in forward_renames.items()}:
+        return None
+
+    attrs_by_version = {str(version): set(attrs) for version, attrs in incompatibility.items()}
+    first_attrs = attrs_by_version.get(first, set())
+    second_attrs = attrs_by_version.get(second, set())
+    plan = StorageAliasPlan(class_name=class_info.class_name)
+    for src, dst in forward_renames.items():
+        first_attr, second_attr = src[1:], dst[1:]
+        # 付け替えは `_<互換性属性名>` どうしで、それぞれのバージョンにのみ属する場合に限る
+        if not (src.startswith("_") and dst.startswith("_")):
+            return None
+        if first_attr not in first_attrs - second_attrs or second_attr not in second_attrs - first_attrs:
+            return None
+        # 格納先が getter/setter 以外から直接読み書きされていれば別名にできない
+        if src in usage.source_attrs or dst in usage.source_attrs:
+            return None
+        plan.storage_names[first_attr] = src
+        plan.storage_names[second_attr] = src
+
+    plan.removed_sync_functions = {forward.name, backward.name}
+    return plan
+
+def apply_storage_aliases(state_sync_components: tuple, plan: StorageAliasPlan) -> tuple:
+    """別名に置き換えた同期関数を取り除いた同期コンポーネントを返す。"""
+    sync_imports, sync_functions, sync_options = state_sync_components
+    kept = [func_node for func_node in sync_functions if func_node.name not in plan.removed_sync_functions]
+    return (sync_imports, kept, sync_options)
+
+
+# --- ヘルパー関数 ---
+def _get_renames(func_node: ast.FunctionDef) -> dict[str, str] | None:
+    """
+    同期関数が属性の付け替えのみからなる場合、付け替え元 -> 付け替え先 の対応を返す。
+        wrapper_obj._b = wrapper_obj._a
+        del wrapper_obj._a
+    それ以外の文を含む場合は None。
+    """
+    args = func_node.args
+    if len(args.args) != 1 or args.posonlyargs or args.vararg or args.kwonlyargs or args.kwarg or func_node.decorator_list:
+        return None
+    obj_name = args.args[0].arg
+
+    body = func_node.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str):
+        body = body[1:]
+
+    renames: dict[str, str] = {}
+    deleted: set[str] = set()
+    for stmt in body:
+        if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1:
+            dst = _get_obj_attr(stmt.targets[0], obj_name)
+            src = _get_obj_attr(stmt.value, obj_name)
+            if dst is None or src is None or src == dst or src in renames or src in deleted:
+                return None
+            renames[src] = dst
+        elif isinstance(stmt, ast.Delete) and len(stmt.targets) == 1:
+            name = _get_obj_attr(stmt.targets[0], obj_name)
+            if name is None or name not in renames or name in deleted:
+                return None
+            deleted.add(name)
+        else:
+            return None
+
+    if not renames or deleted != set(renames):
+        return None
+    # 付け替え先が別の付け替え元を上書きする連鎖（a -> b, b -> c など）は扱わない
+    if set(renames) & set(renames.values()) or len(set(renames.values())) != len(renames):
+        return None
+    return renames
+
+def _get_obj_attr(node: ast.expr, obj_name: str) -> str | None:
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == obj_name:
+        return node.attr
+    return None
@@ -0,0 +1,86 @@
+import math
+
+from ..symbol_table.class_info import ClassInfo
+from ..util.ast_util import get_sync_function_version_info
+from ..util.constants import INITIALIZE_METHOD_NAME, SYNC_OPTION_SYNC_COSTS
+from ..util import logger
+
+# コストの指定がない同期関数のコスト
+DEFAULT_SYNC_COST = 1
+
+def compute_switch_costs(
+    versions: list[str],
+    state_sync_components: tuple | None,
+) -> dict[tuple[str, str], float]:
+    """
+    バージョン間の切替コストを返す。
+
+    切替時に実行されるのは、切替前後のバージョンを直接結ぶ同期関数1つのみのため、
+    その同期関数の重みをコストとする。重みは同期モジュールの `SYNC_COSTS = {(from, to): cost}` で
+    指定でき、指定がなければ 1。同じバージョンへの切替は 0。
+    直接の同期関数がない組は、状態を変換せずに切り替わるため含めない（他のバージョンを経由しても同期されない）。
+    """
+    version_set = set(versions)
+    cost_hints = _get_cost_hints(state_sync_components)
+    costs: dict[tuple[str, str], float] = {(version, version): 0 for version in versions}
+    for func_node in (state_sync_components[1] if state_sync_components else []):
+        from_ver, to_ver = get_sync_function_version_info(func_node)
+        if from_ver is None or str(from_ver) not in version_set or str(to_ver) not in version_set:
+            continue
+        costs[(str(from_ver), str(to_ver))] = cost_hints.get((from_ver, to_ver), DEFAULT_SYNC_COST)
+    return costs
+
+def analyze_miss_targets(
+    class_info: ClassInfo,
+    state_sync_components: tuple | None,
+) -> dict[str, dict[str, str]]:
+    """
+    一致シグネチャのメソッドについて、ミス時の切替先を (現在のバージョン, メソッド名) ごとに求める。
+
+    戻り値:
+        { メソッド名: { 現在のバージョン: 切替先のバージョン } }
+    メソッドを定義しないバージョンからは、切替コストが最小の定義バージョンへ切り替える
+    （同コスト・到達不能の場合は最小のバージョン）。メソッドを定義するバージョンでのミスは
+    メソッド本体の AttributeError によるため、従来どおり最小の定義バージョンへ切り替える。
+    """
+    versions = sorted(class_info.get_all_versions(), key=int)
+    switch_costs = compute_switch_costs(versions, state_sync_components)
+
+    miss_targets: dict[str, dict[str, str]] = {}
+    for method_name, overloads in class_info.methods.items():
+        if method_name == INITIALIZE_METHOD_NAME:
+            continue
+        defining_versions = sorted({m.version for m in overloads}, key=int)
+        if not defining_versions:
+            continue
+        table = {}
+        for current in versions:
+            if current in defining_versions:
+                table[current] = defining_versions[0]
+            else:
+                table[current] = min(
+                    defining_versions,
+                    key=lambda v: (switch_costs.get((current, v), math.inf), int(v))
+                )
+        miss_targets[method_name] = table
+    return miss_targets
+
+
+# --- ヘルパー関数 ---
+def _get_cost_hints(state_sync_components: tuple | None) -> dict[tuple[int, int], float]:
+    if not state_sync_components:
+        return {}
+    hints = state_sync_components[2].get(SYNC_OPTION_SYNC_COSTS, {})
+    if not isinstance(hints, dict):
+        logger.warning_log(f"Ignoring {SYNC_OPTION_SYNC_COSTS}: expected a dict of (from, to) -> cost.")
+        return {}
+    out = {}
+    for key, cost in hints.items():
+        if (
+            not isinstance(key, tuple) or len(key) != 2 or not all(isinstance(v, int) for v in key)
+            or not isinstance(cost, (int, float)) or cost < 0
+        ):
+            logger.warning_log(f"Ignoring invalid {SYNC_OPTION_SYNC_COSTS} entry: {key!r}: {cost!r}.")
+            continue
+        out[key] = cost
+    return out
@@ -0,0 +1,440 @@
+import ast
+from dataclasses import dataclass, field
+
+from .devirtualization_analyzer import DevirtualizationPlan
+from ..symbol_table.class_info import ClassInfo
+from ..symbol_table.method_info import MethodInfo
+from ..util.ast_util import (
+    get_current_state_field_name,
+    get_factory_method_name,
+    get_switch_to_version_method_name,
+)
+from ..util.constants import INITIALIZE_METHOD_NAME, VERSION_SELECTION_LATEST
+
+# 別のスコープを作るノード（中で参照される変数は追跡しない）
+_SCOPE_TYPES = (
+    ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef,
+    ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp,
+)
+
+# 受け手の取りうるバージョンの集合（None は不明）
+Versions = frozenset[str] | None
+
+@dataclass
+class ClientCallPlan:
+    """クライアントコードの呼び出しでスタブが選ぶバージョンを静的に求めるための、クラスごとの情報。"""
+    class_name: str
+    versions: list[str]
+    devirtualization: DevirtualizationPlan
+    methods: dict[str, list[MethodInfo]] = field(default_factory=dict)
+    # 一致シグネチャのメソッドのミス時の切替先 { メソッド名: { 現在のバージョン: 切替先 } }
+    miss_targets: dict[str, dict[str, str]] = field(default_factory=dict)
+    # latest 戦略ではスタブが常に最新の定義バージョンへ事前に切り替える
+    is_latest: bool = False
+    # 通常属性の読み書きでも切替が起こりうるか（互換性属性のプロパティ・属性アクセスの特殊メソッド）
+    field_access_may_switch: bool = False
+    # self を属性アクセス以外に使い、別名を作りうる (バージョン, メソッド名)
+    self_leaking: set[tuple[str, str]] = field(default_factory=set)
+    # 定義元モジュール名（呼び出し箇所の import 解決に使う）
+    module_name: str | None = None
+
+    def get_running_versions(self, versions: Versions, method_name: str, call: ast.Call) -> Versions:
+        """スタブ経由の呼び出しでメソッド本体が実行されうるバージョンの集合を返す。"""
+        overloads = self.methods.get(method_name)
+        if not overloads:
+            return None
+        defining_versions = {m.version for m in overloads}
+        sources = set(versions) if versions is not None else set(self.versions)
+        if self.is_latest:
+            sources = {max(defining_versions, key=int)}
+        if method_name in self.miss_targets:
+            return frozenset(
+                current if current in defining_versions else self.miss_targets[method_name][current]
+                for current in sources
+            )
+        # 不一致シグネチャ: 現在のバージョンが受け付けなければ受け付ける最小のバージョンへ切り替える
+        if any(isinstance(arg, ast.Starred) for arg in call.args) or any(kw.arg is None for kw in call.keywords):
+            return None
+        keyword_names = [kw.arg for kw in call.keywords]
+        accepting = sorted(
+            {m.version for m in overloads if m.accepts(len(call.args), keyword_names)}, key=int
+        )
+        if not accepting:
+            return None
+        return frozenset(current if current in accepting else accepting[0] for current in sources)
+
+def analyze_client_calls(
+    class_info: ClassInfo,
+    devirtualization: DevirtualizationPlan | None,
+    miss_targets: dict[str, dict[str, str]],
+    incompatibility: dict | None,
+    version_selection_strategy: str,
+) -> ClientCallPlan | None:
+    """
+    クライアントコードで受け手のバージョンが分かる呼び出しを、実装クラスの直接呼び出しへ
+    書き換えるための情報を求める。versionedメソッドの直接化ができないクラスは対象外とする。
+    """
+    if devirtualization is None:
+        return None
+    plan = ClientCallPlan(
+        class_name=class_info.class_name,
+        versions=sorted(class_info.get_all_versions(), key=int),
+        devirtualization=devirtualization,
+        # 特殊メソッドは演算子などから暗黙に呼ばれるため扱わない
+        methods={name: overloads for name, overloads in class_info.methods.items() if not name.startswith("__")},
+        miss_targets={
+            name: table for name, table in miss_targets.items()
+            if class_info.has_consistent_signature(name)
+        },
+        is_latest=version_selection_strategy == VERSION_SELECTION_LATEST,
+        field_access_may_switch=bool(incompatibility) or any(
+            name.startswith("__") and name.endswith("__") and name != INITIALIZE_METHOD_NAME
+            for name in class_info.methods
+        ),
+    )
+    for version in class_info.get_all_versions():
+        for method_info in class_info.get_methods_for_version(version):
+            if _may_leak_self(method_info, set(class_info.methods)):
+                plan.self_leaking.add((version, method_info.name))
+    return plan
+
+def infer_client_call_versions(
+    func_node: ast.FunctionDef | ast.AsyncFunctionDef,
+    plans_by_local_name: dict[str, ClientCallPlan],
+) -> dict[int, tuple[str, str, MethodInfo]]:
+    """
+    関数内のローカル変数が指す統合クラスのインスタンスのバージョンを文の流れに沿って求め、
+    呼び出し時点のバージョンが1つに定まり、そのバージョンの実装が直接呼び出せる
+    `obj.m(...)` を返す。
+
+    戻り値: { id(呼び出しノード): (クラスを指す名前, バージョン, 呼び出し先) }
+    追跡するのは `obj = Foo(...)` / `obj = Foo._new_v1(...)` で束縛された変数のみで、
+    受け手・属性アクセス以外に使われた時点（引数渡し・代入・演算など）で追跡をやめる。
+    内側のスコープから参照される変数、global / nonlocal 宣言された変数は追跡しない。
+    """
+    inference = _VersionInference(plans_by_local_name, _get_untrackable_names(func_node))
+    inference.exec_block(func_node.body, {})
+    return inference.decisions
+
+
+# --- ヘルパー関数 ---
+def _may_leak_self(method_info: MethodInfo, method_names: set[str]) -> bool:
+    """メソッドが self を属性アクセス以外に使い、呼び出し後も残る別名を作りうるかを返す。"""
+    node = method_info.ast_node
+    if node is None or node.decorator_list or not node.args.args:
+        return True
+    self_name = node.args.args[0].arg
+    attribute_bases: set[int] = set()
+    for child in ast.walk(node):
+        if isinstance(child, (ast.Yield, ast.YieldFrom, ast.Await)):
+            return True
+        if isinstance(child, ast.Call) and isinstance(child.func, ast.Name) and child.func.id == "super":
+            return True
+        if isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name):
+            # 呼び出さずに取り出したメソッドは self を束縛したまま残る
+            if child.attr not in method_names:
+                attribute_bases.add(id(child.value))
+        elif isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute) and isinstance(child.func.value, ast.Name):
+            attribute_bases.add(id(child.func.value))
+    for child in ast.walk(ast.Module(body=node.body, type_ignores=[])):
+        if isinstance(child, _SCOPE_TYPES) and any(
+            isinstance(inner, ast.Name) and inner.id == self_name for inner in ast.walk(child)
+        ):
+            return True
+        if isinstance(child, ast.Name) and child.id == self_name and id(child) not in attribute_bases:
+            return True
+    return False
+
+def _get_untrackable_names(func_node: ast.FunctionDef | ast.AsyncFunctionDef) -> set[str]:
+    names: set[str] = set()
+    for child in ast.walk(ast.Module(body=func_node.body, type_ignores=[])):
+        if isinstance(child, (ast.Global, ast.Nonlocal)):
+            names.update(child.names)
+        elif isinstance(child, _SCOPE_TYPES):
+            names.update(inner.id for inner in ast.walk(child) if isinstance(inner, ast.Name))
+    return names
+
+def _get_bound_names(target: ast.AST) -> set[str]:
+    return {child.id for child in ast.walk(target) if isinstance(child, ast.Name)}
+
+def _merge_states(states: list[dict | None]) -> dict | None:
+    """制御フローの合流点の状態を求める。片方でしか追跡していない変数は追跡をやめる。"""
+    reachable = [state for state in states if state is not None]
+    if not reachable:
+        return None
+    merged = dict(reachable[0])
+    for state in reachable[1:]:
+        for name in list(merged):
+            if name not in state or state[name][0] != merged[name][0]:
+                del merged[name]
+                continue
+            versions, other = merged[name][1], state[name][1]
+            merged[name] = (merged[name][0], None if versions is None or other is None else versions | other)
+    return merged
+
+class _VersionInference:
+    """関数本体を文の順に解釈し、追跡中の変数のクラスと取りうるバージョンを求める。"""
+    def __init__(self, plans_by_local_name: dict[str, ClientCallPlan], untrackable_names: set[str]):
+        self.plans_by_local_name = plans_by_local_name
+        self.untrackable_names = untrackable_names
+        self.decisions: dict[int, tuple[str, str, MethodInfo]] = {}
+        # ループごとの break / continue 時点の状態
+        self.loop_exits: list[tuple[list, list]] = []
+
+    # --- 文 ---
+    def exec_block(self, stmts: list[ast.stmt], state: dict | None) -> dict | None:
+        for stmt in stmts:
+            if state is None:
+                break
+            state = self.exec_stmt(stmt, state)
+        return state
+
+    def exec_stmt(self, stmt: ast.stmt, state: dict) -> dict | None:
+        if isinstance(stmt, ast.Expr):
+            self.eval(stmt.value, state)
+        elif isinstance(stmt, ast.Assign):
+            self.eval(stmt.value, state)
+            for target in stmt.targets:
+                self.assign(target, stmt.value if len(stmt.targets) == 1 else None, state)
+        elif isinstance(stmt, ast.AnnAssign):
+            if stmt.value is not None:
+                self.eval(stmt.value, state)
+                self.assign(stmt.target, stmt.value, state)
+        elif isinstance(stmt, ast.AugAssign):
+            self.eval(stmt.value, state)
+            self.assign(stmt.target, None, state)
+        elif isinstance(stmt, ast.Delete):
+            for target in stmt.targets:
+                self.assign(target, None, state)
+        elif isinstance(stmt, (ast.Return, ast.Raise)):
+            for child in ast.iter_child_nodes(stmt):
+                self.eval(child, state)
+            return None
+        elif isinstance(stmt, (ast.Break, ast.Continue)):
+            if not self.loop_exits:
+                return None
+            breaks, continues = self.loop_exits[-1]
+            (breaks if isinstance(stmt, ast.Break) else continues).append(dict(state))
+            return None
+        elif isinstance(stmt, ast.If):
+            self.eval(stmt.test, state)
+            body_state, else_state = self.refine(stmt.test, state)
+            return _merge_states([
+                self.exec_block(stmt.body, body_state),
+                self.exec_block(stmt.orelse, else_state),
+            ])
+        elif isinstance(stmt, (ast.For, ast.AsyncFor, ast.While)):
+            return self.exec_loop(stmt, state)
+        elif isinstance(stmt, (ast.With, ast.AsyncWith)):
+            for item in stmt.items:
+                self.eval(item.context_expr, state)
+                if item.optional_vars is not None:
+                    self.assign(item.optional_vars, None, state)
+            return self.exec_block(stmt.body, state)
+        elif isinstance(stmt, ast.Try):
+            # 例外はどこで送出されるか分からないため、except / finally 節では何も仮定しない
+            body_state = self.exec_block(stmt.orelse, self.exec_block(stmt.body, state))
+            handler_states = [self.exec_block(handler.body, {}) for handler in stmt.handlers]
+            state = _merge_states([body_state, *handler_states])
+            if stmt.finalbody:
+                finally_state = self.exec_block(stmt.finalbody, {})
+                return None if state is None else finally_state
+            return state
+        elif isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            for child in [*stmt.decorator_list, *getattr(stmt, "bases", []), *getattr(stmt, "keywords", [])]:
+                self.eval(child, state)
+            if not isinstance(stmt, ast.ClassDef):
+                for default in [*stmt.args.defaults, *stmt.args.kw_defaults]:
+                    if default is not None:
+                        self.eval(default, state)
+            state.pop(stmt.name, None)
+        elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            for alias in stmt.names:
+                state.pop((alias.asname or alias.name).split(".")[0], None)
+        elif isinstance(stmt, (ast.Pass, ast.Global, ast.Nonlocal)):
+            pass
+        else:
+            # match 文など: 中で使われる変数の追跡をやめ、呼び出しは書き換えない
+            for name in _get_bound_names(stmt):
+                state.pop(name, None)
+        return state
+
+    def exec_loop(self, loop: ast.For | ast.AsyncFor | ast.While, state: dict) -> dict | None:
+        if not isinstance(loop, ast.While):
+            self.eval(loop.iter, state)
+        head_state = dict(state)
+        while True:
+            breaks, continues = [], []
+            self.loop_exits.append((breaks, continues))
+            body_entry = dict(head_state)
+            if isinstance(loop, ast.While):
+                self.eval(loop.test, body_entry)
+            else:
+                self.assign(loop.target, None, body_entry)
+            exit_state = dict(body_entry)
+            body_end = self.exec_block(loop.body, dict(body_entry))
+            self.loop_exits.pop()
+            # 直前の状態とも合流させ、不動点計算が単調に進むようにする
+            next_head = _merge_states([head_state, body_end, *continues])
+            if next_head == head_state:
+                break
+            head_state = next_head
+        return _merge_states([self.exec_block(loop.orelse, exit_state), *breaks])
+
+    def assign(self, target: ast.AST, value: ast.expr | None, state: dict):
+        if isinstance(target, ast.Name):
+            constructed = self.get_constructed(value) if value is not None else None
+            if constructed is not None and target.id not in self.untrackable_names:
+                state[target.id] = constructed
+            else:
+                state.pop(target.id, None)
+        elif isinstance(target, (ast.Tuple, ast.List, ast.Starred)):
+            for name in _get_bound_names(target):
+                state.pop(name, None)
+        else:
+            self.eval(target, state)
+
+    def get_constructed(self, value: ast.expr) -> tuple[str, Versions] | None:
+        """`Foo(...)` / `Foo._new_v1(...)` であれば (クラスを指す名前, バージョン) を返す。"""
+        if not isinstance(value, ast.Call):
+            return None
+        func = value.func
+        if isinstance(func, ast.Name) and func.id in self.plans_by_local_name:
+            return (func.id, None)
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            plan = self.plans_by_local_name.get(func.value.id)
+            if plan is not None:
+                for version in plan.versions:
+                    if func.attr == get_factory_method_name(version):
+                        return (func.value.id, frozenset({version}))
+        return None
+
+    def refine(self, test: ast.expr, state: dict) -> tuple[dict, dict]:
+        """`obj._foo_current_state._version_number != 1` の分岐先ごとの状態を返す。"""
+        body_state, else_state = dict(state), dict(state)
+        if not (
+            isinstance(test, ast.Compare) and len(test.ops) == 1 and isinstance(test.ops[0], (ast.Eq, ast.NotEq))
+            and isinstance(test.comparators[0], ast.Constant) and isinstance(test.comparators[0].value, int)
+        ):
+            return body_state, else_state
+        left = test.left
+        if not (
+            isinstance(left, ast.Attribute) and left.attr == "_version_number"
+            and isinstance(left.value, ast.Attribute) and isinstance(left.value.value, ast.Name)
+        ):
+            return body_state, else_state
+        name = left.value.value.id
+        if name not in state:
+            return body_state, else_state
+        local_class_name, versions = state[name]
+        if left.value.attr != get_current_state_field_name(self.plans_by_local_name[local_class_name].class_name):
+            return body_state, else_state
+        version = str(test.comparators[0].value)
+        equal_versions = frozenset({version}) if versions is None or version in versions else frozenset()
+        other_versions = None if versions is None else versions - {version}
+        if isinstance(test.ops[0], ast.NotEq):
+            equal_versions, other_versions = other_versions, equal_versions
+        body_state[name] = (local_class_name, equal_versions)
+        else_state[name] = (local_class_name, other_versions)
+        return body_state, else_state
+
+    # --- 式（評価順に解釈する）---
+    def eval(self, node: ast.AST, state: dict):
+        if isinstance(node, ast.Call):
+            self.eval_call(node, state)
+        elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in state:
+            self.eval_field_access(node, state)
+        elif isinstance(node, ast.Name):
+            # 受け手以外としての使用（引数渡し・代入・演算など）以降は別名がありうる
+            state.pop(node.id, None)
+        elif isinstance(node, ast.NamedExpr):
+            self.eval(node.value, state)
+            state.pop(node.target.id, None)
+        elif isinstance(node, ast.BoolOp):
+            self.eval(node.values[0], state)
+            self.skip(node.values[1:], state)
+        elif isinstance(node, ast.IfExp):
+            self.eval(node.test, state)
+            self.skip([node.body, node.orelse], state)
+        elif isinstance(node, _SCOPE_TYPES):
+            self.skip([node], state)
+        elif isinstance(node, ast.Dict):
+            for key, value in zip(node.keys, node.values):
+                if key is not None:
+                    self.eval(key, state)
+                self.eval(value, state)
+        else:
+            for child in ast.iter_child_nodes(node):
+                self.eval(child, state)
+
+    def eval_call(self, call: ast.Call, state: dict):
+        # ループの不動点計算では同じ呼び出しを何度も解釈するため、最後の判定のみを残す
+        self.decisions.pop(id(call), None)
+        func = call.func
+        receiver = func.value.id if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) else None
+        if receiver not in state:
+            self.eval(func, state)
+            self.eval_arguments(call, state)
+            return
+
+        local_class_name, _ = state[receiver]
+        plan = self.plans_by_local_name[local_class_name]
+        if func.attr == get_switch_to_version_method_name(plan.class_name):
+            self.eval_arguments(call, state)
+            if receiver in state and len(call.args) == 1 and not call.keywords and isinstance(call.args[0], ast.Constant):
+                state[receiver] = (local_class_name, frozenset({str(call.args[0].value)}))
+            else:
+                state.pop(receiver, None)
+            return
+        if func.attr not in plan.methods:
+            state.pop(receiver, None)
+            self.eval_arguments(call, state)
+            return
+
+        self.eval_arguments(call, state)
+        if receiver not in state:
+            return
+        _, versions = state[receiver]
+        # 書き換えるのは try/except で実装を探す一致シグネチャのスタブのみ（不一致シグネチャは呼び出し形で選ぶ）
+        if versions is not None and len(versions) == 1 and func.attr in plan.miss_targets:
+            target = plan.devirtualization.get_target(next(iter(versions)), call, receiver)
+            if target is not None:
+                self.decisions[id(call)] = (local_class_name, target.version, target)
+
+        running_versions = plan.get_running_versions(versions, func.attr, call)
+        if running_versions is None:
+            running_versions = frozenset(m.version for m in plan.methods[func.attr])
+            versions_after = None
+        else:
+            versions_after = running_versions
+        if any((version, func.attr) in plan.self_leaking for version in running_versions):
+            state.pop(receiver, None)
+        elif versions_after is None or any(
+            plan.devirtualization.needs_guard(version, func.attr) for version in running_versions
+        ):
+            state[receiver] = (local_class_name, None)
+        else:
+            state[receiver] = (local_class_name, versions_after)
+
+    def eval_arguments(self, call: ast.Call, state: dict):
+        for arg in call.args:
+            self.eval(arg, state)
+        for keyword in call.keywords:
+            self.eval(keyword.value, state)
+
+    def eval_field_access(self, node: ast.Attribute, state: dict):
+        local_class_name, _ = state[node.value.id]
+        plan = self.plans_by_local_name[local_class_name]
+        if node.attr == get_current_state_field_name(plan.class_name):
+            return
+        if node.attr in plan.methods:
+            # 呼び出さずに取り出したメソッドは受け手を束縛したまま残る
+            state.pop(node.value.id, None)
+        elif plan.field_access_may_switch:
+            state[node.value.id] = (local_class_name, None)
+
+    def skip(self, nodes: list[ast.AST], state: dict):
+        """実行されるか分からない部分式: 中で使われる変数の追跡をやめ、呼び出しは書き換えない。"""
+        for node in nodes:
+            for name in _get_bound_names(node):
+                state.pop(name, None)
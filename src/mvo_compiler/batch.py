@@ -0,0 +1,96 @@
+import contextlib
+import io
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from .pipeline import compile_project
+from .runner import ExecutionPool
+from .util import logger
+
+CompileJob = tuple[Path, Path, dict]
+
+@dataclass
+class CompileResult:
+    """compile_projects() での1プロジェクトのコンパイル結果。"""
+    input_dir: Path
+    output_dir: Path
+    succeeded: bool
+    elapsed_ms: float
+    error: str | None = None
+    # コンパイル中に出力したメッセージ
+    output: str = ""
+
+def compile_projects(
+    jobs: Iterable[CompileJob],
+    *,
+    max_workers: int | None = None,
+    cache_dir: Path | None = None,
+    pool: ExecutionPool | None = None,
+) -> list[CompileResult]:
+    """
+    (入力ディレクトリ, 出力ディレクトリ, compile_project() のキーワード引数) の組をまとめてコンパイルし、
+    結果を同じ順に返す。
+
+    プロジェクトはワーカープロセスで並行にコンパイルする。ワーカーはコンパイラとテンプレートを
+    読み込んだ状態で次のプロジェクトにも使われる。pool を渡すとそのワーカーを使い、
+    max_workers が 1 の場合はこのプロセスで順にコンパイルする。
+    cache_dir を渡すと、cache_dir を指定していないプロジェクトの変換キャッシュとして共有する。
+    各プロジェクトのメッセージは、完了後にプロジェクトの順で出力する。
+    """
+    jobs = [
+        (input_dir, output_dir, {"cache_dir": cache_dir, **options} if cache_dir is not None else dict(options))
+        for input_dir, output_dir, options in jobs
+    ]
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+    start = time.perf_counter()
+
+    if pool is None and max_workers <= 1:
+        results = [_compile_job(*job, logger.LEVEL) for job in jobs]
+    else:
+        owned_pool = ExecutionPool(max_workers) if pool is None else None
+        try:
+            futures = [(owned_pool or pool).submit(_compile_job, *job, logger.LEVEL) for job in jobs]
+            results = [future.result() for future in futures]
+        finally:
+            if owned_pool is not None:
+                owned_pool.close()
+
+    for result in results:
+        if result.output:
+            logger.log(result.output.rstrip("\n"))
+        if not result.succeeded:
+            logger.error_log(f"Failed to compile {result.input_dir}: {result.error}")
+        logger.event(
+            "batch_project_compiled",
+            path=str(result.input_dir),
+            succeeded=result.succeeded,
+            elapsed_ms=round(result.elapsed_ms, 3),
+        )
+    failed_count = sum(1 for result in results if not result.succeeded)
+    logger.report_log(
+        f"Compiled {len(results)} project(s) in {(time.perf_counter() - start) * 1000:.1f} ms"
+        f" ({failed_count} failed)."
+    )
+    return results
+
+
+# --- ヘルパー関数 ---
+def _compile_job(input_dir: Path, output_dir: Path, options: dict, log_level: int) -> CompileResult:
+    # ワーカーでも呼び出し元と同じレベルでメッセージを出し、出力は結果として返す
+    logger.set_level(log_level)
+    output = io.StringIO()
+    start = time.perf_counter()
+    result = CompileResult(input_dir, output_dir, succeeded=True, elapsed_ms=0.0)
+    with contextlib.redirect_stdout(output):
+        try:
+            compile_project(input_dir, output_dir, **options)
+        except Exception as e:
+            result.succeeded = False
+            result.error = str(e)
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    result.output = output.getvalue()
+    return result
@@ -0,0 +1,72 @@
+import ast
+import re
+
+from ..analysis.adaptive_analyzer import AdaptivePlan
+from ..util.ast_util import *
+from ..util.template_util import get_template_string
+
+_ADAPTIVE_MISS_TEMPLATE = "adaptive_miss_template.py"
+
+def build_adaptive_components(plan: AdaptivePlan | None) -> list[ast.stmt]:
+    """
+    adaptive 戦略のミス処理メソッドと、それが使うクラス属性を生成する。
+
+        _FOO_COVER_VERSIONS = {('m1', 'm2'): 3, ...}
+        _FOO_BORROWABLE_PAIRS = frozenset({(1, 2), ...})
+        _foo_adaptive_state = None
+        def _foo_adaptive_miss(self, method_name, target_version): ...
+
+    直前のミス・往復の連続回数・借りている組はインスタンスごとに記録する（最初のミスで
+    _foo_adaptive_state に作る）。あるインスタンスの往復が、他のインスタンスの切替に影響しない。
+    """
+    if plan is None:
+        return []
+    template_string = get_template_string(_ADAPTIVE_MISS_TEMPLATE)
+    if not template_string:
+        return []
+
+    class_name = plan.class_name
+    names = {
+        'cover_versions': f"_{class_name.upper()}_COVER_VERSIONS",
+        'borrowable_pairs': f"_{class_name.upper()}_BORROWABLE_PAIRS",
+        'adaptive_state': get_adaptive_state_field_name(class_name),
+    }
+    replacements = {
+        r'_ADAPTIVE_MISS_PLACEHOLDER': get_adaptive_miss_method_name(class_name),
+        r'_CURRENT_STATE_PLACEHOLDER': get_current_state_field_name(class_name),
+        r'_VERSION_INSTANCES_SINGLETON_PLACEHOLDER': get_version_instances_singleton_name(class_name),
+        r'_SWITCH_TO_VERSION_PLACEHOLDER': get_switch_to_version_method_name(class_name),
+        r'_COVER_VERSIONS_PLACEHOLDER': names['cover_versions'],
+        r'_BORROWABLE_PAIRS_PLACEHOLDER': names['borrowable_pairs'],
+        r'_ADAPTIVE_STATE_PLACEHOLDER': names['adaptive_state'],
+        r'\[THRESHOLD\]': str(plan.threshold),
+    }
+    for pattern, value in replacements.items():
+        template_string = re.sub(pattern, value, template_string)
+    miss_method = ast.parse(template_string).body[0]
+
+    cover_versions = ast.Dict(
+        keys=[ast.Tuple(elts=[ast.Constant(value=first), ast.Constant(value=second)], ctx=ast.Load())
+              for first, second in plan.cover_versions],
+        values=[ast.Constant(value=version) for version in plan.cover_versions.values()]
+    )
+    return [
+        _class_attr(names['cover_versions'], cover_versions),
+        _class_attr(names['borrowable_pairs'], _frozenset_of_pairs(plan.borrowable_pairs)),
+        _class_attr(names['adaptive_state'], ast.Constant(value=None)),
+        miss_method,
+    ]
+
+
+# --- ヘルパー ---
+def _class_attr(name: str, value: ast.expr) -> ast.Assign:
+    return ast.Assign(targets=[ast.Name(id=name, ctx=ast.Store())], value=value)
+
+def _frozenset_of_pairs(pairs: set[tuple[int, int]]) -> ast.Call:
+    args = []
+    if pairs:
+        args.append(ast.Set(elts=[
+            ast.Tuple(elts=[ast.Constant(value=first), ast.Constant(value=second)], ctx=ast.Load())
+            for first, second in sorted(pairs)
+        ]))
+    return ast.Call(func=ast.Name(id='frozenset', ctx=ast.Load()), args=args, keywords=[])
@@ -3,7 +3,7 @@ import re
 import copy
 
 from ..util.template_util import get_template_string
-from ..util.ast_util import get_switch_to_version_method_name
+from ..util.ast_util import get_current_state_field_name, get_dirty_flag_field_name, get_switch_to_version_method_name
 from ..util import logger
 
 def build_sync_components(
@@ -16,8 +16,8 @@ def build_sync_components(
     if not state_sync_components:
         return []
 
-    _, sync_functions = state_sync_components
-    logger.debug_log(f"Injecting {len(sync_functions)} sync functions for {class_name}")
+    sync_functions = state_sync_components[1]
+    logger.debug_log(lambda: f"Injecting {len(sync_functions)} sync functions for {class_name}")
 
     out: list[ast.FunctionDef] = []
     for func_node in sync_functions:
@@ -31,32 +31,55 @@ def build_sync_components(
 def build_getattr_setattr_methods(
     class_name: str,
     incompatibility: dict | None = None,
+    dirty_tracking: bool = False,
+    storage_names: dict[str, str] | None = None,
 ) -> list[ast.FunctionDef]:
     """
     動的属性アクセスのための __getattr__/__setattr__ を生成する。
+    dirty_tracking が有効な場合、setter は書き込みフラグを立てる。
+    storage_names に含まれる属性は、指定された格納先の別名として現在のバージョン番号で切替を判定する。
     """
     if incompatibility is None:
         return []
 
-    getter_template_string = get_template_string("getter_template.py")
-    setter_template_string = get_template_string("setter_template.py")
+    storage_names = storage_names or {}
     switch_method_name = get_switch_to_version_method_name(class_name)
+    current_state_name = get_current_state_field_name(class_name)
 
     out: list[ast.FunctionDef] = []
     for version, attr_list in incompatibility.items():
         for attr in attr_list:
             logger.debug_log(
-                f"Injecting __getattr__ and __setattr__ for attribute '{attr}' in version {version}"
+                lambda: f"Injecting __getattr__ and __setattr__ for attribute '{attr}' in version {version}"
             )
-            getter_template_copy = re.sub(r'\[ATTR\]', attr, getter_template_string)
-            getter_template_copy = re.sub(r'\[VERSION\]', str(version), getter_template_copy)
-            getter_template_copy = re.sub(r'_SWITCH_TO_VERSION_PLACEHOLDER', switch_method_name, getter_template_copy)
+            if attr in storage_names:
+                getter_template_name, setter_template_name = "alias_getter_template.py", "alias_setter_template.py"
+            else:
+                getter_template_name, setter_template_name = "getter_template.py", "setter_template.py"
+            replacements = {
+                r'\[ATTR\]': attr,
+                r'\[VERSION\]': str(version),
+                r'\[STORAGE\]': storage_names.get(attr, f"_{attr}"),
+                r'_SWITCH_TO_VERSION_PLACEHOLDER': switch_method_name,
+                r'_CURRENT_STATE_PLACEHOLDER': current_state_name,
+            }
+            getter_template_copy = get_template_string(getter_template_name)
+            setter_template_copy = get_template_string(setter_template_name)
+            for pattern, value in replacements.items():
+                getter_template_copy = re.sub(pattern, value, getter_template_copy)
+                setter_template_copy = re.sub(pattern, value, setter_template_copy)
             template_ast_getter = ast.parse(getter_template_copy).body[0]
-
-            setter_template_copy = re.sub(r'\[ATTR\]', attr, setter_template_string)
-            setter_template_copy = re.sub(r'\[VERSION\]', str(version), setter_template_copy)
-            setter_template_copy = re.sub(r'_SWITCH_TO_VERSION_PLACEHOLDER', switch_method_name, setter_template_copy)
             template_ast_setter = ast.parse(setter_template_copy).body[0]
+            if dirty_tracking:
+                # self._xxx_dirty = True
+                template_ast_setter.body.append(ast.Assign(
+                    targets=[ast.Attribute(
+                        value=ast.Name(id='self', ctx=ast.Load()),
+                        attr=get_dirty_flag_field_name(class_name),
+                        ctx=ast.Store()
+                    )],
+                    value=ast.Constant(value=True)
+                ))
 
             out.append(template_ast_getter)
             out.append(template_ast_setter)
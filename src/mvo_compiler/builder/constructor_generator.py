@@ -1,40 +1,231 @@
 import ast
+import copy
+import re
 
+from .migration_generator import build_instance_tracking
+from ..analysis.constructor_analyzer import ConstructorFactoryPlan
 from ..symbol_table.symbol_table import SymbolTable
 from ..util.ast_util import *
-from ..util.template_util import load_template_ast, TemplateRenamer
-from ..util.builder_util import _create_slow_path_dispatcher
+from ..util.template_util import get_template_string, load_template_ast, TemplateRenamer
+from ..util.builder_util import _create_shape_dispatcher
 from ..util import logger
-from ..util.constants import INITIALIZE_METHOD_NAME
+from ..util.constants import INITIALIZE_METHOD_NAME, SWITCH_COUNT_ATTR_NAME, WRAPPER_SELF_ARG_NAME
 
 _CONSTRUCTOR_TEMPLATE = "constructor_template.py"
+_BULK_CONSTRUCTION_TEMPLATE = "bulk_construction_template.py"
 
-def build_constructor(symbol_table: SymbolTable, class_name: str) -> ast.FunctionDef | None:
-    """統合クラス用の __init__ を生成して返す。"""
+def build_constructor(
+    symbol_table: SymbolTable,
+    class_name: str,
+    track_instances: bool = False,
+) -> ast.FunctionDef | None:
+    """
+    統合クラス用の __init__ を生成して返す。
+    track_instances が有効な場合、生成したオブジェクトを migrate_all() の対象として追跡する。
+    """
     template_ast = _load_constructor_template_ast()
     if not template_ast:
         return None
 
-    # 0. テンプレートのプレースホルダを置換
-    TemplateRenamer(class_name=class_name).visit(template_ast)
+    # 0. テンプレートのプレースホルダを置換（初期状態は最小バージョン）
+    class_info = symbol_table.lookup_class(class_name)
+    initial_version = min(int(v) for v in class_info.get_all_versions())
+    TemplateRenamer(class_name=class_name, initial_version=initial_version).visit(template_ast)
 
     # 1. __initialize__ の情報をシンボルテーブルから取得
-    class_info = symbol_table.lookup_class(class_name)
     initialize_overloads = class_info.methods.get(INITIALIZE_METHOD_NAME, [])
 
-    # 2. スローパスのディスパッチ（if-elif）生成
-    slow_path_body = _create_slow_path_dispatcher(
+    # 2. 呼び出し形によるディスパッチでプレースホルダ（pass）を置換
+    #    __initialize__ がない場合は初期状態の設定のみ
+    template_ast.body[1:] = _create_shape_dispatcher(
         class_name, INITIALIZE_METHOD_NAME, initialize_overloads
+    ) if initialize_overloads else []
+    if track_instances:
+        template_ast.body[1:1] = build_instance_tracking(class_name, 'self')
+
+    return template_ast
+
+def build_factory_methods(plan: ConstructorFactoryPlan | None) -> list[ast.FunctionDef]:
+    """
+    呼び出し箇所の特殊化で使う、バージョンごとの生成用 classmethod を生成する。
+
+        @classmethod
+        def _new_v1(cls, value):
+            self = object.__new__(cls)
+            self._xxx_current_state = cls._XXX_VERSION_INSTANCES_SINGLETON[1]
+            self._xxx_current_state.__initialize__(value, _wrapper_self=self)
+            return self
+    """
+    if plan is None:
+        return []
+
+    factories: list[ast.FunctionDef] = []
+    for method_info in plan.init_overloads:
+        if method_info.version not in plan.factory_versions:
+            continue
+        factories.append(_build_factory_method(plan, method_info))
+    return factories
+
+def build_bulk_construction_methods(
+    plan: ConstructorFactoryPlan | None,
+    incompatibility: dict | None = None,
+    storage_names: dict[str, str] | None = None,
+) -> list[ast.stmt]:
+    """
+    指定バージョンのオブジェクトをまとめて生成する classmethod を生成する。
+
+        _XXX_BULK_VERSIONS = frozenset({1, 2})
+        _XXX_COLUMN_STORAGE = {'x': '_x'}
+        @classmethod
+        def build_many(cls, version_num, args_iterable): ...
+        @classmethod
+        def build_columns(cls, version_num, **columns): ...
+
+    build_many は初期化子を、build_columns は __dict__ を列の値から直接作る。
+    対象バージョンはファクトリと同じ（object.__new__ で確保してバージョンを一度だけ設定できるもの）。
+    互換性属性の列は getter/setter が読み書きする格納先へ格納する。
+    """
+    if plan is None:
+        return []
+    template_string = get_template_string(_BULK_CONSTRUCTION_TEMPLATE)
+    if not template_string:
+        return []
+
+    class_name = plan.class_name
+    replacements = {
+        r'_BULK_VERSIONS_PLACEHOLDER': get_bulk_versions_name(class_name),
+        r'_COLUMN_STORAGE_PLACEHOLDER': get_column_storage_name(class_name),
+        r'_CURRENT_STATE_PLACEHOLDER': get_current_state_field_name(class_name),
+        r'_VERSION_INSTANCES_SINGLETON_PLACEHOLDER': get_version_instances_singleton_name(class_name),
+        r'\[INITIAL_VERSION\]': str(int(plan.initial_version)),
+    }
+    for pattern, value in replacements.items():
+        template_string = re.sub(pattern, value, template_string)
+    bulk_methods = ast.parse(template_string).body
+    if plan.track_instances:
+        # 各オブジェクトの確保直後に追跡対象へ加える
+        for method in bulk_methods:
+            for loop in (stmt for stmt in method.body if isinstance(stmt, ast.For)):
+                loop.body[1:1] = build_instance_tracking(class_name, 'obj')
+
+    storage_names = storage_names or {}
+    column_storage = {
+        attr: storage_names.get(attr, f"_{attr}")
+        for attrs in (incompatibility or {}).values()
+        for attr in attrs
+    }
+    bulk_versions = ast.Call(
+        func=ast.Name(id='frozenset', ctx=ast.Load()),
+        args=[ast.Set(elts=[ast.Constant(value=int(v)) for v in sorted(plan.factory_versions, key=int)])],
+        keywords=[]
     )
-    if not slow_path_body:
-        slow_path_body.append(ast.Pass())
+    return [
+        ast.Assign(targets=[ast.Name(id=get_bulk_versions_name(class_name), ctx=ast.Store())], value=bulk_versions),
+        ast.Assign(
+            targets=[ast.Name(id=get_column_storage_name(class_name), ctx=ast.Store())],
+            value=ast.Dict(
+                keys=[ast.Constant(value=attr) for attr in sorted(column_storage)],
+                values=[ast.Constant(value=column_storage[attr]) for attr in sorted(column_storage)]
+            )
+        ),
+        *bulk_methods,
+    ]
 
-    # 3. exceptブロックを生成したスローパスで置換
-    try_except_node = template_ast.body[1]  # Node: try-except
-    except_handler = try_except_node.handlers[0] # Node: except
-    except_handler.body = slow_path_body # except block body replacement
+def _build_factory_method(plan: ConstructorFactoryPlan, method_info) -> ast.FunctionDef:
+    class_name = plan.class_name
+    init_args = method_info.ast_node.args
+    param_names = {p.name for p in method_info.parameters}
+    use_var_args = (
+        bool(init_args.defaults)
+        or any(d is not None for d in init_args.kw_defaults)
+        or bool(init_args.posonlyargs)
+        or bool(param_names & {'cls', 'self'})
+    )
 
-    return template_ast
+    # 1. シグネチャ: デフォルト値は初期化子側で評価させるため、ある場合は可変長で受け渡す
+    if use_var_args:
+        factory_args = ast.arguments(
+            posonlyargs=[], args=[ast.arg(arg='cls')],
+            vararg=ast.arg(arg='args'), kwarg=ast.arg(arg='kwargs'),
+            kwonlyargs=[], kw_defaults=[], defaults=[]
+        )
+        call_args = [ast.Starred(value=ast.Name(id='args', ctx=ast.Load()), ctx=ast.Load())]
+        call_keywords = [ast.keyword(arg=None, value=ast.Name(id='kwargs', ctx=ast.Load()))]
+    else:
+        factory_args = copy.deepcopy(init_args)
+        for arg in ast.walk(factory_args):
+            if isinstance(arg, ast.arg):
+                arg.annotation = None
+        factory_args.args[0] = ast.arg(arg='cls')
+        call_args = []
+        call_keywords = []
+        for param in method_info.parameters:
+            if param.kind in ('POSITIONAL_ONLY', 'POSITIONAL_OR_KEYWORD'):
+                call_args.append(ast.Name(id=param.name, ctx=ast.Load()))
+            elif param.kind == 'KEYWORD_ONLY':
+                call_keywords.append(ast.keyword(arg=param.name, value=ast.Name(id=param.name, ctx=ast.Load())))
+            elif param.kind == 'VAR_POSITIONAL':
+                call_args.append(ast.Starred(value=ast.Name(id=param.name, ctx=ast.Load()), ctx=ast.Load()))
+            elif param.kind == 'VAR_KEYWORD':
+                call_keywords.append(ast.keyword(arg=None, value=ast.Name(id=param.name, ctx=ast.Load())))
+    call_keywords.insert(0, ast.keyword(arg=WRAPPER_SELF_ARG_NAME, value=ast.Name(id='self', ctx=ast.Load())))
+
+    current_state_ast = ast.Attribute(
+        value=ast.Name(id='self', ctx=ast.Load()),
+        attr=get_current_state_field_name(class_name),
+        ctx=ast.Load()
+    )
+    body: list[ast.stmt] = [
+        # self = object.__new__(cls)
+        ast.Assign(
+            targets=[ast.Name(id='self', ctx=ast.Store())],
+            value=ast.Call(
+                func=ast.Attribute(value=ast.Name(id='object', ctx=ast.Load()), attr='__new__', ctx=ast.Load()),
+                args=[ast.Name(id='cls', ctx=ast.Load())], keywords=[]
+            )
+        ),
+    ]
+    if method_info.version != plan.initial_version:
+        # 汎用 __init__ が生成直後に行う切替と同じく、切替回数に数える
+        body.append(ast.AugAssign(
+            target=ast.Attribute(value=ast.Name(id='cls', ctx=ast.Load()), attr=SWITCH_COUNT_ATTR_NAME, ctx=ast.Store()),
+            op=ast.Add(),
+            value=ast.Constant(value=1)
+        ))
+    body += [
+        # self._xxx_current_state = cls._XXX_VERSION_INSTANCES_SINGLETON[<version>]
+        ast.Assign(
+            targets=[ast.Attribute(
+                value=ast.Name(id='self', ctx=ast.Load()),
+                attr=get_current_state_field_name(class_name),
+                ctx=ast.Store()
+            )],
+            value=ast.Subscript(
+                value=ast.Attribute(
+                    value=ast.Name(id='cls', ctx=ast.Load()),
+                    attr=get_version_instances_singleton_name(class_name),
+                    ctx=ast.Load()
+                ),
+                slice=ast.Constant(value=int(method_info.version)),
+                ctx=ast.Load()
+            )
+        ),
+        *(build_instance_tracking(class_name, 'self') if plan.track_instances else []),
+        # self._xxx_current_state.__initialize__(..., _wrapper_self=self)
+        ast.Expr(value=ast.Call(
+            func=ast.Attribute(value=current_state_ast, attr=INITIALIZE_METHOD_NAME, ctx=ast.Load()),
+            args=call_args,
+            keywords=call_keywords
+        )),
+        ast.Return(value=ast.Name(id='self', ctx=ast.Load())),
+    ]
+
+    return ast.FunctionDef(
+        name=get_factory_method_name(method_info.version),
+        args=factory_args,
+        body=body,
+        decorator_list=[ast.Name(id='classmethod', ctx=ast.Load())]
+    )
 
 def _load_constructor_template_ast() -> ast.FunctionDef | None:
     template_ast = load_template_ast(_CONSTRUCTOR_TEMPLATE)
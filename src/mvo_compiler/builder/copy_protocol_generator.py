@@ -0,0 +1,91 @@
+import ast
+import copy
+import re
+
+from .migration_generator import build_instance_tracking
+from ..util.ast_util import *
+from ..util.template_util import get_template_string
+
+_COPY_PROTOCOL_TEMPLATE = "copy_protocol_template.py"
+
+def add_copy_protocol(
+    class_ast: ast.ClassDef,
+    versions: list[str],
+    dirty_tracking: bool = False,
+    pinning: bool = False,
+    track_instances: bool = False,
+    adaptive: bool = False,
+) -> None:
+    """
+    統合クラスと各バージョンの実装クラスに pickle/copy 用のメソッドを追加する。
+
+    実装シングルトンは pickle ではバージョン番号のみを保存して復元時に同じシングルトンを引き直し、
+    copy/deepcopy では複製しない。統合クラスの状態は通常どおり __dict__ として保存されるため、
+    pickle は既定の（C 実装の）経路のまま、現在の状態はバージョン番号への参照になる。
+        class Foo:
+            class _V1_Impl:
+                def __reduce__(self): ...
+                def __copy__(self): ...
+                def __deepcopy__(self, memo): ...
+            @staticmethod
+            def _foo_version_state(version_num): ...
+            def __copy__(self): ...
+            def __deepcopy__(self, memo): ...
+
+    切り戻し用の状態・ピン留めの深さ・adaptive 戦略のミスの記録など複製先で意味を持たない内部フィールドがある場合は、
+    それらを除く __getstate__ を追加する。track_instances が有効な場合、複製・復元したオブジェクトを
+    migrate_all() の対象として追跡する。
+    """
+    template_string = get_template_string(_COPY_PROTOCOL_TEMPLATE)
+    if not template_string:
+        return
+
+    class_name = class_ast.name
+    transient_fields_name = f"_{class_name.upper()}_TRANSIENT_FIELDS"
+    replacements = {
+        r'_TRANSIENT_FIELDS_PLACEHOLDER': transient_fields_name,
+        r'_VERSION_STATE_PLACEHOLDER': f"_{class_name.lower()}_version_state",
+        r'_VERSION_INSTANCES_SINGLETON_PLACEHOLDER': get_version_instances_singleton_name(class_name),
+        r'_CLASS_PLACEHOLDER': class_name,
+    }
+    for pattern, value in replacements.items():
+        template_string = re.sub(pattern, value, template_string)
+    (
+        version_state_method, getstate_method, setstate_method, copy_method, deepcopy_method,
+        *impl_methods,
+    ) = ast.parse(template_string).body
+
+    # 1. 実装クラス
+    impl_class_names = {get_impl_class_name(v) for v in versions}
+    for node in class_ast.body:
+        if isinstance(node, ast.ClassDef) and node.name in impl_class_names:
+            node.body.extend(copy.deepcopy(impl_methods))
+
+    # 2. 統合クラス: 複製先では意味を持たない内部フィールド（既定値に戻す）
+    transient_fields = []
+    if dirty_tracking:
+        transient_fields += [get_sync_cache_field_name(class_name), get_dirty_flag_field_name(class_name)]
+    if pinning:
+        transient_fields.append(get_pin_depth_field_name(class_name))
+    if track_instances:
+        transient_fields.append(get_epoch_field_name(class_name))
+    if adaptive:
+        # ミスの記録は可変のリストのため、複製元と共有しないよう既定値に戻す
+        transient_fields.append(get_adaptive_state_field_name(class_name))
+
+    members: list[ast.stmt] = [version_state_method]
+    if transient_fields:
+        members.append(ast.Assign(
+            targets=[ast.Name(id=transient_fields_name, ctx=ast.Store())],
+            value=ast.Tuple(elts=[ast.Constant(value=name) for name in transient_fields], ctx=ast.Load())
+        ))
+        members.append(getstate_method)
+    if track_instances:
+        # pickle からの復元・複製で生成したオブジェクトも追跡する
+        setstate_method.body.extend(build_instance_tracking(class_name, 'self'))
+        copy_method.body[-1:-1] = build_instance_tracking(class_name, 'obj')
+        deepcopy_method.body[-1:-1] = build_instance_tracking(class_name, 'obj')
+        members.append(setstate_method)
+    members += [copy_method, deepcopy_method]
+    class_ast.body.extend(members)
+
@@ -0,0 +1,104 @@
+import ast
+import copy
+import re
+
+from ..util.ast_util import *
+from ..util.template_util import get_template_string
+
+_MIGRATION_TEMPLATE = "migration_template.py"
+
+def build_migration_components(class_name: str) -> list[ast.stmt]:
+    """
+    生存インスタンスをまとめて移行する migrate_all() と、それが使うクラス属性を生成する。
+
+        _FOO_INSTANCES = weakref.WeakSet()
+        _FOO_EPOCH = 0
+        _FOO_MIGRATION_TARGET = None
+        _foo_epoch = 0
+        def _foo_migrate(self): ...
+        @classmethod
+        def migrate_all(cls, version_num, *, lazy=False, workers=None): ...
+    """
+    template_ast = _load_migration_template(class_name)
+    if template_ast is None:
+        return []
+    names = _get_names(class_name)
+    migrate_method, migrate_all_method = template_ast.body[0], template_ast.body[1]
+    return [
+        _class_attr(names['instances'], ast.Call(
+            func=ast.Attribute(value=ast.Name(id='weakref', ctx=ast.Load()), attr='WeakSet', ctx=ast.Load()),
+            args=[], keywords=[]
+        )),
+        _class_attr(names['epoch'], ast.Constant(value=0)),
+        _class_attr(names['migration_target'], ast.Constant(value=None)),
+        _class_attr(names['epoch_field'], ast.Constant(value=0)),
+        migrate_method,
+        migrate_all_method,
+    ]
+
+def build_instance_tracking(class_name: str, obj_name: str) -> list[ast.stmt]:
+    """
+    生成直後のオブジェクトを追跡対象に加え、現在のエポックを記録する文を生成する。
+        obj._FOO_INSTANCES.add(obj)
+        obj._foo_epoch = obj._FOO_EPOCH
+    """
+    template_ast = _load_migration_template(class_name, obj_name)
+    if template_ast is None:
+        return []
+    return template_ast.body[3].body
+
+def insert_migration_checks(class_name: str, methods: list[ast.FunctionDef]) -> None:
+    """
+    スタブ・getter/setter の先頭に、遅延移行が保留されていれば移行する文を挿入する。
+        if self._foo_epoch != self._FOO_EPOCH:
+            self._foo_migrate()
+    """
+    template_ast = _load_migration_template(class_name)
+    if template_ast is None:
+        return
+    for method in methods:
+        method.body[:0] = copy.deepcopy(template_ast.body[2].body)
+
+def build_migration_imports(class_ast: ast.ClassDef) -> list[ast.stmt]:
+    """migrate_all() を生成した統合クラスが必要とする import 文を返す。"""
+    instances_name = _get_names(class_ast.name)['instances']
+    for node in class_ast.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == instances_name for target in node.targets
+        ):
+            return [ast.Import(names=[ast.alias(name='weakref')])]
+    return []
+
+
+# --- ヘルパー ---
+def _get_names(class_name: str) -> dict[str, str]:
+    return {
+        'instances': f"_{class_name.upper()}_INSTANCES",
+        'epoch': f"_{class_name.upper()}_EPOCH",
+        'migration_target': f"_{class_name.upper()}_MIGRATION_TARGET",
+        'epoch_field': get_epoch_field_name(class_name),
+        'migrate': f"_{class_name.lower()}_migrate",
+    }
+
+def _load_migration_template(class_name: str, obj_name: str = 'self') -> ast.Module | None:
+    template_string = get_template_string(_MIGRATION_TEMPLATE)
+    if not template_string:
+        return None
+    names = _get_names(class_name)
+    replacements = {
+        r'_MIGRATE_PLACEHOLDER': names['migrate'],
+        r'_INSTANCES_PLACEHOLDER': names['instances'],
+        r'_EPOCH_FIELD_PLACEHOLDER': names['epoch_field'],
+        r'_EPOCH_PLACEHOLDER': names['epoch'],
+        r'_MIGRATION_TARGET_PLACEHOLDER': names['migration_target'],
+        r'_OBJ_PLACEHOLDER': obj_name,
+        r'_CURRENT_STATE_PLACEHOLDER': get_current_state_field_name(class_name),
+        r'_VERSION_INSTANCES_SINGLETON_PLACEHOLDER': get_version_instances_singleton_name(class_name),
+        r'_SWITCH_TO_VERSION_PLACEHOLDER': get_switch_to_version_method_name(class_name),
+    }
+    for pattern, value in replacements.items():
+        template_string = re.sub(pattern, value, template_string)
+    return ast.parse(template_string)
+
+def _class_attr(name: str, value: ast.expr) -> ast.Assign:
+    return ast.Assign(targets=[ast.Name(id=name, ctx=ast.Store())], value=value)
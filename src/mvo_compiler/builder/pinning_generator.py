@@ -0,0 +1,53 @@
+import ast
+import re
+
+from ..util.ast_util import *
+from ..util.template_util import get_template_string
+
+_PINNED_VIEW_TEMPLATE = "pinned_view_template.py"
+
+def build_pinning_components(class_name: str) -> list[ast.stmt]:
+    """
+    バージョンを固定するコンテキストマネージャ pinned() と、それが返すビュークラスを生成する。
+
+        _foo_pin_depth = 0
+        class _FOO_PINNED_VIEW: ...
+        def pinned(self, version_num): ...
+    """
+    template_ast = _load_pinning_template(class_name)
+    if template_ast is None:
+        return []
+    view_class, pinned_method = template_ast.body[0], template_ast.body[1]
+    pin_depth_default = ast.Assign(
+        targets=[ast.Name(id=get_pin_depth_field_name(class_name), ctx=ast.Store())],
+        value=ast.Constant(value=0)
+    )
+    return [pin_depth_default, view_class, pinned_method]
+
+def build_pin_guard(class_name: str) -> list[ast.stmt]:
+    """
+    ピン留め中の切替を RuntimeError にする、切替メソッド先頭の文を生成する。
+        if self._foo_pin_depth:
+            raise RuntimeError(...)
+    """
+    template_ast = _load_pinning_template(class_name)
+    if template_ast is None:
+        return []
+    return template_ast.body[2].body
+
+
+# --- ヘルパー ---
+def _load_pinning_template(class_name: str) -> ast.Module | None:
+    template_string = get_template_string(_PINNED_VIEW_TEMPLATE)
+    if not template_string:
+        return None
+    replacements = {
+        r'_PINNED_VIEW_PLACEHOLDER': get_pinned_view_class_name(class_name),
+        r'_PIN_DEPTH_PLACEHOLDER': get_pin_depth_field_name(class_name),
+        r'_CURRENT_STATE_PLACEHOLDER': get_current_state_field_name(class_name),
+        r'_VERSION_INSTANCES_SINGLETON_PLACEHOLDER': get_version_instances_singleton_name(class_name),
+        r'_SWITCH_TO_VERSION_PLACEHOLDER': get_switch_to_version_method_name(class_name),
+    }
+    for pattern, value in replacements.items():
+        template_string = re.sub(pattern, value, template_string)
+    return ast.parse(template_string)
@@ -0,0 +1,29 @@
+import ast
+import copy
+
+from ..analysis.collapse_analyzer import CollapsePlan
+from ..util.constants import INITIALIZE_METHOD_NAME, SWITCH_COUNT_ATTR_NAME
+
+def build_plain_class(plan: CollapsePlan) -> ast.ClassDef:
+    """縮退計画から wrapper を持たない通常クラスを生成する。"""
+    plain_class = ast.ClassDef(
+        name=plan.class_name,
+        bases=[ast.Name(id=base_name, ctx=ast.Load()) for base_name in plan.bases],
+        keywords=[], body=[], decorator_list=[]
+    )
+
+    # 統合クラスと同じく _switch_count を参照できるようにしておく（常に 0）
+    plain_class.body.append(ast.Assign(
+        targets=[ast.Name(id=SWITCH_COUNT_ATTR_NAME, ctx=ast.Store())],
+        value=ast.Constant(value=0)
+    ))
+
+    for method_info in plan.methods:
+        if not method_info.ast_node:
+            continue
+        method_copy = copy.deepcopy(method_info.ast_node)
+        if method_copy.name == INITIALIZE_METHOD_NAME:
+            method_copy.name = '__init__'
+        plain_class.body.append(method_copy)
+
+    return plain_class
@@ -1,6 +1,9 @@
 import ast
 import copy
 from typing import List
+from ..analysis.devirtualization_analyzer import DevirtualizationPlan, has_self_or_class_rebinding
+from ..analysis.dirty_tracking_analyzer import get_reversible_sync_pairs, writes_through_self
+from .pinning_generator import build_pin_guard
 from ..symbol_table.symbol_table import SymbolTable
 from ..util.ast_util import *
 from ..util.template_util import TemplateRenamer
@@ -9,11 +12,15 @@ from ..util import logger
 from ..util.constants import SWITCH_COUNT_ATTR_NAME, WRAPPER_SELF_ARG_NAME
 
 _SWITCH_TO_VERSION_TEMPLATE = "switch_to_version_template.py"
+_SWITCH_TO_VERSION_DIRTY_TRACKING_TEMPLATE = "switch_to_version_dirty_tracking_template.py"
 
 def build_skeleton(
     class_name: str,
     symbol_table: SymbolTable,
     sync_asts: List[ast.FunctionDef],
+    devirtualization: DevirtualizationPlan | None = None,
+    dirty_tracking: bool = False,
+    pinning: bool = False,
 ) -> ast.ClassDef | None:
     class_info = symbol_table.lookup_class(class_name)
     if not class_info:
@@ -21,16 +28,31 @@ def build_skeleton(
         return None
 
     target_class = _build_wrapper_class(class_info)
-    impl_classes = _build_impl_classes(class_info, class_name)
+    impl_classes = _build_impl_classes(class_info, class_name, devirtualization, dirty_tracking)
     singleton_stmt = _build_singleton_instance_list_stmt(class_info)
-    switch_method = _create_switch_to_version_method(class_name, sync_asts)
+    switch_method = _create_switch_to_version_method(class_name, sync_asts, dirty_tracking, pinning)
 
     # 暫定: _switch_count 属性を注入
     switch_count_attr = ast.Assign(
         targets=[ast.Name(id=SWITCH_COUNT_ATTR_NAME, ctx=ast.Store())],
         value=ast.Constant(value=0)
     )
-    body_items = [switch_count_attr, *impl_classes, singleton_stmt]
+    # 呼び出し形ごとのオーバーロード解決キャッシュ
+    dispatch_cache_stmt = ast.Assign(
+        targets=[ast.Name(id=get_dispatch_cache_name(class_name), ctx=ast.Store())],
+        value=ast.Dict(keys=[], values=[])
+    )
+    body_items = [switch_count_attr, *impl_classes, singleton_stmt, dispatch_cache_stmt]
+    if dirty_tracking:
+        # 切り戻し用の状態と書き込みフラグの初期値（切替前はインスタンスに存在しない）
+        body_items.append(ast.Assign(
+            targets=[ast.Name(id=get_sync_cache_field_name(class_name), ctx=ast.Store())],
+            value=ast.Constant(value=None)
+        ))
+        body_items.append(ast.Assign(
+            targets=[ast.Name(id=get_dirty_flag_field_name(class_name), ctx=ast.Store())],
+            value=ast.Constant(value=False)
+        ))
     if switch_method:
         body_items.append(switch_method)
     target_class.body = body_items
@@ -48,9 +70,10 @@ def _build_wrapper_class(class_info) -> ast.ClassDef:
                 all_unique_base_impls[parent_base_name] = ast.Name(id=parent_base_name, ctx=ast.Load())
             else:
                 parent_impl_name = get_impl_class_name(parent_version)
-                full_name = f"{parent_base_name}.{parent_impl_name}"
+                parent_reference = class_info.get_base_reference(parent_base_name)
+                full_name = f"{parent_reference}.{parent_impl_name}"
                 all_unique_base_impls[full_name] = ast.Attribute(
-                    value=ast.Name(id=parent_base_name, ctx=ast.Load()),
+                    value=create_dotted_name(parent_reference),
                     attr=parent_impl_name,
                     ctx=ast.Load()
                 )
@@ -63,10 +86,18 @@ def _build_wrapper_class(class_info) -> ast.ClassDef:
     )
     return target_class
 
-def _build_impl_classes(class_info, class_name: str) -> list[ast.ClassDef]:
+def _build_impl_classes(
+    class_info,
+    class_name: str,
+    devirtualization: DevirtualizationPlan | None = None,
+    dirty_tracking: bool = False,
+) -> list[ast.ClassDef]:
     impl_classes: list[ast.ClassDef] = []
+    devirtualized_call_count = 0
+    dirty_mark_count = 0
+    dirty_flag_name = get_dirty_flag_field_name(class_name) if dirty_tracking else None
 
-    for version_str in class_info.get_all_versions():
+    for version_str in sorted(class_info.get_all_versions(), key=int):
         # 各バージョンごとの親実装クラス一覧を作成
         impl_bases = []
         parent_list = class_info.versioned_bases.get(version_str, [])
@@ -76,7 +107,7 @@ def _build_impl_classes(class_info, class_name: str) -> list[ast.ClassDef]:
             else:
                 parent_impl_name = get_impl_class_name(parent_version)
                 impl_bases.append(ast.Attribute(
-                    value=ast.Name(id=parent_base_name, ctx=ast.Load()),
+                    value=create_dotted_name(class_info.get_base_reference(parent_base_name)),
                     attr=parent_impl_name,
                     ctx=ast.Load()
                 ))
@@ -101,8 +132,10 @@ def _build_impl_classes(class_info, class_name: str) -> list[ast.ClassDef]:
             if parent_version == UNVERSIONED_CLASS_TAG:
                 parent_context = ('normal', parent_base_name)
             else:
-                parent_context = ('mvo', (parent_base_name, parent_version))
-        method_transformer = TopLevelMethodTransformer(class_name, parent_context)
+                parent_context = ('mvo', (class_info.get_base_reference(parent_base_name), parent_version))
+        method_transformer = TopLevelMethodTransformer(
+            class_name, parent_context, devirtualization, version_str, dirty_flag_name
+        )
 
         # 1. versionedクラスのメソッドをimplへ統合
         for method_info in class_info.get_methods_for_version(version_str):
@@ -129,38 +162,61 @@ def _build_impl_classes(class_info, class_name: str) -> list[ast.ClassDef]:
         target_impl_class.body.append(default_ctor)
 
         impl_classes.append(target_impl_class)
+        devirtualized_call_count += method_transformer.devirtualized_call_count
+        dirty_mark_count += method_transformer.dirty_mark_count
 
+    if devirtualized_call_count:
+        logger.report_log(f"Devirtualized {devirtualized_call_count} self method call(s) in '{class_name}'.")
+    if dirty_tracking:
+        logger.report_log(f"Enabled dirty tracking for '{class_name}' ({dirty_mark_count} write site(s) in version methods).")
     return impl_classes
 
 def _build_singleton_instance_list_stmt(class_info) -> ast.Assign:
+    # バージョン番号 -> 実装シングルトン の辞書（バージョン番号は連番とは限らない）
+    version_keys = []
     impl_class_calls = []
-    for version_str in sorted(class_info.get_all_versions()):
+    for version_str in sorted(class_info.get_all_versions(), key=int):
         impl_name = get_impl_class_name(version_str)
+        version_keys.append(ast.Constant(value=int(version_str)))
         impl_class_calls.append(
             ast.Call(func=ast.Name(id=impl_name, ctx=ast.Load()), args=[], keywords=[])
         )
 
     singleton_list_stmt = ast.Assign(
         targets=[ast.Name(id=get_version_instances_singleton_name(class_info.class_name), ctx=ast.Store())],
-        value=ast.List(elts=impl_class_calls, ctx=ast.Load())
+        value=ast.Dict(keys=version_keys, values=impl_class_calls)
     )
     return singleton_list_stmt
 
 def _create_switch_to_version_method(
     class_name: str,
     sync_asts: List[ast.FunctionDef],
+    dirty_tracking: bool = False,
+    pinning: bool = False,
 ) -> ast.FunctionDef | None:
-    template_ast = load_template_ast(_SWITCH_TO_VERSION_TEMPLATE)
+    template_name = _SWITCH_TO_VERSION_DIRTY_TRACKING_TEMPLATE if dirty_tracking else _SWITCH_TO_VERSION_TEMPLATE
+    template_ast = load_template_ast(template_name)
     if not template_ast or not template_ast.body:
         return None
 
     switch_method_node = template_ast.body[0]
-    sync_dispatch_chain = _create_sync_dispatch_chain(sync_asts)
+    snapshot_pairs = get_reversible_sync_pairs(sync_asts) if dirty_tracking else set()
+    sync_dispatch_chain = _create_sync_dispatch_chain(sync_asts, snapshot_pairs, class_name)
     TemplateRenamer(class_name, sync_dispatch_chain).visit(switch_method_node)
+    if pinning:
+        # ピン留め中は切り替えない（ビュー経由の直接呼び出しが前提とするバージョンを保つ）
+        switch_method_node.body[:0] = build_pin_guard(class_name)
     return switch_method_node
 
-def _create_sync_dispatch_chain(sync_asts: List[ast.FunctionDef]) -> ast.If | None:
-    """sync関数呼び出し用の if-else 連鎖を生成する。"""
+def _create_sync_dispatch_chain(
+    sync_asts: List[ast.FunctionDef],
+    snapshot_pairs: set[tuple[int, int]] | None = None,
+    class_name: str | None = None,
+) -> ast.If | None:
+    """
+    sync関数呼び出し用の if-else 連鎖を生成する。
+    snapshot_pairs に含まれる切替では、同期前の状態を切り戻し用に残してから同期する。
+    """
     # from_ver をキーに (to_ver, func_name) のリストを作る
     sync_map: dict[str, list[tuple[int, int]]] = {}
     for func_node in sync_asts:
@@ -176,12 +232,16 @@ def _create_sync_dispatch_chain(sync_asts: List[ast.FunctionDef]) -> ast.If | No
         inner_top_if = None
         inner_current_if = None
         for to_ver, func_name in to_calls:
+            sync_call_stmt = ast.Expr(value=ast.Call(
+                func=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=func_name, ctx=ast.Load()),
+                args=[ast.Name(id='self', ctx=ast.Load())], keywords=[]
+            ))
+            inner_body = [sync_call_stmt]
+            if snapshot_pairs and (from_ver, to_ver) in snapshot_pairs:
+                inner_body = [*_create_snapshot_stmts(class_name), sync_call_stmt]
             inner_if_stmt = ast.If(
                 test=ast.Compare(left=ast.Name(id='version_num', ctx=ast.Load()), ops=[ast.Eq()], comparators=[ast.Constant(value=int(to_ver))]),
-                body=[ast.Expr(value=ast.Call(
-                    func=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=func_name, ctx=ast.Load()),
-                    args=[ast.Name(id='self', ctx=ast.Load())], keywords=[]
-                ))],
+                body=inner_body,
                 orelse=[]
             )
             if inner_top_if is None:
@@ -206,22 +266,66 @@ def _create_sync_dispatch_chain(sync_asts: List[ast.FunctionDef]) -> ast.If | No
             
     return outer_top_if
 
+def _create_snapshot_stmts(class_name: str) -> list[ast.stmt]:
+    """
+    同期前の状態を残し、複製した状態に対して同期させる文の列を生成する。
+        snapshot = self.__dict__
+        self.__dict__ = dict(snapshot)
+        self._xxx_sync_cache = (current_version_num, snapshot)
+    """
+    return [
+        ast.Assign(
+            targets=[ast.Name(id='snapshot', ctx=ast.Store())],
+            value=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr='__dict__', ctx=ast.Load())
+        ),
+        ast.Assign(
+            targets=[ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr='__dict__', ctx=ast.Store())],
+            value=ast.Call(func=ast.Name(id='dict', ctx=ast.Load()), args=[ast.Name(id='snapshot', ctx=ast.Load())], keywords=[])
+        ),
+        ast.Assign(
+            targets=[ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=get_sync_cache_field_name(class_name), ctx=ast.Store())],
+            value=ast.Tuple(elts=[
+                ast.Name(id='current_version_num', ctx=ast.Load()),
+                ast.Name(id='snapshot', ctx=ast.Load()),
+            ], ctx=ast.Load())
+        ),
+    ]
+
 class TopLevelMethodTransformer(ast.NodeTransformer):
     """
     versionedクラスのトップレベルメソッドASTを変換する。
     - _wrapper_self をシグネチャに追加
     - 先頭引数を wrapper に再束縛
     - super() 呼び出しを書き換え
+    - 同一バージョンの `self.method()` 呼び出しを実装クラスの直接呼び出しへ書き換え
+    - dirty_flag_name を渡すと、self を起点とする書き込みの後に書き込みフラグを立てる
     """
-    def __init__(self, class_name: str, parent_context: tuple | None):
+    def __init__(
+        self,
+        class_name: str,
+        parent_context: tuple | None,
+        devirtualization: DevirtualizationPlan | None = None,
+        version_str: str | None = None,
+        dirty_flag_name: str | None = None,
+    ):
         self.class_name = class_name
         self.parent_context = parent_context
+        self.devirtualization = devirtualization
+        self.version_str = version_str
         self.is_in_top_level_method = False
         self.top_level_self_name = None
+        self.top_level_method_name = None
+        self.can_devirtualize = False
+        self.nested_scope_depth = 0
+        self.devirtualized_call_count = 0
+        self.dirty_flag_name = dirty_flag_name
+        self.dirty_mark_count = 0
 
     def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
         if self.is_in_top_level_method:
+            self.nested_scope_depth += 1
             self.generic_visit(node)
+            self.nested_scope_depth -= 1
             return node
 
         if not node.args.args:
@@ -229,6 +333,12 @@ class TopLevelMethodTransformer(ast.NodeTransformer):
 
         self.is_in_top_level_method = True
         self.top_level_self_name = node.args.args[0].arg
+        self.top_level_method_name = node.name
+        self.can_devirtualize = (
+            self.devirtualization is not None
+            and not node.decorator_list
+            and not has_self_or_class_rebinding(node, self.class_name)
+        )
 
         # 1. `_wrapper_self` をシグネチャに追加
         wrapper_self_arg = ast.arg(arg=WRAPPER_SELF_ARG_NAME)
@@ -256,24 +366,80 @@ class TopLevelMethodTransformer(ast.NodeTransformer):
         )
 
         # 3. メソッド本体を走査して super() を書き換える
-        new_body = [conditional_rebind_stmt]
+        new_body = []
         for statement in node.body:
             new_body.append(self.visit(statement))
-        node.body = new_body
+        # 4. 書き込みの後に書き込みフラグを立てる
+        if self.dirty_flag_name and not node.decorator_list:
+            new_body = self._insert_dirty_marks(new_body)
+        node.body = [conditional_rebind_stmt, *new_body]
         
-        # 4. 状態をリセット
+        # 5. 状態をリセット
         self.is_in_top_level_method = False
         self.top_level_self_name = None
+        self.top_level_method_name = None
+        self.can_devirtualize = False
         
         return node
 
+    def _insert_dirty_marks(self, statements: list[ast.stmt]) -> list[ast.stmt]:
+        """
+        self を起点とする書き込みを含む文の後に `self.<dirty> = True` を挿入する。
+        return/raise では文の前に、複合文では各ブロックの中に挿入する（見出し部分に書き込みがあれば前後にも）。
+        """
+        out: list[ast.stmt] = []
+        for statement in statements:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                out.append(statement)
+                continue
+
+            blocks = _get_statement_blocks(statement)
+            if blocks:
+                header_writes = any(
+                    writes_through_self(part, self.top_level_self_name)
+                    for part in _get_statement_header(statement)
+                )
+                for owner, field_name in blocks:
+                    setattr(owner, field_name, self._insert_dirty_marks(getattr(owner, field_name)))
+                if header_writes:
+                    out.extend([self._create_dirty_mark(), statement, self._create_dirty_mark()])
+                else:
+                    out.append(statement)
+                continue
+
+            if not writes_through_self(statement, self.top_level_self_name):
+                out.append(statement)
+            elif isinstance(statement, (ast.Return, ast.Raise)):
+                out.extend([self._create_dirty_mark(), statement])
+            else:
+                out.extend([statement, self._create_dirty_mark()])
+        return out
+
+    def _create_dirty_mark(self) -> ast.Assign:
+        self.dirty_mark_count += 1
+        return ast.Assign(
+            targets=[ast.Attribute(
+                value=ast.Name(id=self.top_level_self_name, ctx=ast.Load()),
+                attr=self.dirty_flag_name,
+                ctx=ast.Store()
+            )],
+            value=ast.Constant(value=True)
+        )
+
+    def visit_Lambda(self, node: ast.Lambda) -> ast.Lambda:
+        self.nested_scope_depth += 1
+        self.generic_visit(node)
+        self.nested_scope_depth -= 1
+        return node
+
     def visit_ClassDef(self, node: ast.ClassDef):
         # ネストされたクラスは走査しない（内側は別の継承/ self を持つため）
         return node
     
-    def visit_Call(self, node: ast.Call) -> ast.Call:
+    def visit_Call(self, node: ast.Call) -> ast.expr:
         """
         - 書き換え: super() -> super(ClassName, _wrapper_self)
+        - 書き換え: self.method(...) -> ClassName._Vn_Impl.method(self, ..., _wrapper_self=self)
         """
         if self.is_in_top_level_method and isinstance(node.func, ast.Name) and node.func.id == 'super':
             if not self.parent_context:
@@ -289,15 +455,113 @@ class TopLevelMethodTransformer(ast.NodeTransformer):
                     ]
                 
                 elif parent_type == 'mvo':
-                    parent_base_name, parent_version = parent_info
+                    parent_reference, parent_version = parent_info
                     parent_impl_name = get_impl_class_name(parent_version)
                     
                     node.args = [
-                        ast.Attribute(value=ast.Name(id=parent_base_name, ctx=ast.Load()), attr=parent_impl_name, ctx=ast.Load()),
+                        ast.Attribute(value=create_dotted_name(parent_reference), attr=parent_impl_name, ctx=ast.Load()),
                         ast.Name(id=WRAPPER_SELF_ARG_NAME, ctx=ast.Load())
                     ]
             elif len(node.args) == 2: # super(type, obj)
                 logger.warning_log(f"super() with two arguments found in top-level method of versioned class '{self.class_name}'.")
                 logger.warning_log("Current implementation only considers the first argument.")
         
-        return self.generic_visit(node)
+        self.generic_visit(node)
+        return self._devirtualize_self_call(node)
+
+    def _devirtualize_self_call(self, node: ast.Call) -> ast.expr:
+        """
+        同一バージョンに定義された `self.method()` をスタブを経由しない直接呼び出しにする。
+        呼び出し元で切替が起こりうる場合は現在のバージョンを確認し、異なればスタブへ戻る。
+        """
+        if not self.can_devirtualize or self.nested_scope_depth:
+            return node
+        plan = self.devirtualization
+        target = plan.get_target(self.version_str, node, self.top_level_self_name)
+        if target is None:
+            return node
+
+        direct_call = ast.Call(
+            func=ast.Attribute(
+                value=ast.Attribute(
+                    value=ast.Name(id=self.class_name, ctx=ast.Load()),
+                    attr=get_impl_class_name(self.version_str),
+                    ctx=ast.Load()
+                ),
+                attr=target.name,
+                ctx=ast.Load()
+            ),
+            args=[ast.Name(id=self.top_level_self_name, ctx=ast.Load()), *copy.deepcopy(node.args)],
+            keywords=[
+                *copy.deepcopy(node.keywords),
+                ast.keyword(arg=WRAPPER_SELF_ARG_NAME, value=ast.Name(id=self.top_level_self_name, ctx=ast.Load()))
+            ]
+        )
+        self.devirtualized_call_count += 1
+        if not plan.needs_guard(self.version_str, self.top_level_method_name):
+            return direct_call
+
+        # self._xxx_current_state._version_number == <version>
+        current_version_num_ast = ast.Attribute(
+            value=ast.Attribute(
+                value=ast.Name(id=self.top_level_self_name, ctx=ast.Load()),
+                attr=get_current_state_field_name(self.class_name),
+                ctx=ast.Load()
+            ),
+            attr='_version_number',
+            ctx=ast.Load()
+        )
+        return ast.IfExp(
+            test=ast.Compare(
+                left=current_version_num_ast,
+                ops=[ast.Eq()],
+                comparators=[ast.Constant(value=int(self.version_str))]
+            ),
+            body=direct_call,
+            orelse=node
+        )
+
+
+# --- 書き込みフラグ挿入用のヘルパー ---
+_COMPOUND_STATEMENT_BLOCKS = {
+    ast.If: ("body", "orelse"),
+    ast.For: ("body", "orelse"),
+    ast.AsyncFor: ("body", "orelse"),
+    ast.While: ("body", "orelse"),
+    ast.With: ("body",),
+    ast.AsyncWith: ("body",),
+    ast.Try: ("body", "orelse", "finalbody"),
+    ast.TryStar: ("body", "orelse", "finalbody"),
+}
+_COMPOUND_STATEMENT_HEADERS = {
+    ast.If: ("test",),
+    ast.For: ("target", "iter"),
+    ast.AsyncFor: ("target", "iter"),
+    ast.While: ("test",),
+    ast.With: ("items",),
+    ast.AsyncWith: ("items",),
+    ast.Try: (),
+    ast.TryStar: (),
+}
+
+def _get_statement_blocks(statement: ast.stmt) -> list[tuple[ast.AST, str]]:
+    """複合文が持つ文のブロックを (所有ノード, フィールド名) の列で返す。単純文なら空。"""
+    if isinstance(statement, ast.Match):
+        return [(case, "body") for case in statement.cases]
+    field_names = _COMPOUND_STATEMENT_BLOCKS.get(type(statement))
+    if field_names is None:
+        return []
+    blocks = [(statement, field_name) for field_name in field_names]
+    if isinstance(statement, (ast.Try, ast.TryStar)):
+        blocks.extend((handler, "body") for handler in statement.handlers)
+    return blocks
+
+def _get_statement_header(statement: ast.stmt) -> list[ast.AST]:
+    """複合文のブロック以外の部分（条件式・ループ変数・with の対象など）を返す。"""
+    if isinstance(statement, ast.Match):
+        return [statement.subject, *(case.guard for case in statement.cases if case.guard)]
+    parts = []
+    for field_name in _COMPOUND_STATEMENT_HEADERS.get(type(statement), ()):
+        value = getattr(statement, field_name)
+        parts.extend(value if isinstance(value, list) else [value])
+    return parts
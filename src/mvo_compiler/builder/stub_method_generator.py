@@ -5,10 +5,11 @@ from ..symbol_table.symbol_table import SymbolTable
 from ..symbol_table.method_info import MethodInfo
 
 from ..util.ast_util import *
-from ..util.builder_util import _create_slow_path_dispatcher
+from ..util.builder_util import _create_shape_dispatcher
 from ..util.constants import (
     DEFAULT_VERSION_SELECTION_STRATEGY,
     INITIALIZE_METHOD_NAME,
+    VERSION_SELECTION_ADAPTIVE,
     VERSION_SELECTION_LATEST,
     WRAPPER_SELF_ARG_NAME,
 )
@@ -17,8 +18,12 @@ def build_stub_methods(
     symbol_table: SymbolTable,
     base_name: str,
     version_selection_strategy: str = DEFAULT_VERSION_SELECTION_STRATEGY,
+    miss_targets: dict[str, dict[str, str]] | None = None,
 ) -> list[ast.FunctionDef]:
-    """公開スタブメソッドを生成して返す。"""
+    """
+    公開スタブメソッドを生成して返す。
+    miss_targets を渡すと、一致シグネチャのスタブはミス時に現在のバージョンごとの切替先へ切り替える。
+    """
     class_info = symbol_table.lookup_class(base_name)
     if not class_info:
         return []
@@ -36,6 +41,7 @@ def build_stub_methods(
                 method_name,
                 overloads,
                 version_selection_strategy,
+                (miss_targets or {}).get(method_name),
             )
         else:
             # B. シグネチャが不一致の場合 -> *args/**kwargs の汎用スタブを生成
@@ -52,6 +58,34 @@ def build_stub_methods(
 
     return stubs
 
+def build_miss_target_table(
+    class_name: str,
+    miss_targets: dict[str, dict[str, str]],
+) -> list[ast.Assign]:
+    """
+    現在のバージョンによってミス時の切替先が変わるメソッドの表を生成する。
+    例: _FOO_MISS_TARGETS = {'area': {1: 1, 2: 1, 3: 4, 4: 4}}
+    """
+    varying = {
+        method_name: table for method_name, table in miss_targets.items()
+        if len(set(table.values())) > 1
+    }
+    if not varying:
+        return []
+    return [ast.Assign(
+        targets=[ast.Name(id=get_miss_target_table_name(class_name), ctx=ast.Store())],
+        value=ast.Dict(
+            keys=[ast.Constant(value=method_name) for method_name in varying],
+            values=[
+                ast.Dict(
+                    keys=[ast.Constant(value=int(current)) for current in table],
+                    values=[ast.Constant(value=int(target)) for target in table.values()]
+                )
+                for table in varying.values()
+            ]
+        )
+    )]
+
 
 # --- HELPER METHODS ---
 def _generate_consistent_signature_stub(
@@ -60,6 +94,7 @@ def _generate_consistent_signature_stub(
     method_name: str,
     overloads: list[MethodInfo],
     version_selection_strategy: str,
+    miss_target_table: dict[str, str] | None = None,
 ) -> ast.FunctionDef | None:
     """
     シグネチャが一致するスタブを生成する。
@@ -139,17 +174,50 @@ def _generate_consistent_signature_stub(
     overloads = class_info.methods.get(method_name, [])
     callable_versions = sorted([int(info.version) for info in overloads])
 
-    # 現状はソート済みの先頭バージョンを使用
-    if callable_versions:
-        next_version_to_try = callable_versions[0]
-    else:
+    if not callable_versions:
         return None
+    # 切替先が現在のバージョンによらなければ定数、そうでなければ切替先表を引く
+    #   self._FOO_MISS_TARGETS['method'][self._foo_current_state._version_number]
+    target_versions = set((miss_target_table or {}).values())
+    if len(target_versions) > 1:
+        next_version_to_try = ast.Subscript(
+            value=ast.Subscript(
+                value=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=get_miss_target_table_name(base_name), ctx=ast.Load()),
+                slice=ast.Constant(value=method_name),
+                ctx=ast.Load()
+            ),
+            slice=ast.Attribute(
+                value=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=get_current_state_field_name(base_name), ctx=ast.Load()),
+                attr='_version_number',
+                ctx=ast.Load()
+            ),
+            ctx=ast.Load()
+        )
+    elif target_versions:
+        next_version_to_try = ast.Constant(value=int(target_versions.pop()))
+    else:
+        next_version_to_try = ast.Constant(value=callable_versions[0])
+
+    if version_selection_strategy == VERSION_SELECTION_ADAPTIVE:
+        # adaptive: 切替先（または借りる実装）をミス処理メソッドに決めさせる
+        #   return self._xxx_adaptive_miss('method', <next_version_to_try>).method(...)
+        adaptive_call = copy.deepcopy(fast_path_call)
+        adaptive_call.func.value = ast.Call(
+            func=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=get_adaptive_miss_method_name(base_name), ctx=ast.Load()),
+            args=[ast.Constant(value=method_name), next_version_to_try],
+            keywords=[]
+        )
+        except_handler = ast.ExceptHandler(
+            type=ast.Name(id='AttributeError', ctx=ast.Load()), name=None, body=[ast.Return(value=adaptive_call)]
+        )
+        stub_method.body.append(ast.Try(body=fast_path_body, handlers=[except_handler], orelse=[], finalbody=[]))
+        return stub_method
 
     slow_path_body = [
         # a. self._switch_to_version(<next_version_to_try>)
         ast.Expr(value=ast.Call(
             func=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=get_switch_to_version_method_name(base_name), ctx=ast.Load()),
-            args=[ast.Constant(value=next_version_to_try)],
+            args=[next_version_to_try],
             keywords=[]
         )),
         
@@ -215,34 +283,7 @@ def _generate_inconsistent_signature_stub(
         
         stub_method.body.append(ast_if)
 
-    # 2. fast path の AST（try ブロック）を生成
-    fast_path_body = [ast.Return(value=ast.Call(
-        func=ast.Attribute(
-            value=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=get_current_state_field_name(base_name), ctx=ast.Load()),
-            attr=method_name, ctx=ast.Load()
-        ),
-        args=[ast.Starred(value=ast.Name(id='args', ctx=ast.Load()), ctx=ast.Load())],
-        keywords=[
-            ast.keyword(arg=WRAPPER_SELF_ARG_NAME, value=ast.Name(id='self', ctx=ast.Load())),
-            ast.keyword(arg=None, value=ast.Name(id='kwargs', ctx=ast.Load()))
-        ]
-    ))]
-
-    # 3. slow path の AST（except ブロック）を生成
-    slow_path_body = _create_slow_path_dispatcher(base_name, method_name, overloads)
-    
-    except_handler = ast.ExceptHandler(
-        type=ast.Tuple(elts=[ast.Name(id='AttributeError', ctx=ast.Load()), ast.Name(id='TypeError', ctx=ast.Load())], ctx=ast.Load()),
-        name=None,
-        body=slow_path_body
-    )
-
-    # 4. try-except 構造に組み立て
-    stub_method.body.append(ast.Try(
-        body=fast_path_body,
-        handlers=[except_handler],
-        orelse=[],
-        finalbody=[]
-    ))
+    # 2. 呼び出し形でバージョンを選んで呼び出す（結果はクラスごとにキャッシュ）
+    stub_method.body.extend(_create_shape_dispatcher(base_name, method_name, overloads))
 
     return stub_method
@@ -1,12 +1,44 @@
 import ast
 
 from .skeleton_generator import build_skeleton
-from .constructor_generator import build_constructor
-from .stub_method_generator import build_stub_methods
+from .constructor_generator import build_bulk_construction_methods, build_constructor, build_factory_methods
+from .stub_method_generator import build_miss_target_table, build_stub_methods
+from .adaptive_generator import build_adaptive_components
+from .pinning_generator import build_pinning_components
+from .migration_generator import build_migration_components, insert_migration_checks
+from .copy_protocol_generator import add_copy_protocol
 from .components import build_getattr_setattr_methods, build_sync_components
+from .plain_class_generator import build_plain_class
+from ..analysis.adaptive_analyzer import analyze_adaptive_switching
+from ..analysis.collapse_analyzer import analyze_collapsibility
+from ..analysis.copy_protocol_analyzer import analyze_copy_protocol
+from ..analysis.constructor_analyzer import (
+    ConstructorFactoryPlan,
+    analyze_bulk_construction,
+    analyze_constructor_factories,
+)
+from ..analysis.devirtualization_analyzer import analyze_devirtualization
+from ..analysis.dirty_tracking_analyzer import analyze_dirty_tracking
+from ..analysis.migration_analyzer import analyze_migration
+from ..analysis.pinning_analyzer import analyze_pinning
+from ..analysis.project_usage import ProjectUsage
+from ..analysis.static_switch_analyzer import StaticSwitchPlan, analyze_static_switching
+from ..analysis.storage_alias_analyzer import analyze_storage_aliases, apply_storage_aliases
+from ..analysis.switch_cost_analyzer import analyze_miss_targets
+from ..analysis.version_inference_analyzer import ClientCallPlan, analyze_client_calls
+from ..analysis.reachability_analyzer import (
+    analyze_reachability,
+    prune_class_info,
+    prune_incompatibility,
+    prune_sync_components,
+)
 from ..symbol_table.symbol_table import SymbolTable
 from ..util import logger
-from ..util.constants import DEFAULT_VERSION_SELECTION_STRATEGY
+from ..util.constants import (
+    DEFAULT_VERSION_SELECTION_STRATEGY,
+    VERSION_SELECTION_ADAPTIVE,
+    VERSION_SELECTION_STATIC,
+)
 
 def build_unified_class(
     class_name: str,
@@ -14,28 +46,172 @@ def build_unified_class(
     symbol_table: SymbolTable,
     incompatibility: dict | None = None,
     version_selection_strategy: str = DEFAULT_VERSION_SELECTION_STRATEGY,
+    project_usage: ProjectUsage | None = None,
+    constructor_factories: dict[str, ConstructorFactoryPlan] | None = None,
+    static_switch_plans: dict[str, StaticSwitchPlan] | None = None,
+    client_call_plans: dict[str, ClientCallPlan] | None = None,
 ) -> ast.ClassDef:
     """
     versionedクラス群のASTを単一の統合クラスASTへ組み立てる。
+    到達不能なバージョン・メソッドは取り除き、マルチバージョン化が不要な場合は通常クラスへ縮退させる。
+    constructor_factories を渡すと、生成したバージョンごとのファクトリをクラス名で登録する。
+    static_switch_plans を渡すと、static 戦略で決めたループ入口の切替先をクラス名で登録する。
+    client_call_plans を渡すと、クライアントの呼び出しの直接化に使う情報をクラス名で登録する。
     """
-    logger.debug_log(f"Building unified class for: {class_name}")
+    logger.debug_log(lambda: f"Building unified class for: {class_name}")
+
+    # --- 到達不能なバージョン・メソッドの除去 ---
+    if project_usage:
+        reachability = analyze_reachability(
+            symbol_table.lookup_class(class_name),
+            project_usage,
+            state_sync_components,
+            incompatibility,
+            version_selection_strategy,
+        )
+        if reachability and (reachability.pruned_versions or reachability.pruned_methods):
+            pruned_items = [f"version {v}" for v in sorted(reachability.pruned_versions, key=int)]
+            pruned_items += [f"method '{m}'" for m in sorted(reachability.pruned_methods)]
+            logger.report_log(f"Pruned unreachable items from '{class_name}': {', '.join(pruned_items)}.")
+            symbol_table = symbol_table.with_class(
+                prune_class_info(symbol_table.lookup_class(class_name), reachability)
+            )
+            state_sync_components = prune_sync_components(state_sync_components, reachability)
+            incompatibility = prune_incompatibility(incompatibility, reachability)
+
+    # --- 縮退判定 ---
+    # pinned()・build_many()・migrate_all() はバージョンを指定して使うため、使う場合は縮退させない
+    pinning = analyze_pinning(symbol_table.lookup_class(class_name), project_usage)
+    bulk_construction = analyze_bulk_construction(symbol_table.lookup_class(class_name), project_usage)
+    migration = analyze_migration(symbol_table.lookup_class(class_name), project_usage)
+    collapse_plan = None if pinning or bulk_construction or migration else analyze_collapsibility(
+        symbol_table.lookup_class(class_name),
+        state_sync_components,
+        incompatibility,
+        version_selection_strategy,
+        project_usage is not None and class_name in project_usage.versioned_parent_names,
+    )
+    if collapse_plan:
+        logger.report_log(f"Collapsed '{class_name}' into a plain class ({collapse_plan.reason}).")
+        return build_plain_class(collapse_plan)
+
+    # --- 付け替えのみの同期関数を格納先の別名へ置き換え ---
+    storage_alias_plan = analyze_storage_aliases(
+        symbol_table.lookup_class(class_name),
+        state_sync_components,
+        incompatibility,
+        project_usage,
+    )
+    if storage_alias_plan:
+        aliased_attrs = ", ".join(f"'{attr}'" for attr in sorted(storage_alias_plan.storage_names))
+        logger.report_log(f"Aliased renamed attributes of '{class_name}' to shared storage: {aliased_attrs}.")
+        state_sync_components = apply_storage_aliases(state_sync_components, storage_alias_plan)
 
     # --- 統合クラスの骨格生成 ---
     sync_asts = state_sync_components[1] if state_sync_components else []
-    new_class_ast = build_skeleton(class_name, symbol_table, sync_asts)
+    # migrate_all() は任意の時点で全インスタンスを切り替えうるため、切替が起こらない区間を
+    # 前提とする直接化と、切替前の状態を残して切り戻す書き込み追跡は行わない
+    devirtualization = None if migration else analyze_devirtualization(
+        symbol_table.lookup_class(class_name),
+        project_usage,
+        incompatibility,
+        version_selection_strategy,
+    )
+    dirty_tracking = not migration and analyze_dirty_tracking(
+        symbol_table.lookup_class(class_name),
+        state_sync_components,
+        project_usage,
+    )
+    new_class_ast = build_skeleton(class_name, symbol_table, sync_asts, devirtualization, dirty_tracking, pinning)
 
     # --- コンストラクタ生成 ---
-    constructor_ast = build_constructor(symbol_table, class_name)
+    constructor_ast = build_constructor(symbol_table, class_name, migration)
+
+    # --- 呼び出し箇所の特殊化用ファクトリ生成 ---
+    factory_plan = analyze_constructor_factories(symbol_table.lookup_class(class_name), state_sync_components)
+    if factory_plan:
+        factory_plan.track_instances = migration
+    factory_methods = build_factory_methods(factory_plan)
+    if factory_plan and constructor_factories is not None:
+        constructor_factories[class_name] = factory_plan
+
+    # --- 一括生成メソッド生成 ---
+    bulk_methods = []
+    if bulk_construction:
+        bulk_methods = build_bulk_construction_methods(
+            factory_plan,
+            incompatibility,
+            storage_alias_plan.storage_names if storage_alias_plan else None,
+        )
+        if bulk_methods:
+            bulk_versions = ", ".join(sorted(factory_plan.factory_versions, key=int))
+            logger.report_log(f"Generated build_many()/build_columns() for '{class_name}' (versions: {bulk_versions}).")
+        else:
+            logger.warning_log(
+                f"Cannot generate build_many()/build_columns() for '{class_name}': "
+                "no version can be constructed without a parent class or an initial sync."
+            )
 
     # --- スタブメソッド生成 ---
+    miss_targets = analyze_miss_targets(symbol_table.lookup_class(class_name), state_sync_components)
+    if version_selection_strategy == VERSION_SELECTION_STATIC and project_usage:
+        static_plan = analyze_static_switching(
+            symbol_table.lookup_class(class_name),
+            state_sync_components,
+            project_usage.call_sequences.get(class_name, []),
+            miss_targets,
+        )
+        if static_plan:
+            switch_counts = ", ".join(str(count) for count in static_plan.switches_per_iteration)
+            logger.report_log(
+                f"Planned switching of '{class_name}' for {len(static_plan.loop_entry_versions)} client loop(s) "
+                f"(switches per iteration: {switch_counts})."
+            )
+            miss_targets = static_plan.miss_targets
+            if static_switch_plans is not None:
+                static_switch_plans[class_name] = static_plan
     stub_methods = build_stub_methods(
         symbol_table,
         class_name,
         version_selection_strategy,
+        miss_targets,
     )
+    miss_target_table = build_miss_target_table(class_name, miss_targets)
+    if client_call_plans is not None:
+        client_call_plan = analyze_client_calls(
+            symbol_table.lookup_class(class_name),
+            devirtualization,
+            miss_targets,
+            incompatibility,
+            version_selection_strategy,
+        )
+        if client_call_plan:
+            client_call_plans[class_name] = client_call_plan
+    adaptive_components = []
+    if version_selection_strategy == VERSION_SELECTION_ADAPTIVE:
+        adaptive_components = build_adaptive_components(
+            analyze_adaptive_switching(symbol_table.lookup_class(class_name), state_sync_components)
+        )
+
+    # --- pinned() 生成 ---
+    pinning_components = build_pinning_components(class_name) if pinning else []
+    if pinning_components:
+        logger.report_log(f"Generated pinned() for '{class_name}'.")
 
     # --- __getattr__/__setattr__ 生成 ---
-    getattr_setattr_methods = build_getattr_setattr_methods(class_name, incompatibility)
+    getattr_setattr_methods = build_getattr_setattr_methods(
+        class_name,
+        incompatibility,
+        dirty_tracking,
+        storage_alias_plan.storage_names if storage_alias_plan else None,
+    )
+
+    # --- migrate_all() 生成 ---
+    migration_components = []
+    if migration:
+        migration_components = build_migration_components(class_name)
+        insert_migration_checks(class_name, [*stub_methods, *getattr_setattr_methods])
+        logger.report_log(f"Generated migrate_all() for '{class_name}' (tracking live instances).")
 
     # --- 状態同期コンポーネント生成 ---
     sync_methods = build_sync_components(class_name, state_sync_components)
@@ -43,10 +219,27 @@ def build_unified_class(
     additions: list[ast.AST] = []
     if constructor_ast:
         additions.append(constructor_ast)
+    additions.extend(factory_methods)
+    additions.extend(bulk_methods)
+    additions.extend(miss_target_table)
+    additions.extend(adaptive_components)
     additions.extend(stub_methods)
+    additions.extend(pinning_components)
+    additions.extend(migration_components)
     additions.extend(getattr_setattr_methods)
     additions.extend(sync_methods)
     new_class_ast.body.extend(additions)
 
+    # --- pickle/copy プロトコル生成 ---
+    if analyze_copy_protocol(symbol_table.lookup_class(class_name), project_usage):
+        add_copy_protocol(
+            new_class_ast,
+            sorted(symbol_table.lookup_class(class_name).get_all_versions(), key=int),
+            dirty_tracking,
+            pinning,
+            migration,
+            bool(adaptive_components),
+        )
+
     # --- 完成したクラスASTを返す ---
     return new_class_ast
@@ -0,0 +1,235 @@
+import ast
+from typing import Callable
+
+from .analysis.constructor_analyzer import ConstructorFactoryPlan
+from .analysis.static_switch_analyzer import StaticSwitchPlan
+from .analysis.version_inference_analyzer import ClientCallPlan, infer_client_call_versions
+from .symbol_table.method_info import MethodInfo
+from .util.ast_util import (
+    get_current_state_field_name,
+    get_factory_method_name,
+    get_impl_class_name,
+    get_switch_to_version_method_name,
+    resolve_import_module,
+)
+from .util.constants import WRAPPER_SELF_ARG_NAME
+
+def specialize_constructor_calls(
+    source_ast: ast.AST,
+    constructor_factories: dict[str, ConstructorFactoryPlan],
+    module_name: str,
+    is_package: bool = False,
+) -> dict[str, int]:
+    """
+    変換済みモジュール内の統合クラスのコンストラクタ呼び出しを、呼び出し形から静的に決まる
+    バージョンのファクトリ呼び出し (`Foo(...)` -> `Foo._new_v1(...)`) に書き換える。
+    module_name / is_package は相対 import の解決に使う。クラス名ごとの書き換え件数を返す。
+    """
+    plans_by_local_name = _get_specializable_names(
+        source_ast, constructor_factories, module_name, is_package, _is_unified_class_with_factories
+    )
+    if not plans_by_local_name:
+        return {}
+    specializer = _ConstructorCallSpecializer(plans_by_local_name)
+    specializer.visit(source_ast)
+    return specializer.specialized_counts
+
+def insert_loop_switch_hints(
+    source_ast: ast.AST,
+    static_switch_plans: dict[str, StaticSwitchPlan],
+) -> dict[str, int]:
+    """
+    static 戦略で決めたループ入口の切替先へ、ループの直前で切り替える文を挿入する。
+        if obj._foo_current_state._version_number != 3:
+            obj._foo_switch_to_version(3)
+    クラス名ごとの挿入件数を返す。
+    """
+    hints_by_loop: dict[int, list[tuple[str, ast.stmt]]] = {}
+    for class_name, plan in static_switch_plans.items():
+        for sequence, version in plan.loop_entry_versions:
+            hints_by_loop.setdefault(id(sequence.loop), []).append(
+                (class_name, _create_switch_hint(class_name, sequence.receiver, version))
+            )
+
+    inserted_counts: dict[str, int] = {}
+    for node in ast.walk(source_ast):
+        for field_name in ("body", "orelse", "finalbody"):
+            stmts = getattr(node, field_name, None)
+            if not isinstance(stmts, list) or not any(id(stmt) in hints_by_loop for stmt in stmts):
+                continue
+            new_stmts = []
+            for stmt in stmts:
+                for class_name, hint in hints_by_loop.get(id(stmt), []):
+                    new_stmts.append(hint)
+                    inserted_counts[class_name] = inserted_counts.get(class_name, 0) + 1
+                new_stmts.append(stmt)
+            setattr(node, field_name, new_stmts)
+    return inserted_counts
+
+def specialize_known_version_calls(
+    source_ast: ast.AST,
+    client_call_plans: dict[str, ClientCallPlan],
+    module_name: str,
+    is_package: bool = False,
+) -> dict[str, int]:
+    """
+    関数内で受け手のバージョンが静的に分かる統合クラスのメソッド呼び出しを、スタブを経由しない
+    実装クラスの直接呼び出し (`obj.m(...)` -> `Foo._V2_Impl.m(obj, ..., _wrapper_self=obj)`) に書き換える。
+    クラス名ごとの書き換え件数を返す。
+    """
+    plans_by_local_name = _get_specializable_names(
+        source_ast, client_call_plans, module_name, is_package, lambda node, plan: True
+    )
+    if not plans_by_local_name:
+        return {}
+    decisions: dict[int, tuple[str, str, MethodInfo]] = {}
+    for node in ast.walk(source_ast):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            decisions.update(infer_client_call_versions(node, plans_by_local_name))
+    if not decisions:
+        return {}
+    specializer = _KnownVersionCallSpecializer(decisions, plans_by_local_name)
+    specializer.visit(source_ast)
+    return specializer.specialized_counts
+
+
+# --- ヘルパー ---
+def _create_switch_hint(class_name: str, receiver: str, version: str) -> ast.If:
+    state = ast.Attribute(
+        value=ast.Attribute(value=ast.Name(id=receiver, ctx=ast.Load()), attr=get_current_state_field_name(class_name), ctx=ast.Load()),
+        attr='_version_number', ctx=ast.Load()
+    )
+    switch_call = ast.Call(
+        func=ast.Attribute(value=ast.Name(id=receiver, ctx=ast.Load()), attr=get_switch_to_version_method_name(class_name), ctx=ast.Load()),
+        args=[ast.Constant(value=int(version))], keywords=[]
+    )
+    return ast.If(
+        test=ast.Compare(left=state, ops=[ast.NotEq()], comparators=[ast.Constant(value=int(version))]),
+        body=[ast.Expr(value=switch_call)],
+        orelse=[]
+    )
+
+def _get_specializable_names(
+    source_ast: ast.AST,
+    plans: dict,
+    module_name: str,
+    is_package: bool,
+    is_unified_class_def: Callable[[ast.ClassDef, object], bool],
+) -> dict:
+    """
+    モジュール内で計画を持つ統合クラスを指す名前を求める。
+    plans はクラス名 -> 定義元モジュール名 (module_name) を持つ計画。
+    クラス定義・定義元モジュールからの `from ... import` 以外でも束縛される名前は対象外とする。
+    """
+    imported: dict[int, object] = {}
+    candidates: dict[str, object] = {}
+    unified_class_defs: set[int] = set()
+    for node in source_ast.body:
+        if isinstance(node, ast.ClassDef):
+            plan = plans.get(node.name)
+            if plan is not None and plan.module_name == module_name and is_unified_class_def(node, plan):
+                candidates[node.name] = plans[node.name]
+                unified_class_defs.add(id(node))
+        elif isinstance(node, ast.ImportFrom):
+            source_module = resolve_import_module(node, module_name, is_package)
+            for alias in node.names:
+                plan = plans.get(alias.name)
+                if plan is not None and plan.module_name == source_module:
+                    candidates[alias.asname or alias.name] = plan
+                    imported[id(alias)] = plan
+
+    rebound: set[str] = set()
+    for node in ast.walk(source_ast):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            rebound.add(node.id)
+        elif isinstance(node, ast.arg):
+            rebound.add(node.arg)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if id(node) not in unified_class_defs:
+                rebound.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            rebound.update(node.names)
+        elif isinstance(node, ast.Import):
+            rebound.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                local_name = alias.asname or alias.name
+                if id(alias) not in imported or candidates.get(local_name) is not imported[id(alias)]:
+                    rebound.add(local_name)
+
+    return {
+        local_name: plan for local_name, plan in candidates.items()
+        if local_name not in rebound
+    }
+
+def _is_unified_class_with_factories(node: ast.ClassDef, plan: ConstructorFactoryPlan | None) -> bool:
+    """生成済みの統合クラス定義で、計画どおりのファクトリを持つかを返す。"""
+    if plan is None:
+        return False
+    factory_names = {get_factory_method_name(version) for version in plan.factory_versions}
+    return any(
+        isinstance(member, ast.FunctionDef) and member.name in factory_names
+        for member in node.body
+    )
+
+class _ConstructorCallSpecializer(ast.NodeTransformer):
+    """呼び出し形から生成バージョンが決まるコンストラクタ呼び出しをファクトリ呼び出しへ書き換える。"""
+    def __init__(self, plans_by_local_name: dict[str, ConstructorFactoryPlan]):
+        self.plans_by_local_name = plans_by_local_name
+        self.specialized_counts: dict[str, int] = {}
+
+    def visit_Call(self, node: ast.Call) -> ast.Call:
+        self.generic_visit(node)
+        if not isinstance(node.func, ast.Name):
+            return node
+        plan = self.plans_by_local_name.get(node.func.id)
+        if plan is None:
+            return node
+        if any(isinstance(arg, ast.Starred) for arg in node.args):
+            return node
+        if any(keyword.arg is None for keyword in node.keywords):
+            return node
+
+        version = plan.resolve(len(node.args), [keyword.arg for keyword in node.keywords])
+        if version is None:
+            return node
+        node.func = ast.Attribute(value=node.func, attr=get_factory_method_name(version), ctx=ast.Load())
+        self.specialized_counts[plan.class_name] = self.specialized_counts.get(plan.class_name, 0) + 1
+        return node
+
+class _KnownVersionCallSpecializer(ast.NodeTransformer):
+    """バージョンが分かっている受け手のメソッド呼び出しを実装クラスの直接呼び出しへ書き換える。"""
+    def __init__(
+        self,
+        decisions: dict[int, tuple[str, str, MethodInfo]],
+        plans_by_local_name: dict[str, ClientCallPlan],
+    ):
+        self.decisions = decisions
+        self.plans_by_local_name = plans_by_local_name
+        self.specialized_counts: dict[str, int] = {}
+
+    def visit_Call(self, node: ast.Call) -> ast.Call:
+        decision = self.decisions.get(id(node))
+        self.generic_visit(node)
+        if decision is None:
+            return node
+        local_class_name, version, target = decision
+        receiver = node.func.value.id
+        class_name = self.plans_by_local_name[local_class_name].class_name
+        self.specialized_counts[class_name] = self.specialized_counts.get(class_name, 0) + 1
+        return ast.Call(
+            func=ast.Attribute(
+                value=ast.Attribute(
+                    value=ast.Name(id=local_class_name, ctx=ast.Load()),
+                    attr=get_impl_class_name(version),
+                    ctx=ast.Load()
+                ),
+                attr=target.name,
+                ctx=ast.Load()
+            ),
+            args=[ast.Name(id=receiver, ctx=ast.Load()), *node.args],
+            keywords=[
+                *node.keywords,
+                ast.keyword(arg=WRAPPER_SELF_ARG_NAME, value=ast.Name(id=receiver, ctx=ast.Load()))
+            ]
+        )
@@ -1,15 +1,19 @@
 from pathlib import Path
+from typing import Iterable
 import ast
 
+from .batch import CompileJob, CompileResult, compile_projects
 from .pipeline import compile_project, execute_generated, transform_project
-from .util.constants import DEFAULT_VERSION_SELECTION_STRATEGY
+from .runner import ExecutionPool, load_generated_project, load_transformed_project, run_in_process
+from .watcher import ProjectWatcher
 
 def compile(
     input_dir: Path,
     output_dir: Path,
     *,
-    version_selection_strategy: str = DEFAULT_VERSION_SELECTION_STRATEGY,
+    version_selection_strategy: str | None = None,
     delete_output_dir: bool = True,
+    cache_dir: Path | None = None,
 ) -> None:
     """compile_project() 互換のラッパー。"""
     compile_project(
@@ -17,19 +21,81 @@ def compile(
         output_dir,
         version_selection_strategy=version_selection_strategy,
         delete_output_dir=delete_output_dir,
+        cache_dir=cache_dir,
     )
 
-def execute(entry_file: str, dir: Path) -> str:
-    """execute_generated() 互換のラッパー。"""
-    return execute_generated(entry_file, dir)
+def compile_many(
+    jobs: Iterable[CompileJob],
+    *,
+    max_workers: int | None = None,
+    cache_dir: Path | None = None,
+    pool: ExecutionPool | None = None,
+) -> list[CompileResult]:
+    """compile_projects() 互換のラッパー。"""
+    return compile_projects(jobs, max_workers=max_workers, cache_dir=cache_dir, pool=pool)
+
+def execute(
+    entry_file: str,
+    dir: Path | None = None,
+    *,
+    in_process: bool = False,
+    transformed: list[tuple[Path, ast.AST | None]] | None = None,
+    pool: ExecutionPool | None = None,
+) -> str:
+    """
+    execute_generated() 互換のラッパー。
+
+    in_process=True の場合はインタプリタを起動せず、生成コードをメモリ上のモジュールとして実行する。
+    transformed に transform() の結果を渡すとディスクを経由せず、省略した場合は dir に書き出した
+    生成コードを読み込む。pool を渡すと、同じプロセスではなくそのワーカーで実行する。
+    """
+    if not in_process:
+        return execute_generated(entry_file, dir)
+    if transformed is not None:
+        project = load_transformed_project(transformed, dir)
+    else:
+        project = load_generated_project(dir)
+    if pool is not None:
+        return pool.run(project, entry_file)
+    return run_in_process(project, entry_file)
 
 def transform(
     input_dir: Path,
     *,
-    version_selection_strategy: str = DEFAULT_VERSION_SELECTION_STRATEGY,
+    version_selection_strategy: str | None = None,
+    cache_dir: Path | None = None,
 ) -> list[tuple[Path, ast.AST | None]]:
     """プロジェクトをメモリ上で変換する（versionedクラスのみ）。"""
     return transform_project(
         input_dir,
         version_selection_strategy=version_selection_strategy,
+        cache_dir=cache_dir,
+    )
+
+def watch(
+    input_dir: Path,
+    output_dir: Path,
+    *,
+    version_selection_strategy: str | None = None,
+    entry_file: str | None = None,
+    socket_path: Path | None = None,
+    cache_dir: Path | None = None,
+    in_process: bool = False,
+) -> None:
+    """入力ディレクトリを監視し、変更のたびにコンパイル（と実行）する。Ctrl-C で終了する。"""
+    watcher = ProjectWatcher(
+        input_dir,
+        output_dir,
+        version_selection_strategy=version_selection_strategy,
+        entry_file=entry_file,
+        cache_dir=cache_dir,
+        in_process=in_process,
     )
+    if socket_path is not None:
+        watcher.serve(socket_path)
+    try:
+        watcher.watch()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
@@ -1,86 +1,373 @@
 import ast
+import hashlib
 import os
+import queue
 import shutil
 import subprocess
 import sys
+import threading
 from pathlib import Path
+from typing import Iterator
 
 from .transformer import transform_module, contains_versioned_classes
-from .scanner import create_project_structure
+from .call_site_transformer import (
+    insert_loop_switch_hints,
+    specialize_constructor_calls,
+    specialize_known_version_calls,
+)
+from .analysis.project_usage import collect_project_usage
+from .analysis.static_switch_analyzer import CallSequence, collect_call_sequences
+from .transform_cache import TransformCache, resolve_cache_dir
+from .scanner import build_symbol_index, create_project_structure, get_module_name, parse_source_file
 from .util import logger
-from .util.constants import DEFAULT_VERSION_SELECTION_STRATEGY
+from .util.constants import DEFAULT_VERSION_SELECTION_STRATEGY, OUTPUT_WRITE_QUEUE_SIZE, VERSION_SELECTION_STATIC
 from .util.constants import (
     PROJECT_SYNC_MODULES_KEY,
     PROJECT_INCOMPATIBILITIES_KEY,
     PROJECT_NORMAL_FILES_KEY,
+    PROJECT_SYMBOL_INDEX_KEY,
+    PROJECT_VERSIONED_FILES_KEY,
+    PROJECT_CONFIG_KEY,
 )
 
 def compile_project(
     input_dir: Path,
     output_dir: Path,
     *,
-    version_selection_strategy: str = DEFAULT_VERSION_SELECTION_STRATEGY,
+    version_selection_strategy: str | None = None,
     delete_output_dir: bool = True,
+    output_digests: dict[Path, str] | None = None,
+    cache_dir: Path | None = None,
 ) -> None:
     """
     入力ディレクトリ内のソースをコンパイルし、出力ディレクトリに書き出す。
+    version_selection_strategy を省略した場合は `[tool.mvo] strategy`、それもなければ既定の戦略を使う。
+    output_digests には前回の書き出し内容のダイジェストを渡す。内容が変わらないファイルは書き出さず、
+    入力からなくなったファイルの出力は削除し、辞書を今回の内容で更新する。
+    cache_dir には変換キャッシュのディレクトリを渡す（省略時は MVO_CACHE_DIR、`[tool.mvo] cache_dir` の順）。
+
+    変換済みのモジュールは1つずつ書き出しスレッドへ渡す。キューが一杯のときは変換側が待つため、
+    書き出し待ちのASTは OUTPUT_WRITE_QUEUE_SIZE 個までに抑えられる。
     """
     # --- 1. 出力ディレクトリのクリーン ---
     if output_dir.exists() and delete_output_dir:
-        logger.debug_log(f"Cleaning output directory: {output_dir}")
+        logger.debug_log(lambda: f"Cleaning output directory: {output_dir}")
         shutil.rmtree(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # --- 2. ASTの変換 ---
-    transformed_files = transform_project(
-        input_dir,
-        version_selection_strategy=version_selection_strategy,
+    # --- 2. ASTの変換と出力ディレクトリへの書き出し ---
+    # 入力ディレクトリ内に出力ディレクトリがある場合も、前回の出力は走査しない
+    project_structure = create_project_structure(input_dir, lazy=True, excluded_dirs=[output_dir])
+    write_queue: queue.Queue = queue.Queue(maxsize=OUTPUT_WRITE_QUEUE_SIZE)
+    writer = _OutputWriter(write_queue, input_dir, output_dir, output_digests)
+    writer.start()
+    try:
+        for item in iter_transform_project(
+            input_dir,
+            version_selection_strategy=version_selection_strategy,
+            project_structure=project_structure,
+            cache_dir=cache_dir,
+        ):
+            if writer.error is not None:
+                break
+            write_queue.put(item)
+    finally:
+        write_queue.put(None)
+        writer.join()
+    if writer.error is not None:
+        raise writer.error
+    if output_digests is not None:
+        for rel_path in output_digests.keys() - writer.digests.keys():
+            (output_dir / rel_path).unlink(missing_ok=True)
+            logger.debug_log(lambda: f"Removed stale output: {output_dir / rel_path}")
+        output_digests.clear()
+        output_digests.update(writer.digests)
+    logger.event(
+        "project_compiled",
+        copied=writer.copied_count,
+        regenerated=writer.written_count,
+        up_to_date=writer.skipped_count,
+    )
+    logger.report_log(
+        f"Copied {writer.copied_count} unchanged file(s) and regenerated {writer.written_count} file(s)"
+        f" ({writer.skipped_count} up-to-date file(s) left as is)."
     )
-
-    # --- 3. 出力ディレクトリへ書き出し ---
-    for rel_path, transformed_ast in transformed_files:
-        if transformed_ast:
-            write_single_file(output_dir, rel_path, transformed_ast)
-        else:
-            logger.error_log("Something went wrong during transformation; no output generated.")
 
 def transform_project(
     input_dir: Path,
     *,
-    version_selection_strategy: str = DEFAULT_VERSION_SELECTION_STRATEGY,
+    version_selection_strategy: str | None = None,
     project_structure: dict | None = None,
+    unchanged_files: set[Path] | None = None,
+    cache_dir: Path | None = None,
 ) -> list[tuple[Path, ast.AST | None]]:
     """
     入力ディレクトリ内のversionedクラスのみを変換し、ASTを返す。
+
+    unchanged_files を渡すと、どの変換でも書き換えられなかったファイルの相対パスを登録する。
+    """
+    out = []
+    for rel_path, transformed_ast, is_changed in iter_transform_project(
+        input_dir,
+        version_selection_strategy=version_selection_strategy,
+        project_structure=project_structure,
+        cache_dir=cache_dir,
+    ):
+        if not is_changed and unchanged_files is not None:
+            unchanged_files.add(rel_path)
+        if transformed_ast is None and not is_changed:
+            # 書き換えのないファイルは AST を返さないため、ここで解析する
+            transformed_ast = parse_source_file(input_dir, rel_path)
+            if transformed_ast is None:
+                continue
+        out.append((rel_path, transformed_ast))
+    return out
+
+def iter_transform_project(
+    input_dir: Path,
+    *,
+    version_selection_strategy: str | None = None,
+    project_structure: dict | None = None,
+    cache_dir: Path | None = None,
+) -> Iterator[tuple[Path, ast.AST | None, bool]]:
+    """
+    入力ディレクトリ内のversionedクラスを変換し、(相対パス, AST, 書き換えたか) を1ファイルずつ返す。
+
+    プロジェクト全体の解析のため通常ファイルは2回走査する。versionedクラスを含まないファイルの AST は
+    解析後に捨て、呼び出し箇所を書き換えうるファイルのみ書き出す直前に解析し直す。書き換えの対象となる
+    クラス名をソースに含まないファイルは解析せず、(相対パス, None, False) を返す。
+    常に保持するのは、versionedクラスを含むファイルと、static 戦略でループ入口の切替先を挿入するファイルの AST のみ。
+    変換キャッシュのディレクトリが決まる場合は、入力が変わらないクラス群の生成を省く。
     """
     if project_structure is None:
-        project_structure = create_project_structure(input_dir)
+        project_structure = create_project_structure(input_dir, lazy=True)
+    config = project_structure.get(PROJECT_CONFIG_KEY)
+    if version_selection_strategy is None:
+        version_selection_strategy = (config and config.strategy) or DEFAULT_VERSION_SELECTION_STRATEGY
+    normal_files = project_structure[PROJECT_NORMAL_FILES_KEY]
     logger.success_log(
-        f"Found {len(project_structure[PROJECT_SYNC_MODULES_KEY])} sync modules and {len(project_structure[PROJECT_NORMAL_FILES_KEY])} normal files in {input_dir}."
+        lambda: f"Found {len(project_structure[PROJECT_SYNC_MODULES_KEY])} sync modules and {len(normal_files)} normal files in {input_dir}."
     )
-    logger.success_log(f"Completed parsing and classifying files in {input_dir}.")
+    logger.success_log(lambda: f"Completed parsing and classifying files in {input_dir}.")
+    symbol_index = project_structure.get(PROJECT_SYMBOL_INDEX_KEY)
+    versioned_files = project_structure.get(PROJECT_VERSIONED_FILES_KEY)
+    if symbol_index is None:
+        symbol_index = build_symbol_index(normal_files, versioned_files)
+
+    # --- 1. プロジェクト全体の解析 ---
+    # 縮退・到達可能性解析のためにプロジェクト全体の使用状況を集める。
+    # static 戦略ではクライアントのループ内の呼び出し列から切替先を決める
+    retained_trees: dict[Path, ast.AST] = {}
+    failed_files: set[Path] = set()
+    call_sequences: dict[str, list[CallSequence]] = {}
+    unique_class_names = symbol_index.get_unique_class_names()
 
-    out: list[tuple[Path, ast.AST]] = []
-    for rel_path, tree in project_structure[PROJECT_NORMAL_FILES_KEY]:
-        if not contains_versioned_classes(tree):
-            logger.debug_log(f"Skipping transform (no versioned classes): {rel_path}")
-            out.append((rel_path, tree))
+    def iter_analyzed_trees():
+        for rel_path, tree in normal_files:
+            if tree is None:
+                tree = parse_source_file(input_dir, rel_path)
+                if tree is None:
+                    failed_files.add(rel_path)
+                    continue
+            if version_selection_strategy == VERSION_SELECTION_STATIC:
+                sequences = collect_call_sequences([tree], unique_class_names)
+                for class_name, class_sequences in sequences.items():
+                    call_sequences.setdefault(class_name, []).extend(class_sequences)
+                # 呼び出し列はループの AST ノードを指すため、見つかったファイルの AST は保持する
+                if sequences:
+                    retained_trees[rel_path] = tree
+            yield tree
+
+    with logger.timed_event("project_analyzed", files=len(normal_files)):
+        project_usage = collect_project_usage(iter_analyzed_trees(), project_structure[PROJECT_SYNC_MODULES_KEY])
+    if version_selection_strategy == VERSION_SELECTION_STATIC:
+        project_usage.call_sequences = call_sequences
+
+    # --- 2. versionedクラスを含むファイルの変換 ---
+    cache_dir = resolve_cache_dir(cache_dir, config and config.cache_dir)
+    transform_cache = TransformCache(cache_dir) if cache_dir is not None else None
+    constructor_factories = {}
+    static_switch_plans = {}
+    client_call_plans = {}
+    # 複数のモジュールで定義されるクラスはどの定義を指すか決まらない
+    ambiguous_class_names = symbol_index.get_ambiguous_class_names()
+    transformed_trees: dict[Path, ast.AST | None] = {}
+    for rel_path, tree in normal_files:
+        if tree is None or (versioned_files is not None and rel_path not in versioned_files) or not contains_versioned_classes(tree):
+            logger.debug_log(lambda: f"Skipping transform (no versioned classes): {rel_path}")
             continue
 
-        try:
-            transformed_ast = transform_module(
-                tree,
-                project_structure[PROJECT_SYNC_MODULES_KEY],
-                project_structure[PROJECT_INCOMPATIBILITIES_KEY],
-                version_selection_strategy,
-            )
-        except Exception as e:
-            logger.error_log(f"Error transforming {rel_path}: {e}")
-            transformed_ast = None
+        module_name = get_module_name(rel_path)
+        module_factories = {}
+        module_static_plans = {}
+        module_client_plans = {}
+        with logger.timed_event("module_transformed", path=rel_path.as_posix()) as event_fields:
+            try:
+                transformed_ast = transform_module(
+                    tree,
+                    project_structure[PROJECT_SYNC_MODULES_KEY],
+                    project_structure[PROJECT_INCOMPATIBILITIES_KEY],
+                    version_selection_strategy,
+                    project_usage,
+                    module_factories,
+                    module_static_plans,
+                    module_client_plans,
+                    symbol_index.get_module_table(module_name),
+                    transform_cache,
+                )
+            except Exception as e:
+                logger.error_log(f"Error transforming {rel_path}: {e}")
+                transformed_ast = None
+            event_fields["succeeded"] = transformed_ast is not None
+        transformed_trees[rel_path] = transformed_ast
 
-        out.append((rel_path, transformed_ast))
+        for class_name, plan in module_factories.items():
+            plan.module_name = module_name
+            constructor_factories[class_name] = plan
+        static_switch_plans.update(module_static_plans)
+        for class_name, plan in module_client_plans.items():
+            plan.module_name = module_name
+            client_call_plans[class_name] = plan
 
-    return out
+    for class_name in ambiguous_class_names:
+        constructor_factories.pop(class_name, None)
+        client_call_plans.pop(class_name, None)
+    if transform_cache is not None and (transform_cache.hit_count or transform_cache.miss_count):
+        logger.report_log(
+            f"Reused {transform_cache.hit_count} of {transform_cache.hit_count + transform_cache.miss_count}"
+            f" class group(s) from the transform cache in {cache_dir}."
+        )
+
+    # --- 3. 各ファイルの呼び出し箇所の書き換え ---
+    # ループ入口の切替先は保持した AST にのみ挿入するため、解析し直すファイルではこれらのクラスの呼び出しのみ書き換わる
+    planned_class_names = {*constructor_factories, *client_call_plans}
+    specialized_counts: dict[str, int] = {}
+    hint_counts: dict[str, int] = {}
+    inferred_counts: dict[str, int] = {}
+    for rel_path, tree in normal_files:
+        if rel_path in failed_files:
+            continue
+        is_changed = rel_path in transformed_trees
+        if is_changed:
+            transformed_ast = transformed_trees.pop(rel_path)
+        elif rel_path in retained_trees:
+            transformed_ast = retained_trees.pop(rel_path)
+        elif tree is not None:
+            transformed_ast = tree
+        elif not _may_reference_any(input_dir / rel_path, planned_class_names):
+            # 書き換わらないファイルは解析し直さず、書き出し側でそのまま複製する
+            yield rel_path, None, False
+            continue
+        else:
+            transformed_ast = parse_source_file(input_dir, rel_path)
+            if transformed_ast is None:
+                continue
+        if transformed_ast is None:
+            yield rel_path, None, is_changed
+            continue
+        module_name = get_module_name(rel_path)
+        is_package = rel_path.name == "__init__.py"
+
+        # 全ファイルのコンストラクタ呼び出しをファクトリ呼び出しへ特殊化
+        if constructor_factories:
+            counts = specialize_constructor_calls(transformed_ast, constructor_factories, module_name, is_package)
+            is_changed |= bool(counts)
+            _add_counts(specialized_counts, counts)
+        # static 戦略のループ入口での事前切替
+        if static_switch_plans:
+            counts = insert_loop_switch_hints(transformed_ast, static_switch_plans)
+            is_changed |= bool(counts)
+            _add_counts(hint_counts, counts)
+        # 受け手のバージョンが分かる呼び出しを実装クラスの直接呼び出しへ書き換え
+        # 事前切替の文も解釈するため、挿入後に行う
+        if client_call_plans:
+            counts = specialize_known_version_calls(transformed_ast, client_call_plans, module_name, is_package)
+            is_changed |= bool(counts)
+            _add_counts(inferred_counts, counts)
+        yield rel_path, transformed_ast, is_changed
+
+    for class_name, count in sorted(specialized_counts.items()):
+        logger.report_log(f"Specialized {count} constructor call(s) of '{class_name}' to per-version factories.")
+    for class_name, count in sorted(hint_counts.items()):
+        logger.report_log(f"Inserted {count} loop-entry switch hint(s) for '{class_name}'.")
+    for class_name, count in sorted(inferred_counts.items()):
+        logger.report_log(f"Specialized {count} client call(s) of '{class_name}' with statically known versions.")
+
+def _add_counts(total_counts: dict[str, int], counts: dict[str, int]) -> None:
+    for class_name, count in counts.items():
+        total_counts[class_name] = total_counts.get(class_name, 0) + count
+
+def _may_reference_any(source_file: Path, class_names: set[str]) -> bool:
+    """ソースのテキストにクラス名のいずれかが現れるかを返す（解析せずに書き換えの有無を絞り込む）。"""
+    if not class_names:
+        return False
+    try:
+        source = source_file.read_bytes()
+    except OSError:
+        # 読めない場合は解析側でエラーを報告する
+        return True
+    return any(class_name.encode("utf-8") in source for class_name in class_names)
+
+class _OutputWriter(threading.Thread):
+    """キューから受け取った変換結果を出力ディレクトリへ書き出すスレッド。"""
+    def __init__(
+        self,
+        write_queue: queue.Queue,
+        input_dir: Path,
+        output_dir: Path,
+        previous_digests: dict[Path, str] | None = None,
+    ):
+        super().__init__(daemon=True)
+        self.write_queue = write_queue
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.previous_digests = previous_digests
+        # 今回書き出した（または書き出し済みと確認した）内容のダイジェスト
+        self.digests: dict[Path, str] = {}
+        self.copied_count = 0
+        self.written_count = 0
+        self.skipped_count = 0
+        self.error: BaseException | None = None
+
+    def run(self):
+        while (item := self.write_queue.get()) is not None:
+            # 失敗後も、変換側が待ち続けないようキューは空にする
+            if self.error is not None:
+                continue
+            rel_path, transformed_ast, is_changed = item
+            try:
+                if not is_changed:
+                    # 変換されなかったファイルは unparse せず、元のファイルをそのまま複製する
+                    stat = (self.input_dir / rel_path).stat()
+                    digest = f"copy:{stat.st_mtime_ns}:{stat.st_size}"
+                    if not self._is_up_to_date(rel_path, digest):
+                        copy_single_file(self.input_dir, self.output_dir, rel_path)
+                        self.copied_count += 1
+                elif transformed_ast:
+                    if self.previous_digests is None:
+                        write_single_file(self.output_dir, rel_path, transformed_ast)
+                        self.written_count += 1
+                        continue
+                    ast.fix_missing_locations(transformed_ast)
+                    generated_code = ast.unparse(transformed_ast)
+                    digest = f"code:{hashlib.sha1(generated_code.encode('utf-8')).hexdigest()}"
+                    if not self._is_up_to_date(rel_path, digest):
+                        _write_generated_code(self.output_dir, rel_path, generated_code)
+                        self.written_count += 1
+                else:
+                    logger.error_log("Something went wrong during transformation; no output generated.")
+            except BaseException as e:
+                self.error = e
+
+    def _is_up_to_date(self, rel_path: Path, digest: str) -> bool:
+        """前回と同じ内容を書き出し済みなら True を返す。いずれの場合もダイジェストを記録する。"""
+        self.digests[rel_path] = digest
+        if self.previous_digests is None or self.previous_digests.get(rel_path) != digest:
+            return False
+        if not (self.output_dir / rel_path).exists():
+            return False
+        self.skipped_count += 1
+        return True
 
 def execute_generated(entry_file: str, dir: Path) -> str:
     """
@@ -104,15 +391,25 @@ def execute_generated(entry_file: str, dir: Path) -> str:
         logger.error_log("Execution failed:")
         raise RuntimeError(f"Execution failed for {entry_file_path}: {e.stderr}")
 
+def copy_single_file(input_dir: Path, output_dir: Path, rel_path: Path) -> None:
+    """変換しなかったファイルを入力ディレクトリからバイト単位で複製する。"""
+    output_path = output_dir / rel_path
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # copyfile は Linux ではカーネル内でコピーする（sendfile など）
+    shutil.copyfile(input_dir / rel_path, output_path)
+
+    logger.debug_log(lambda: f"Copied: {output_path.resolve()}")
+
 def write_single_file(output_dir: Path, original_rel_path: Path, tree: ast.AST) -> None:
     """変換後ASTを指定ディレクトリに1ファイル書き出す。"""
     ast.fix_missing_locations(tree)
-    generated_code = ast.unparse(tree)
+    _write_generated_code(output_dir, original_rel_path, ast.unparse(tree))
 
+def _write_generated_code(output_dir: Path, original_rel_path: Path, generated_code: str) -> None:
     output_path = output_dir / original_rel_path
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(generated_code)
 
-    logger.debug_log(f"Generated: {output_path.resolve()}")
+    logger.debug_log(lambda: f"Generated: {output_path.resolve()}")
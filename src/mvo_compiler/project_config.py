@@ -0,0 +1,146 @@
+import fnmatch
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .util import logger
+from .util.constants import (
+    DEFAULT_IGNORED_DIR_NAMES,
+    IGNORE_FILE_NAME,
+    MVO_CONFIG_FILE_NAME,
+    PYPROJECT_FILE_NAME,
+    PYPROJECT_TOOL_SECTION,
+    TOOL_OPTION_CACHE_DIR,
+    TOOL_OPTION_IGNORE,
+    TOOL_OPTION_INCOMPATIBILITIES,
+    TOOL_OPTION_STRATEGY,
+    TOOL_OPTION_SYNC,
+    VERSION_SELECTION_STRATEGIES,
+)
+
+@dataclass
+class ProjectConfig:
+    """
+    入力ディレクトリの `.mvoignore` と、`mvo.toml` または pyproject.toml の `[tool.mvo]` から
+    読み取った設定。
+    """
+    # 走査しないパスのパターン
+    ignore_patterns: list[str] = field(default_factory=list)
+    # 互換性定義として読み込む JSON のパターン（None の場合は内容から判断する）
+    incompatibility_patterns: list[str] | None = None
+    # 同期モジュールとして読み込むファイルのパターン（None の場合は `*_sync.py` をすべて読む）
+    sync_patterns: list[str] | None = None
+    # バージョン選択戦略（None の場合は呼び出し側の指定または既定値）
+    strategy: str | None = None
+    # 変換キャッシュのディレクトリ（入力ディレクトリからの相対パスも可）
+    cache_dir: Path | None = None
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        入力ディレクトリからの相対パス（`/` 区切り）が走査対象外かを返す。
+
+        パターンは `.gitignore` の簡易版として解釈する。
+        - `/` を含むパターンは相対パス全体と、含まないパターンは名前と照合する
+        - 末尾が `/` のパターンはディレクトリにのみ一致する
+        """
+        name = rel_path.rsplit("/", 1)[-1]
+        if is_dir and name in DEFAULT_IGNORED_DIR_NAMES:
+            return True
+        for pattern in self.ignore_patterns:
+            if pattern.endswith("/"):
+                if not is_dir:
+                    continue
+                pattern = pattern.rstrip("/")
+            if "/" in pattern:
+                if fnmatch.fnmatchcase(rel_path, pattern.lstrip("/")):
+                    return True
+            elif fnmatch.fnmatchcase(name, pattern):
+                return True
+        return False
+
+    def is_declared_incompatibility_file(self, rel_path: str) -> bool | None:
+        """JSON が互換性定義として宣言されているかを返す（宣言がない場合は None）。"""
+        return _match_declared(self.incompatibility_patterns, rel_path)
+
+    def is_declared_sync_file(self, rel_path: str) -> bool | None:
+        """ファイルが同期モジュールとして宣言されているかを返す（宣言がない場合は None）。"""
+        return _match_declared(self.sync_patterns, rel_path)
+
+def load_project_config(input_dir: Path) -> ProjectConfig:
+    """
+    入力ディレクトリ直下の `.mvoignore` と、`mvo.toml`（なければ pyproject.toml の `[tool.mvo]`）を読み取る。
+
+        [tool.mvo]
+        ignore = ["data/", "*_generated.py"]
+        incompatibilities = ["incompatibilities.json"]
+        sync = ["sync/*_sync.py"]
+        strategy = "adaptive"
+        cache_dir = "~/.cache/mvo"
+    """
+    config = ProjectConfig()
+
+    ignore_file = input_dir / IGNORE_FILE_NAME
+    if ignore_file.is_file():
+        for line in ignore_file.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                config.ignore_patterns.append(line)
+
+    mvo_config_file = input_dir / MVO_CONFIG_FILE_NAME
+    if mvo_config_file.is_file():
+        tool_options = _read_toml(mvo_config_file)
+    else:
+        tool_options = _read_toml(input_dir / PYPROJECT_FILE_NAME)
+        for key in PYPROJECT_TOOL_SECTION.split("."):
+            tool_options = tool_options.get(key, {}) if isinstance(tool_options, dict) else {}
+        if not isinstance(tool_options, dict):
+            tool_options = {}
+
+    ignore = _get_string_list(tool_options, TOOL_OPTION_IGNORE)
+    if ignore is not None:
+        config.ignore_patterns.extend(ignore)
+    config.incompatibility_patterns = _get_string_list(tool_options, TOOL_OPTION_INCOMPATIBILITIES)
+    config.sync_patterns = _get_string_list(tool_options, TOOL_OPTION_SYNC)
+
+    strategy = tool_options.get(TOOL_OPTION_STRATEGY)
+    if strategy is not None:
+        if strategy in VERSION_SELECTION_STRATEGIES:
+            config.strategy = strategy
+        else:
+            logger.warning_log(
+                f"Ignoring {TOOL_OPTION_STRATEGY} = {strategy!r}: expected one of {', '.join(VERSION_SELECTION_STRATEGIES)}."
+            )
+
+    cache_dir = tool_options.get(TOOL_OPTION_CACHE_DIR)
+    if cache_dir is not None:
+        if isinstance(cache_dir, str) and cache_dir:
+            config.cache_dir = input_dir / Path(cache_dir).expanduser()
+        else:
+            logger.warning_log(f"Ignoring {TOOL_OPTION_CACHE_DIR}: expected a path string.")
+    return config
+
+
+# --- ヘルパー関数 ---
+def _read_toml(config_file: Path) -> dict:
+    if not config_file.is_file():
+        return {}
+    try:
+        with open(config_file, "rb") as f:
+            return tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        logger.error_log(f"Failed to read {config_file}: {e}")
+        return {}
+
+def _get_string_list(tool_options: dict, option_name: str) -> list[str] | None:
+    value = tool_options.get(option_name)
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        logger.warning_log(f"Ignoring {option_name}: expected a list of strings.")
+        return None
+    return list(value)
+
+def _match_declared(patterns: list[str] | None, rel_path: str) -> bool | None:
+    if patterns is None:
+        return None
+    return any(fnmatch.fnmatchcase(rel_path, pattern) for pattern in patterns)
@@ -0,0 +1,226 @@
+import ast
+import contextlib
+import importlib.abc
+import importlib.util
+import io
+import multiprocessing
+import sys
+import traceback
+import types
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from .scanner import get_module_name
+from .util import logger
+
+T = TypeVar("T")
+
+@dataclass
+class InMemoryModule:
+    """メモリ上に置く1つのモジュール。source（生成コード）か tree（変換済みAST）のどちらかを持つ。"""
+    name: str
+    filename: str
+    is_package: bool = False
+    source: str | None = None
+    tree: ast.AST | None = None
+
+    def get_code(self) -> types.CodeType:
+        if self.source is not None:
+            return compile(self.source, self.filename, "exec")
+        try:
+            return compile(ast.fix_missing_locations(self.tree), self.filename, "exec")
+        except (ValueError, TypeError):
+            # 生成したノードの位置情報が不整合な場合は、書き出す場合と同じくソースを経由する
+            self.source = ast.unparse(self.tree)
+            return compile(self.source, self.filename, "exec")
+
+@dataclass
+class InMemoryProject:
+    """
+    ディスクに書き出さずに実行するプロジェクト。モジュール名からモジュールを引く。
+    pickle できるため、ExecutionPool のワーカーへそのまま渡せる。
+    """
+    modules: dict[str, InMemoryModule] = field(default_factory=dict)
+    # __init__.py のないディレクトリ（名前空間パッケージ）
+    namespace_packages: set[str] = field(default_factory=set)
+
+    def add_module(self, rel_path: Path, filename: str, *, source: str | None = None, tree: ast.AST | None = None):
+        """入力ディレクトリからの相対パスでモジュールを登録する。"""
+        name = get_module_name(rel_path)
+        self.modules[name] = InMemoryModule(
+            name, filename, is_package=rel_path.name == "__init__.py", source=source, tree=tree
+        )
+        parts = name.split(".")
+        for i in range(1, len(parts)):
+            self.namespace_packages.add(".".join(parts[:i]))
+        self.namespace_packages -= self.modules.keys()
+
+    def get_top_level_names(self) -> set[str]:
+        return {name.split(".", 1)[0] for name in self.modules.keys() | self.namespace_packages}
+
+def load_transformed_project(
+    transformed: list[tuple[Path, ast.AST | None]],
+    base_dir: Path | None = None,
+) -> InMemoryProject:
+    """
+    transform() の結果からメモリ上のプロジェクトを作る。
+    base_dir を渡すと、各モジュールの __file__ をその配下のパスにする。
+    """
+    project = InMemoryProject()
+    for rel_path, tree in transformed:
+        if tree is None:
+            raise RuntimeError(f"Cannot execute a project with untransformable module: {rel_path}")
+        project.add_module(rel_path, _get_filename(base_dir, rel_path), tree=tree)
+    return project
+
+def load_generated_project(dir: Path) -> InMemoryProject:
+    """出力ディレクトリに書き出した生成コードをメモリ上のプロジェクトとして読み込む。"""
+    project = InMemoryProject()
+    for file_path in sorted(dir.rglob("*.py")):
+        rel_path = file_path.relative_to(dir)
+        if "__pycache__" in rel_path.parts:
+            continue
+        project.add_module(rel_path, str(file_path), source=file_path.read_text(encoding="utf-8"))
+    return project
+
+def run_in_process(project: InMemoryProject, entry_file: str) -> str:
+    """
+    エントリファイルを __main__ として同じプロセスで実行し、標準出力を返す。
+
+    プロジェクトのモジュールはカスタムローダで読み込む。プロジェクトのモジュールは実行後に
+    sys.modules から取り除き、同名の既存モジュールは元に戻すため、実行ごとに独立する。
+    """
+    logger.debug_log("\n--- Running Generated Code (in process) ---")
+    entry_module = project.modules.get(get_module_name(Path(entry_file)))
+    if entry_module is None:
+        raise RuntimeError(f"Entry file not found in project: {entry_file}")
+
+    finder = _InMemoryFinder(project)
+    top_level_names = project.get_top_level_names()
+    saved_main = sys.modules.get("__main__")
+    saved_argv = sys.argv
+    # ディスクから実行する場合と同じく、プロジェクトのモジュールは同名の既存モジュールより優先する
+    shadowed_modules = {
+        name: sys.modules.pop(name) for name in list(sys.modules) if name.split(".", 1)[0] in top_level_names
+    }
+    sys.meta_path.insert(0, finder)
+    sys.argv = [entry_module.filename]
+    stdout, stderr = io.StringIO(), io.StringIO()
+    failure = None
+    try:
+        main_module = types.ModuleType("__main__")
+        main_module.__file__ = entry_module.filename
+        sys.modules["__main__"] = main_module
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                exec(entry_module.get_code(), main_module.__dict__)
+            except SystemExit as e:
+                if e.code not in (None, 0):
+                    failure = f"SystemExit: {e.code}"
+            except BaseException:
+                failure = traceback.format_exc()
+    finally:
+        sys.meta_path.remove(finder)
+        sys.argv = saved_argv
+        for name in list(sys.modules):
+            if name.split(".", 1)[0] in top_level_names:
+                del sys.modules[name]
+        sys.modules.update(shadowed_modules)
+        if saved_main is not None:
+            sys.modules["__main__"] = saved_main
+        else:
+            sys.modules.pop("__main__", None)
+
+    if failure is not None:
+        logger.error_log("Execution failed:")
+        raise RuntimeError(f"Execution failed for {entry_module.filename}: {stderr.getvalue()}{failure}")
+    return stdout.getvalue()
+
+class ExecutionPool:
+    """
+    メモリ上のプロジェクトを、起動済みのワーカープロセスで実行する。
+
+    ワーカーは forkserver（使えない環境では spawn）で起動し、コンパイラを読み込んだ状態で再利用する。
+    実行ごとにインタプリタを起動する必要はなく、生成コードの異常終了が呼び出し元へ波及しない。
+    compile_projects() にも渡せ、コンパイルと実行で同じワーカーを使える。
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        start_methods = multiprocessing.get_all_start_methods()
+        if "forkserver" in start_methods:
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload([__name__, f"{__package__}.pipeline"])
+        else:
+            context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+    def run(self, project: InMemoryProject, entry_file: str) -> str:
+        """ワーカーでエントリファイルを実行し、標準出力を返す。"""
+        return self.submit(run_in_process, project, entry_file).result()
+
+    def submit(self, fn: Callable[..., T], *args) -> Future[T]:
+        """モジュールの関数をワーカーで呼び出す（引数と戻り値は pickle できるもの）。"""
+        return self._executor.submit(fn, *args)
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ExecutionPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+class _InMemoryFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, project: InMemoryProject):
+        self.project = project
+        self.loader = _InMemoryLoader(project)
+
+    def find_spec(self, fullname, path, target=None):
+        module = self.project.modules.get(fullname)
+        if module is not None:
+            spec = importlib.util.spec_from_loader(
+                fullname, self.loader, origin=module.filename, is_package=module.is_package
+            )
+            spec.has_location = True
+            return spec
+        if fullname in self.project.namespace_packages:
+            spec = importlib.util.spec_from_loader(fullname, self.loader, is_package=True)
+            return spec
+        return None
+
+class _InMemoryLoader(importlib.abc.InspectLoader):
+    def __init__(self, project: InMemoryProject):
+        self.project = project
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        source_module = self.project.modules.get(module.__name__)
+        if source_module is None:
+            # 名前空間パッケージは実行するコードを持たない
+            return
+        module.__file__ = source_module.filename
+        exec(source_module.get_code(), module.__dict__)
+
+    def is_package(self, fullname):
+        module = self.project.modules.get(fullname)
+        return module.is_package if module else fullname in self.project.namespace_packages
+
+    def get_source(self, fullname):
+        # トレースバックの行表示に使われる
+        module = self.project.modules.get(fullname)
+        if module is None:
+            return None
+        if module.source is None and module.tree is not None:
+            return ast.unparse(module.tree)
+        return module.source
+
+
+# --- ヘルパー関数 ---
+def _get_filename(base_dir: Path | None, rel_path: Path) -> str:
+    return str(base_dir / rel_path) if base_dir is not None else rel_path.as_posix()
@@ -1,53 +1,89 @@
 import ast
+import os
 import re
 import json
 from pathlib import Path
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
 
+from .project_config import ProjectConfig, load_project_config
+from .symbol_table.project_symbol_index import ProjectSymbolIndex
+from .symbol_table.symbol_table import SymbolTable
+from .symbol_table.symbol_table_builder import SymbolTableBuilder
 from .util import logger
+from .util.ast_util import get_class_version_info, UNVERSIONED_CLASS_TAG
 from .util.constants import (
     PROJECT_SYNC_MODULES_KEY,
     PROJECT_INCOMPATIBILITIES_KEY,
     PROJECT_NORMAL_FILES_KEY,
+    PROJECT_SYMBOL_INDEX_KEY,
+    PROJECT_VERSIONED_FILES_KEY,
+    PROJECT_CONFIG_KEY,
+    INCOMPATIBILITY_MARKER_NAME,
+    IGNORE_FILE_NAME,
+    MVO_CONFIG_FILE_NAME,
+    PYPROJECT_FILE_NAME,
 )
 
-def create_project_structure(input_dir: Path) -> Dict:
+# versionedクラス定義の候補となる行。トップレベルの `class Foo__1__` のみを対象とし、
+# 一致しないファイルはversionedクラスを含まないと判断できる（誤検出は AST で除く）
+VERSIONED_CLASS_SOURCE_PATTERN = re.compile(r"^class\s+\w+__\d+__\b", re.MULTILINE)
+SYNC_FILE_PATTERN = re.compile(r"(.+)_sync\.py$")
+# 互換性定義の JSON の書き出し（`{"Foo": {"1": ...` または空のオブジェクト）
+INCOMPATIBILITY_JSON_PREFIX_PATTERN = re.compile(rb'\A\s*\{\s*(\}|"[^"\\]*"\s*:\s*\{\s*(\}|"\d+"\s*:))')
+INCOMPATIBILITY_JSON_PREFIX_SIZE = 256
+PROJECT_CONFIG_FILE_NAMES = frozenset({IGNORE_FILE_NAME, MVO_CONFIG_FILE_NAME, PYPROJECT_FILE_NAME})
+
+def create_project_structure(
+    input_dir: Path,
+    *,
+    lazy: bool = False,
+    excluded_dirs: Iterable[Path] = (),
+) -> Dict:
     """
     1. 入力ディレクトリからPythonファイルを読み取る
     2. 各ファイルをASTに変換する
     3. ファイルを (通常ファイル / 同期関数 / 互換性定義) に分類する
+    4. versionedクラスを含むファイルからプロジェクト全体のシンボルインデックスを構築する
+
+    通常ファイルのうち、ソースの字句的な走査でversionedクラスの定義を含みうると分かったものを
+    PROJECT_VERSIONED_FILES_KEY に記録する。
+    lazy=True の場合、それ以外の通常ファイルは解析せず AST の代わりに None を保持する
+    （必要になった時点で parse_source_file により解析する）。
+    excluded_dirs に含まれるディレクトリ（出力ディレクトリなど）は走査しない。
     """
     project_structure = {
         PROJECT_SYNC_MODULES_KEY: {},
         PROJECT_INCOMPATIBILITIES_KEY: {},
-        PROJECT_NORMAL_FILES_KEY: []
+        PROJECT_NORMAL_FILES_KEY: [],
+        PROJECT_SYMBOL_INDEX_KEY: None,
+        PROJECT_VERSIONED_FILES_KEY: set(),
+        PROJECT_CONFIG_KEY: load_project_config(input_dir),
     }
 
-    py_files = list(input_dir.glob("**/*.py"))
-    source_files = []
-    state_transformation_files = []
-    for file_path in py_files:
-        if re.match(r".+_sync\.py$", file_path.name):
-            state_transformation_files.append(file_path)
-        else:
-            source_files.append(file_path)
-    incompatibilities_files = list(input_dir.glob("**/*.json"))
-
-    
+    source_files, state_transformation_files, incompatibilities_files = _walk_project_files(
+        input_dir, project_structure[PROJECT_CONFIG_KEY], excluded_dirs
+    )
+
     # --- 通常ファイル ---
     for source_file in source_files:
         try:
             with open(source_file, 'r', encoding='utf-8') as f:
                 source_code = f.read()
             relative_path = source_file.relative_to(input_dir)
-            project_structure[PROJECT_NORMAL_FILES_KEY].append((relative_path, ast.parse(source_code)))
+            is_versioned = bool(VERSIONED_CLASS_SOURCE_PATTERN.search(source_code))
+            tree = ast.parse(source_code) if is_versioned or not lazy else None
+            project_structure[PROJECT_NORMAL_FILES_KEY].append((relative_path, tree))
+            if is_versioned:
+                project_structure[PROJECT_VERSIONED_FILES_KEY].add(relative_path)
+                _merge_incompatibilities(
+                    project_structure[PROJECT_INCOMPATIBILITIES_KEY], _extract_inline_incompatibilities(tree)
+                )
         except Exception as e:
             logger.error_log(f"Failed to parse {source_file}: {e}")
 
     # --- 状態同期ファイル ---
-    sync_pattern = re.compile(r"(.+)_sync\.py$")
     for state_transformation_file in state_transformation_files:
-        sync_match = sync_pattern.match(state_transformation_file.name)
+        sync_match = SYNC_FILE_PATTERN.match(state_transformation_file.name)
         try:
             with open(state_transformation_file, 'r', encoding='utf-8') as f:
                 source_code = f.read()
@@ -61,18 +97,219 @@ def create_project_structure(input_dir: Path) -> Dict:
         try:
             incompatibilities = _parse_incompatibility_json(incompatibilities_file)
             if incompatibilities:
-                project_structure[PROJECT_INCOMPATIBILITIES_KEY].update(incompatibilities)
+                _merge_incompatibilities(project_structure[PROJECT_INCOMPATIBILITIES_KEY], incompatibilities)
         except Exception as e:
             logger.error_log(f"Failed to parse {incompatibilities_file}: {e}")
 
+    # --- シンボルインデックス ---
+    project_structure[PROJECT_SYMBOL_INDEX_KEY] = build_symbol_index(
+        project_structure[PROJECT_NORMAL_FILES_KEY],
+        project_structure[PROJECT_VERSIONED_FILES_KEY],
+    )
+
     return project_structure
 
+def build_symbol_index(
+    normal_files: list[Tuple[Path, ast.AST]],
+    versioned_files: Set[Path] | None = None,
+) -> ProjectSymbolIndex:
+    """
+    versionedクラスを含む各ファイルのシンボルテーブルを1回ずつ構築し、インデックスにまとめる。
+    versioned_files を渡すと、それ以外のファイルは調べない。
+
+    シンボルテーブルの構築はversionedクラスの `__init__` を `__initialize__` へ改名するため、
+    各ファイルにつき1回だけ行い、変換時にはここで構築したものを再利用する。
+    """
+    symbol_index = ProjectSymbolIndex()
+    for rel_path, tree in normal_files:
+        if versioned_files is not None and rel_path not in versioned_files:
+            continue
+        if not any(
+            isinstance(node, ast.ClassDef) and get_class_version_info(node)[0]
+            for node in tree.body
+        ):
+            continue
+        symbol_table = SymbolTable()
+        module_name = get_module_name(rel_path)
+        SymbolTableBuilder(symbol_table, module_name, rel_path.name == "__init__.py").visit(tree)
+        logger.no_header_log(symbol_table.get_representation)
+        symbol_index.add_module(module_name, symbol_table)
+
+    _check_versioned_bases(symbol_index)
+    return symbol_index
+
+def snapshot_project_files(input_dir: Path, excluded_dirs: Iterable[Path] = ()) -> Dict[str, Tuple[int, int]]:
+    """
+    コンパイル結果に影響しうるファイル（.py / .json と設定ファイル）の
+    { 相対パス: (更新時刻, サイズ) } を返す。監視モードで変更の検出に使う。
+    """
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    for entry, rel_path in _iter_project_entries(input_dir, load_project_config(input_dir), excluded_dirs):
+        if entry.name.endswith((".py", ".json")) or rel_path in PROJECT_CONFIG_FILE_NAMES:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            snapshot[rel_path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+def parse_source_file(input_dir: Path, rel_path: Path) -> Optional[ast.AST]:
+    """
+    通常ファイルを解析して AST を返す（失敗した場合は None）。
+    """
+    source_file = input_dir / rel_path
+    try:
+        with open(source_file, 'r', encoding='utf-8') as f:
+            return ast.parse(f.read())
+    except Exception as e:
+        logger.error_log(f"Failed to parse {source_file}: {e}")
+        return None
+
+def get_module_name(rel_path: Path) -> str:
+    """入力ディレクトリからの相対パスを import 時のモジュール名に変換する。"""
+    parts = list(rel_path.with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
 
 # --------------------
 # --- ヘルパー関数 ---
 # --------------------
 
+def _walk_project_files(
+    input_dir: Path,
+    config: ProjectConfig,
+    excluded_dirs: Iterable[Path] = (),
+) -> Tuple[list[Path], list[Path], list[Path]]:
+    """
+    入力ディレクトリを1回だけ走査し、(通常ファイル, 同期モジュール, 互換性定義) に分類する。
+    """
+    source_files: list[Path] = []
+    sync_files: list[Path] = []
+    incompatibilities_files: list[Path] = []
+    for entry, rel_path in _iter_project_entries(input_dir, config, excluded_dirs):
+        if entry.name.endswith(".py"):
+            if _is_sync_file(entry.name, rel_path, config):
+                sync_files.append(Path(entry.path))
+            else:
+                source_files.append(Path(entry.path))
+        elif entry.name.endswith(".json") and _is_incompatibility_file(entry.path, rel_path, config):
+            incompatibilities_files.append(Path(entry.path))
+    return source_files, sync_files, incompatibilities_files
+
+def _iter_project_entries(
+    input_dir: Path,
+    config: ProjectConfig,
+    excluded_dirs: Iterable[Path] = (),
+) -> Iterator[Tuple[os.DirEntry, str]]:
+    """
+    入力ディレクトリ配下の無視しないファイルを (エントリ, `/` 区切りの相対パス) として返す。
+    無視するディレクトリはその配下を走査しない。各ディレクトリ内は名前順にたどる。
+    """
+    excluded = {os.path.realpath(path) for path in excluded_dirs}
+    pending = [(str(input_dir), "")]
+    while pending:
+        dir_path, rel_dir = pending.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.error_log(f"Failed to scan {dir_path}: {e}")
+            continue
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                if not config.is_ignored(rel_path, True) and os.path.realpath(entry.path) not in excluded:
+                    subdirs.append((entry.path, f"{rel_path}/"))
+                continue
+            if config.is_ignored(rel_path, False) or not entry.is_file():
+                continue
+            yield entry, rel_path
+        # 名前順にたどるため逆順に積む
+        pending.extend(reversed(subdirs))
+
+def _is_sync_file(name: str, rel_path: str, config: ProjectConfig) -> bool:
+    """
+    `*_sync.py` が同期モジュールかを返す。設定で宣言されていればそれに従い、
+    宣言されていない `*_sync.py` は通常ファイルとして扱う。
+    """
+    is_declared = config.is_declared_sync_file(rel_path)
+    if is_declared is None:
+        return bool(SYNC_FILE_PATTERN.match(name))
+    if is_declared and not SYNC_FILE_PATTERN.match(name):
+        logger.warning_log(f"Ignoring declared sync module '{rel_path}': the file name must end with '_sync.py'.")
+        return False
+    return is_declared
+
+def _extract_inline_incompatibilities(tree: ast.AST) -> Dict[str, Dict[int, Set[str]]]:
+    """
+    versionedクラスの本体に書かれた `__incompatible__ = [...]` を読み取り、クラスから取り除く。
+
+    戻り値:
+      { base_name: { version: set(attrs) } }
+    """
+    out: Dict[str, Dict[int, Set[str]]] = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        base_name, version = get_class_version_info(node)
+        if not base_name:
+            continue
+        body = []
+        for member in node.body:
+            if not (
+                isinstance(member, ast.Assign) and len(member.targets) == 1
+                and isinstance(member.targets[0], ast.Name) and member.targets[0].id == INCOMPATIBILITY_MARKER_NAME
+            ):
+                body.append(member)
+                continue
+            try:
+                attrs = ast.literal_eval(member.value)
+            except ValueError:
+                attrs = None
+            if not isinstance(attrs, (list, tuple, set, frozenset)) or not all(isinstance(a, str) for a in attrs):
+                logger.warning_log(f"Ignoring {INCOMPATIBILITY_MARKER_NAME} in '{node.name}': expected a literal list of strings.")
+                continue
+            out.setdefault(base_name, {}).setdefault(int(version), set()).update(attrs)
+        # 本体が空になる場合は pass を残す
+        node.body = body or [ast.Pass()]
+    return out
+
+def _merge_incompatibilities(
+    incompatibilities: Dict[str, Dict[int, Set[str]]],
+    additions: Dict[str, Dict[int, Set[str]]],
+) -> None:
+    for base_name, versions in additions.items():
+        for version, attrs in versions.items():
+            incompatibilities.setdefault(base_name, {}).setdefault(version, set()).update(attrs)
+
+def _is_incompatibility_file(path: str, rel_path: str, config: ProjectConfig) -> bool:
+    """
+    JSON が互換性定義かを返す。pyproject.toml で宣言されていればそれに従い、
+    なければ先頭の数百バイトがスキーマの書き出しに一致するかで判断する。
+    """
+    is_declared = config.is_declared_incompatibility_file(rel_path)
+    if is_declared is not None:
+        return is_declared
+    try:
+        with open(path, 'rb') as f:
+            prefix = f.read(INCOMPATIBILITY_JSON_PREFIX_SIZE)
+    except OSError as e:
+        logger.error_log(f"Failed to read {path}: {e}")
+        return False
+    if INCOMPATIBILITY_JSON_PREFIX_PATTERN.match(prefix):
+        return True
+    logger.debug_log(lambda: f"Skipping JSON (not an incompatibility definition): {path}")
+    return False
+
 def _parse_sync_modules(base_name: str, source_code: str) -> Tuple:
+    """
+    戻り値:
+      (import文のリスト, 同期関数のリスト, 設定値の辞書)
+      設定値はトップレベルの `NAME = <リテラル>`（大文字名）から読み取る。
+    """
     tree = ast.parse(source_code)
     modules = []
     functions = []
@@ -81,7 +318,19 @@ def _parse_sync_modules(base_name: str, source_code: str) -> Tuple:
             modules.append(node)
         elif isinstance(node, ast.FunctionDef):
             functions.append(node)
-    return (modules, functions)
+
+    options = {}
+    for node in tree.body:
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)):
+            continue
+        name = node.targets[0].id
+        if not name.isupper():
+            continue
+        try:
+            options[name] = ast.literal_eval(node.value)
+        except ValueError:
+            logger.warning_log(f"Ignoring non-literal setting '{name}' in sync module of '{base_name}'.")
+    return (modules, functions, options)
 
 def _parse_incompatibility_json(file_path: Path) -> Optional[Dict[str, Dict[str, Set[str]]]]:
     """
@@ -129,3 +378,32 @@ def _parse_incompatibility_json(file_path: Path) -> Optional[Dict[str, Dict[str,
             out[base_name][ver] = set(attrs)
 
     return out
+
+def _check_versioned_bases(symbol_index: ProjectSymbolIndex) -> None:
+    """
+    versionedクラスの親として指定されたバージョンが、プロジェクト内に定義されているか確かめる。
+    他のモジュールから取り込んだ親（`from m import Base__1__` / `m.Base__1__`）はその定義元で確かめる。
+    """
+    for class_name in sorted(symbol_index.get_unique_class_names()):
+        module_name = symbol_index.get_defining_module(class_name)
+        module_table = symbol_index.get_module_table(module_name)
+        class_info = module_table.lookup_class(class_name)
+        for version, bases in sorted(class_info.versioned_bases.items()):
+            for parent_name, parent_version in bases:
+                if parent_version == UNVERSIONED_CLASS_TAG:
+                    continue
+                parent_info = symbol_index.lookup_base_class(module_name, class_info, parent_name)
+                source_module = class_info.imported_bases.get(parent_name, (None, None))[0]
+                if parent_info is None and source_module is not None:
+                    logger.warning_log(
+                        f"'{class_name}__{version}__' extends '{parent_name}__{parent_version}__', "
+                        f"but module '{source_module}' defines no versioned class '{parent_name}' in the project."
+                    )
+                    continue
+                if parent_info is None or not parent_info.is_versioned:
+                    continue
+                if parent_version not in parent_info.versions:
+                    logger.warning_log(
+                        f"'{class_name}__{version}__' extends '{parent_name}__{parent_version}__', "
+                        f"but '{parent_name}' has no version {parent_version} in the project."
+                    )
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 
 from .method_info import MethodInfo
 
@@ -11,6 +11,16 @@ class ClassInfo:
     versioned_bases: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
     methods: Dict[str, List[MethodInfo]] = field(default_factory=dict)
     versions: Set[str] = field(default_factory=set)
+    # 他のモジュールから取り込んだversioned親クラス: 基底名 -> (定義元モジュール名, このモジュールでの参照名)
+    # （`from m import Base__1__` なら ("m", "Base")、`m.Base__1__` なら ("m", "m.Base")。定義元が分からなければ None）
+    imported_bases: Dict[str, Tuple[Optional[str], str]] = field(default_factory=dict)
+
+    def get_base_reference(self, parent_base_name: str) -> str:
+        """
+        versioned親クラスの統合クラスをこのモジュールで参照する名前を返す。
+        """
+        imported = self.imported_bases.get(parent_base_name)
+        return imported[1] if imported else parent_base_name
 
     def get_all_versions(self) -> Set[str]:
         """
@@ -1,6 +1,6 @@
 import ast
 from dataclasses import dataclass, field
-from typing import List, Literal
+from typing import Iterable, List, Literal
 
 @dataclass
 class ParameterInfo:
@@ -38,3 +38,32 @@ class MethodInfo:
     version: str
     parameters: List[ParameterInfo] = field(default_factory=list)
     ast_node: ast.FunctionDef | None = None
+
+    def accepts(self, num_positional: int, keyword_names: Iterable[str]) -> bool:
+        """
+        指定した呼び出しの形（位置引数の数とキーワード引数名）を
+        このメソッドのシグネチャが受け付けるかを判定する。
+        """
+        positional = [p for p in self.parameters if p.kind in ('POSITIONAL_ONLY', 'POSITIONAL_OR_KEYWORD')]
+        has_var_positional = any(p.kind == 'VAR_POSITIONAL' for p in self.parameters)
+        has_var_keyword = any(p.kind == 'VAR_KEYWORD' for p in self.parameters)
+
+        if num_positional > len(positional) and not has_var_positional:
+            return False
+
+        bound = {p.name for p in positional[:num_positional]}
+        keyword_capable = {p.name for p in self.parameters if p.kind in ('POSITIONAL_OR_KEYWORD', 'KEYWORD_ONLY')}
+        for name in keyword_names:
+            if name in keyword_capable:
+                if name in bound:
+                    return False
+                bound.add(name)
+            elif not has_var_keyword:
+                return False
+
+        for p in self.parameters:
+            if p.kind in ('VAR_POSITIONAL', 'VAR_KEYWORD') or p.has_default_value:
+                continue
+            if p.name not in bound:
+                return False
+        return True
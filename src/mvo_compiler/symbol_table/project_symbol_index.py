@@ -0,0 +1,69 @@
+from .class_info import ClassInfo
+from .symbol_table import SymbolTable
+
+class ProjectSymbolIndex:
+    """
+    プロジェクト内の全モジュールのシンボルテーブルを保持する。
+
+    モジュールごとのシンボルテーブルに加え、versionedクラスの基底名から
+    定義元モジュールへの対応を持ち、モジュールをまたいだ参照を解決する。
+    """
+
+    def __init__(self):
+        self._module_tables: dict[str, SymbolTable] = {}
+        self._defining_modules: dict[str, list[str]] = {}
+
+    def add_module(self, module_name: str, symbol_table: SymbolTable):
+        """
+        モジュールのシンボルテーブルを登録する。
+        """
+        self._module_tables[module_name] = symbol_table
+        for class_name, class_info in symbol_table.get_classes().items():
+            if class_info.is_versioned:
+                self._defining_modules.setdefault(class_name, []).append(module_name)
+
+    def get_module_table(self, module_name: str) -> SymbolTable | None:
+        """
+        モジュールのシンボルテーブルを返す。
+        """
+        return self._module_tables.get(module_name)
+
+    def get_defining_module(self, class_name: str) -> str | None:
+        """
+        versionedクラスを定義するモジュール名を返す（未定義・複数定義の場合は None）。
+        """
+        modules = self._defining_modules.get(class_name, [])
+        return modules[0] if len(modules) == 1 else None
+
+    def lookup_class(self, class_name: str) -> ClassInfo | None:
+        """
+        プロジェクト全体から versionedクラスの情報を検索する（複数定義の場合は None）。
+        """
+        module_name = self.get_defining_module(class_name)
+        if module_name is None:
+            return None
+        return self._module_tables[module_name].lookup_class(class_name)
+
+    def lookup_base_class(self, module_name: str, class_info: ClassInfo, parent_base_name: str) -> ClassInfo | None:
+        """
+        モジュールのversionedクラスが継承するversioned親クラスの情報を返す。
+        他のモジュールから取り込んだ親はその定義元から、それ以外は同じモジュール・プロジェクト全体の順に探す。
+        """
+        imported = class_info.imported_bases.get(parent_base_name)
+        if imported is not None and imported[0] is not None:
+            source_table = self._module_tables.get(imported[0])
+            return source_table.lookup_class(parent_base_name) if source_table else None
+        module_table = self._module_tables.get(module_name)
+        return (module_table and module_table.lookup_class(parent_base_name)) or self.lookup_class(parent_base_name)
+
+    def get_ambiguous_class_names(self) -> set[str]:
+        """
+        複数のモジュールで定義される versionedクラスの名前を返す。
+        """
+        return {name for name, modules in self._defining_modules.items() if len(modules) > 1}
+
+    def get_unique_class_names(self) -> set[str]:
+        """
+        ただ1つのモジュールで定義される versionedクラスの名前を返す。
+        """
+        return {name for name, modules in self._defining_modules.items() if len(modules) == 1}
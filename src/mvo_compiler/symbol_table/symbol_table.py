@@ -22,6 +22,21 @@ class SymbolTable:
         """
         return self._class_table.get(class_name)
 
+    def get_classes(self) -> Dict[str, ClassInfo]:
+        """
+        クラス名からクラス情報への対応を返す。
+        """
+        return dict(self._class_table)
+
+    def with_class(self, class_info: ClassInfo) -> "SymbolTable":
+        """
+        指定クラスの情報だけを差し替えた新しいシンボルテーブルを返す。
+        """
+        derived = SymbolTable()
+        derived._class_table = dict(self._class_table)
+        derived.add_class(class_info)
+        return derived
+
     def get_representation(self) -> str:
         """
         シンボルテーブルの文字列表現を返す。
@@ -3,15 +3,40 @@ import ast
 from .symbol_table import SymbolTable
 from .class_info import ClassInfo
 from .method_info import MethodInfo, ParameterInfo
-from ..util.ast_util import get_class_version_info, get_class_version_info_from_name, UNVERSIONED_CLASS_TAG
+from ..util.ast_util import (
+    get_class_version_info,
+    get_class_version_info_from_name,
+    resolve_import_module,
+    UNVERSIONED_CLASS_TAG,
+)
 from ..util.constants import INITIALIZE_METHOD_NAME
 
 class SymbolTableBuilder(ast.NodeVisitor):
     """
     ソースASTを走査してシンボルテーブルを構築する。
+    module_name を渡すと、相対 import で取り込んだ親クラスの定義元モジュールも解決する。
     """
-    def __init__(self, symbol_table: SymbolTable):
+    def __init__(self, symbol_table: SymbolTable, module_name: str | None = None, is_package: bool = False):
         self.symbol_table = symbol_table
+        self.module_name = module_name
+        self.is_package = is_package
+        # `from m import X as Y` で束縛した名前 -> (取り込み元モジュール名, 元の名前)
+        self.imported_names: dict[str, tuple[str | None, str]] = {}
+        # `import a.b` / `import a.b as m` で束縛した名前 -> モジュール名
+        self.imported_modules: dict[str, str] = {}
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                self.imported_modules[alias.asname] = alias.name
+            else:
+                root = alias.name.split(".")[0]
+                self.imported_modules[root] = root
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        source_module = resolve_import_module(node, self.module_name, self.is_package)
+        for alias in node.names:
+            self.imported_names[alias.asname or alias.name] = (source_module, alias.name)
 
     def visit_ClassDef(self, node: ast.ClassDef):
         class_name, version = get_class_version_info(node)
@@ -27,6 +52,7 @@ class SymbolTableBuilder(ast.NodeVisitor):
         existing_class_info = self.symbol_table.lookup_class(class_name)
         methods_map = existing_class_info.methods if existing_class_info else {}
         versioned_bases_map = existing_class_info.versioned_bases if existing_class_info else {}
+        imported_bases = existing_class_info.imported_bases if existing_class_info else {}
         versions_set = set(existing_class_info.versions) if existing_class_info else set()
 
         # versionedクラスの場合のみ継承関係を収集
@@ -38,15 +64,24 @@ class SymbolTableBuilder(ast.NodeVisitor):
                 parent_version = None
 
                 if isinstance(base_node, ast.Name):
-                    parent_base_name, parent_version = get_class_version_info_from_name(base_node.id)
+                    source_module, original_name = self.imported_names.get(base_node.id, (None, base_node.id))
+                    parent_base_name, parent_version = get_class_version_info_from_name(original_name)
                     if not parent_base_name:
                         parent_base_name = base_node.id
                         parent_version = UNVERSIONED_CLASS_TAG
+                    elif base_node.id in self.imported_names:
+                        # 取り込み元では統合クラスの名前で定義される
+                        imported_bases[parent_base_name] = (source_module, parent_base_name)
                 elif isinstance(base_node, ast.Attribute):
                     parent_base_name, parent_version = get_class_version_info_from_name(base_node.attr)
                     if not parent_base_name:
                         parent_base_name = ast.unparse(base_node)
                         parent_version = UNVERSIONED_CLASS_TAG
+                    else:
+                        qualifier = ast.unparse(base_node.value)
+                        imported_bases[parent_base_name] = (
+                            self._resolve_module_reference(qualifier), f"{qualifier}.{parent_base_name}"
+                        )
                 else:
                     parent_base_name = ast.unparse(base_node)
                     parent_version = UNVERSIONED_CLASS_TAG
@@ -71,10 +106,24 @@ class SymbolTableBuilder(ast.NodeVisitor):
             versioned_bases=versioned_bases_map,
             methods=methods_map,
             versions=versions_set,
+            imported_bases=imported_bases,
         )
         self.symbol_table.add_class(class_info)
 
     # --- HELPER METHODS ---
+    def _resolve_module_reference(self, qualifier: str) -> str | None:
+        """`m` や `pkg.m` のようなモジュール参照を、import した名前からモジュール名へ解決する。"""
+        root, _, rest = qualifier.partition(".")
+        if root in self.imported_modules:
+            module_name = self.imported_modules[root]
+        elif root in self.imported_names:
+            # `from pkg import m` で取り込んだサブモジュール
+            source_module, original_name = self.imported_names[root]
+            module_name = f"{source_module}.{original_name}" if source_module else None
+        else:
+            return None
+        return f"{module_name}.{rest}" if module_name and rest else module_name
+
     def _create_method_info(self, method_node: ast.FunctionDef, version: str) -> MethodInfo:
         parameters = []
         args = method_node.args
@@ -85,6 +134,9 @@ class SymbolTableBuilder(ast.NodeVisitor):
 
         # --- 1. 位置専用引数 (/) の収集 ---
         for i, arg in enumerate(args.posonlyargs):
+            # 先頭の 'self' は無視
+            if i == 0:
+                continue
             parameters.append(ParameterInfo(
                 name=arg.arg,
                 type=ast.unparse(arg.annotation) if arg.annotation else "any",
@@ -94,8 +146,8 @@ class SymbolTableBuilder(ast.NodeVisitor):
 
         # --- 2. 通常引数の収集 ---
         for i, arg in enumerate(args.args):
-            # 'self' は無視
-            if i == 0:
+            # 'self' は無視（位置専用引数がある場合はそちらの先頭が 'self'）
+            if i == 0 and not args.posonlyargs:
                 continue
             
             combined_index = len(args.posonlyargs) + i
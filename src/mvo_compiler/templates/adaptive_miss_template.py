@@ -0,0 +1,35 @@
+# トランスパイラがASTとして解析・再利用するためのテンプレート。
+# 直接実行されない。
+def _ADAPTIVE_MISS_PLACEHOLDER(self, method_name, target_version):
+    cls = type(self)
+    # [直前のミス, 往復の連続回数, 借りている組]。インスタンスごとに持ち、切り戻しで __dict__ が
+    # 置き換わっても同じリストを引き継ぐ
+    adaptive_state = self._ADAPTIVE_STATE_PLACEHOLDER
+    if adaptive_state is None:
+        adaptive_state = self._ADAPTIVE_STATE_PLACEHOLDER = [None, 0, frozenset()]
+    current_version_num = self._CURRENT_STATE_PLACEHOLDER._version_number
+    if (current_version_num, target_version) in adaptive_state[2]:
+        # 往復が続いた組では切り替えずに切替先の実装を借りる
+        return cls._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[target_version]
+
+    last_miss = adaptive_state[0]
+    adaptive_state[0] = (method_name, current_version_num, target_version)
+    if last_miss is not None and last_miss[1] == target_version and last_miss[2] == current_version_num:
+        adaptive_state[1] += 1
+    else:
+        adaptive_state[1] = 0
+
+    if adaptive_state[1] >= [THRESHOLD]:
+        adaptive_state[1] = 0
+        cover_version = cls._COVER_VERSIONS_PLACEHOLDER.get((last_miss[0], method_name))
+        if cover_version is not None:
+            # 両方のメソッドを定義するバージョンへ移る
+            target_version = cover_version
+        elif (current_version_num, target_version) in cls._BORROWABLE_PAIRS_PLACEHOLDER:
+            adaptive_state[2] = adaptive_state[2] | {(current_version_num, target_version)}
+            if (target_version, current_version_num) in cls._BORROWABLE_PAIRS_PLACEHOLDER:
+                adaptive_state[2] = adaptive_state[2] | {(target_version, current_version_num)}
+            return cls._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[target_version]
+
+    self._SWITCH_TO_VERSION_PLACEHOLDER(target_version)
+    return self._CURRENT_STATE_PLACEHOLDER
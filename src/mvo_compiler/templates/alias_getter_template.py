@@ -0,0 +1,5 @@
+@property
+def [ATTR](self):
+    if self._CURRENT_STATE_PLACEHOLDER._version_number != [VERSION]:
+        self._SWITCH_TO_VERSION_PLACEHOLDER([VERSION])
+    return self.[STORAGE]
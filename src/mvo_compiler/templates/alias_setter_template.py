@@ -0,0 +1,5 @@
+@[ATTR].setter
+def [ATTR](self, value):
+    if self._CURRENT_STATE_PLACEHOLDER._version_number != [VERSION]:
+        self._SWITCH_TO_VERSION_PLACEHOLDER([VERSION])
+    self.[STORAGE] = value
@@ -0,0 +1,43 @@
+# トランスパイラがASTとして解析・再利用するためのテンプレート。
+# 直接実行されない。
+@classmethod
+def build_many(cls, version_num, args_iterable):
+    if version_num not in cls._BULK_VERSIONS_PLACEHOLDER:
+        raise ValueError(f"'{cls.__name__}' cannot build version {version_num!r} in bulk.")
+    state = cls._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[version_num]
+    initialize = type(state).__initialize__
+    new = object.__new__
+    objs = []
+    append = objs.append
+    for args in args_iterable:
+        obj = new(cls)
+        obj._CURRENT_STATE_PLACEHOLDER = state
+        initialize(obj, *args, _wrapper_self=obj)
+        append(obj)
+    if version_num != [INITIAL_VERSION]:
+        # 汎用 __init__ が生成直後に行う切替と同じく、切替回数に数える
+        cls._switch_count += len(objs)
+    return objs
+
+@classmethod
+def build_columns(cls, version_num, **columns):
+    if version_num not in cls._BULK_VERSIONS_PLACEHOLDER:
+        raise ValueError(f"'{cls.__name__}' cannot build version {version_num!r} in bulk.")
+    if not columns:
+        raise TypeError("build_columns() requires at least one column.")
+    state = cls._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[version_num]
+    storage = cls._COLUMN_STORAGE_PLACEHOLDER
+    names = [storage.get(name, name) for name in columns]
+    new = object.__new__
+    objs = []
+    append = objs.append
+    for values in zip(*columns.values(), strict=True):
+        obj = new(cls)
+        obj._CURRENT_STATE_PLACEHOLDER = state
+        # __dict__ を辞書で差し替えるとキー共有の辞書にならず遅いため、属性として設定する
+        for name, value in zip(names, values):
+            setattr(obj, name, value)
+        append(obj)
+    if version_num != [INITIAL_VERSION]:
+        cls._switch_count += len(objs)
+    return objs
@@ -2,10 +2,7 @@
 # 直接実行されない。
 def __init__(self, *args, **kwargs):
 
-    self._CURRENT_STATE_PLACEHOLDER = self._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[0]
+    self._CURRENT_STATE_PLACEHOLDER = self._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[_INITIAL_VERSION_PLACEHOLDER]
 
-    try:
-        self._CURRENT_STATE_PLACEHOLDER.__initialize__(*args, _wrapper_self=self, **kwargs)
-    except (AttributeError, TypeError):
-        # __initialize__ 呼び出しのディスパッチ if-else 連鎖
-        pass
+    # __initialize__ 呼び出しのディスパッチ（呼び出し形ごとにキャッシュ）
+    pass
@@ -0,0 +1,37 @@
+# トランスパイラがASTとして解析・再利用するためのテンプレート。
+# 直接実行されない。
+@staticmethod
+def _VERSION_STATE_PLACEHOLDER(version_num):
+    return _CLASS_PLACEHOLDER._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[version_num]
+
+def __getstate__(self):
+    fields = self.__dict__.copy()
+    for name in self._TRANSIENT_FIELDS_PLACEHOLDER:
+        fields.pop(name, None)
+    return fields
+
+def __setstate__(self, state):
+    self.__dict__.update(state)
+
+def __copy__(self):
+    obj = object.__new__(type(self))
+    obj.__dict__.update(self.__getstate__())
+    return obj
+
+def __deepcopy__(self, memo):
+    import copy
+    obj = object.__new__(type(self))
+    memo[id(self)] = obj
+    obj.__dict__.update(copy.deepcopy(self.__getstate__(), memo))
+    return obj
+
+# 以下は各バージョンの実装クラスに追加する
+def __reduce__(self):
+    # 実装シングルトンはバージョン番号のみを保存し、復元時に同じシングルトンを引き直す
+    return (_CLASS_PLACEHOLDER._VERSION_STATE_PLACEHOLDER, (self._version_number,))
+
+def __copy__(self):
+    return self
+
+def __deepcopy__(self, memo):
+    return self
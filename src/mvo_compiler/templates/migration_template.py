@@ -0,0 +1,44 @@
+# トランスパイラがASTとして解析・再利用するためのテンプレート。
+# 直接実行されない。
+def _MIGRATE_PLACEHOLDER(self):
+    # 遅延移行: 最後の migrate_all(lazy=True) 以降で最初のアクセス時に移行する
+    self._EPOCH_FIELD_PLACEHOLDER = self._EPOCH_PLACEHOLDER
+    target_version = self._MIGRATION_TARGET_PLACEHOLDER
+    if target_version is not None and self._CURRENT_STATE_PLACEHOLDER._version_number != target_version:
+        self._SWITCH_TO_VERSION_PLACEHOLDER(target_version)
+
+@classmethod
+def migrate_all(cls, version_num, *, lazy=False, workers=None):
+    if version_num not in cls._VERSION_INSTANCES_SINGLETON_PLACEHOLDER:
+        raise ValueError(f"'{cls.__name__}' has no version {version_num!r}.")
+    cls._MIGRATION_TARGET_PLACEHOLDER = version_num
+    cls._EPOCH_PLACEHOLDER += 1
+    if lazy:
+        return None
+
+    epoch = cls._EPOCH_PLACEHOLDER
+    objs = []
+    for obj in list(cls._INSTANCES_PLACEHOLDER):
+        obj._EPOCH_FIELD_PLACEHOLDER = epoch
+        if obj._CURRENT_STATE_PLACEHOLDER._version_number != version_num:
+            objs.append(obj)
+
+    import sys
+    # GIL のあるビルドではスレッドに分けても速くならないため、逐次に切り替える
+    if workers is not None and workers > 1 and len(objs) > 1 and not getattr(sys, '_is_gil_enabled', lambda: True)():
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(lambda obj: obj._SWITCH_TO_VERSION_PLACEHOLDER(version_num), objs):
+                pass
+    else:
+        for obj in objs:
+            obj._SWITCH_TO_VERSION_PLACEHOLDER(version_num)
+    return len(objs)
+
+def _MIGRATION_CHECK_PLACEHOLDER(self):
+    if self._EPOCH_FIELD_PLACEHOLDER != self._EPOCH_PLACEHOLDER:
+        self._MIGRATE_PLACEHOLDER()
+
+def _TRACK_INSTANCE_PLACEHOLDER(_OBJ_PLACEHOLDER):
+    _OBJ_PLACEHOLDER._INSTANCES_PLACEHOLDER.add(_OBJ_PLACEHOLDER)
+    _OBJ_PLACEHOLDER._EPOCH_FIELD_PLACEHOLDER = _OBJ_PLACEHOLDER._EPOCH_PLACEHOLDER
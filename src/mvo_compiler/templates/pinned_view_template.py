@@ -0,0 +1,75 @@
+# トランスパイラがASTとして解析・再利用するためのテンプレート。
+# 直接実行されない。
+class _PINNED_VIEW_PLACEHOLDER:
+    # (バージョン番号, メソッド名) -> 実装クラスの関数（なければ None）
+    _pinned_methods = {}
+
+    def __init__(self, obj, version_num):
+        self.__dict__['_pinned_obj'] = obj
+        self.__dict__['_pinned_version_num'] = version_num
+        self.__dict__['_pinned_previous_version_num'] = None
+
+    def __enter__(self):
+        obj = self._pinned_obj
+        current_version_num = obj._CURRENT_STATE_PLACEHOLDER._version_number
+        if obj._PIN_DEPTH_PLACEHOLDER:
+            if current_version_num != self._pinned_version_num:
+                raise RuntimeError(
+                    f"'{type(obj).__name__}' object is already pinned to version {current_version_num}; "
+                    f"cannot pin it to version {self._pinned_version_num}."
+                )
+        else:
+            self.__dict__['_pinned_previous_version_num'] = current_version_num
+            if current_version_num != self._pinned_version_num:
+                obj._SWITCH_TO_VERSION_PLACEHOLDER(self._pinned_version_num)
+        obj._PIN_DEPTH_PLACEHOLDER += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        obj = self._pinned_obj
+        obj._PIN_DEPTH_PLACEHOLDER -= 1
+        previous_version_num = self._pinned_previous_version_num
+        # 最も外側のピンを外すときに限り、ピン留め前のバージョンへ戻す
+        if not obj._PIN_DEPTH_PLACEHOLDER and previous_version_num is not None:
+            if obj._CURRENT_STATE_PLACEHOLDER._version_number != previous_version_num:
+                obj._SWITCH_TO_VERSION_PLACEHOLDER(previous_version_num)
+        return False
+
+    def __getattr__(self, name):
+        import functools
+        import types
+        obj = self._pinned_obj
+        key = (self._pinned_version_num, name)
+        methods = type(self)._pinned_methods
+        if key not in methods:
+            method = None
+            impl_class = type(obj._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[self._pinned_version_num])
+            for klass in impl_class.__mro__:
+                if name in klass.__dict__:
+                    member = klass.__dict__[name]
+                    # バージョン実装クラスに定義された通常の関数のみ直接呼び出す
+                    if '_version_number' in klass.__dict__ and isinstance(member, types.FunctionType):
+                        method = member
+                    break
+            methods[key] = method
+        method = methods[key]
+        if method is None:
+            return getattr(obj, name)
+        bound = functools.partial(method, obj, _wrapper_self=obj)
+        self.__dict__[name] = bound
+        return bound
+
+    def __setattr__(self, name, value):
+        setattr(self._pinned_obj, name, value)
+
+def pinned(self, version_num):
+    if version_num not in self._VERSION_INSTANCES_SINGLETON_PLACEHOLDER:
+        raise ValueError(f"'{type(self).__name__}' has no version {version_num!r}.")
+    return self._PINNED_VIEW_PLACEHOLDER(self, version_num)
+
+def _PIN_GUARD_PLACEHOLDER(self, version_num):
+    if self._PIN_DEPTH_PLACEHOLDER:
+        raise RuntimeError(
+            f"'{type(self).__name__}' object is pinned to version "
+            f"{self._CURRENT_STATE_PLACEHOLDER._version_number}; cannot switch to version {version_num}."
+        )
@@ -0,0 +1,17 @@
+# トランスパイラがASTとして解析・再利用するためのテンプレート。
+# 直接実行されない。
+def _SHAPE_DISPATCH_PLACEHOLDER(self, *args, **kwargs):
+    shape = ([METHOD_NAME], len(args), *sorted(kwargs)) if kwargs else ([METHOD_NAME], len(args))
+    matching_versions = self._DISPATCH_CACHE_PLACEHOLDER.get(shape)
+    if matching_versions is None:
+        matching_versions = []
+        _SIGNATURE_CHECK_PLACEHOLDER_ = None
+        matching_versions = tuple(matching_versions)
+        if len(self._DISPATCH_CACHE_PLACEHOLDER) >= [CACHE_SIZE]:
+            self._DISPATCH_CACHE_PLACEHOLDER.clear()
+        self._DISPATCH_CACHE_PLACEHOLDER[shape] = matching_versions
+    if self._CURRENT_STATE_PLACEHOLDER._version_number not in matching_versions:
+        if not matching_versions:
+            raise TypeError([NO_MATCH_MESSAGE])
+        self._SWITCH_TO_VERSION_PLACEHOLDER(matching_versions[0])
+    return self._CURRENT_STATE_PLACEHOLDER.[METHOD](*args, _wrapper_self=self, **kwargs)
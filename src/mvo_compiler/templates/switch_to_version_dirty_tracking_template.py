@@ -0,0 +1,18 @@
+# トランスパイラがASTとして解析・再利用するためのテンプレート。
+# 直接実行されない。
+def _SWITCH_TO_VERSION_PLACEHOLDER(self, version_num):
+    type(self)._switch_count += 1
+    current_version_num = self._CURRENT_STATE_PLACEHOLDER._version_number
+
+    sync_cache = self._SYNC_CACHE_PLACEHOLDER
+    if sync_cache is not None and sync_cache[0] == version_num and not self._DIRTY_FLAG_PLACEHOLDER:
+        # 切替後に書き込みがなければ、切替前の状態をそのまま戻す
+        synced_state = self.__dict__
+        self.__dict__ = sync_cache[1]
+        self._SYNC_CACHE_PLACEHOLDER = (current_version_num, synced_state)
+    else:
+        self._SYNC_CACHE_PLACEHOLDER = None
+        _SYNC_CALL_PLACEHOLDER_ = None
+
+    self._DIRTY_FLAG_PLACEHOLDER = False
+    self._CURRENT_STATE_PLACEHOLDER = self._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[version_num]
@@ -6,4 +6,4 @@ def _SWITCH_TO_VERSION_PLACEHOLDER(self, version_num):
 
     _SYNC_CALL_PLACEHOLDER_ = None
 
-    self._CURRENT_STATE_PLACEHOLDER = self._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[version_num - 1]
+    self._CURRENT_STATE_PLACEHOLDER = self._VERSION_INSTANCES_SINGLETON_PLACEHOLDER[version_num]
@@ -0,0 +1,145 @@
+import ast
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+from .analysis.constructor_analyzer import ConstructorFactoryPlan
+from .analysis.project_usage import ProjectUsage
+from .analysis.version_inference_analyzer import ClientCallPlan
+from .util import logger
+from .util.constants import CACHE_DIR_ENV_VAR, TRANSFORM_CACHE_FILE_SUFFIX
+
+@dataclass
+class CachedClassGroup:
+    """1つのversionedクラス群の変換結果。"""
+    unified_class: ast.ClassDef
+    constructor_factory: ConstructorFactoryPlan | None = None
+    client_call_plan: ClientCallPlan | None = None
+    # 変換中に出力したレポート・警告（キャッシュから読んだときに出力し直す）
+    messages: list[tuple[str, str]] = field(default_factory=list)
+
+class TransformCache:
+    """
+    versionedクラス群ごとの変換結果を、入力の内容から求めたキーでディレクトリに保存する。
+
+    キーにはクラス群の AST、同期関数、互換性定義、バージョン選択戦略、プロジェクト全体の使用状況、
+    コンパイラ自身のソースを含める。どれかが変われば別のキーになるため、古い結果を消す必要はなく、
+    同じディレクトリを複数のプロジェクト・チェックアウトで共有できる。
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.hit_count = 0
+        self.miss_count = 0
+        self._usage_digest: tuple[ProjectUsage, str] | None = None
+
+    def make_key(
+        self,
+        class_nodes: list[ast.ClassDef],
+        state_sync_components: tuple,
+        incompatibility: dict | None,
+        version_selection_strategy: str,
+        project_usage: ProjectUsage,
+    ) -> str:
+        """クラス群の変換結果を決める入力からキャッシュのキーを求める。"""
+        hasher = hashlib.sha256()
+        hasher.update(get_compiler_digest().encode("utf-8"))
+        hasher.update(version_selection_strategy.encode("utf-8"))
+        hasher.update(self._get_usage_digest(project_usage).encode("utf-8"))
+        for class_node in class_nodes:
+            hasher.update(ast.dump(class_node).encode("utf-8"))
+        sync_imports, sync_functions, sync_options = state_sync_components
+        for node in [*sync_imports, *sync_functions]:
+            hasher.update(ast.dump(node).encode("utf-8"))
+        hasher.update(repr(_canonicalize(sync_options)).encode("utf-8"))
+        hasher.update(repr(_canonicalize(incompatibility)).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def load(self, key: str) -> CachedClassGroup | None:
+        """キーに対応する変換結果を返す（ない場合・読めない場合は None）。"""
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            logger.debug_log(lambda: f"Discarding unreadable cache entry {entry_path}: {e}")
+            entry_path.unlink(missing_ok=True)
+            entry = None
+        if isinstance(entry, CachedClassGroup):
+            self.hit_count += 1
+            return entry
+        self.miss_count += 1
+        return None
+
+    def store(self, key: str, entry: CachedClassGroup) -> None:
+        """変換結果を保存する。同じキーへの同時書き込みがあっても壊れたファイルは残らない。"""
+        entry_path = self._get_entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, entry_path)
+            except BaseException:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+        except Exception as e:
+            # キャッシュに書けなくても変換結果は使える
+            logger.debug_log(lambda: f"Failed to store cache entry {entry_path}: {e}")
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key[2:]}{TRANSFORM_CACHE_FILE_SUFFIX}"
+
+    def _get_usage_digest(self, project_usage: ProjectUsage) -> str:
+        # 使用状況はプロジェクトで1つのため、同じオブジェクトに対しては1回だけ求める
+        if self._usage_digest is None or self._usage_digest[0] is not project_usage:
+            values = [
+                (f.name, _canonicalize(getattr(project_usage, f.name)))
+                for f in fields(project_usage)
+                # 呼び出し列はクライアントのループの AST を指すため、static 戦略ではキャッシュを使わない
+                if f.name != "call_sequences"
+            ]
+            self._usage_digest = (project_usage, hashlib.sha256(repr(values).encode("utf-8")).hexdigest())
+        return self._usage_digest[1]
+
+def resolve_cache_dir(cache_dir: Path | None, config_cache_dir: Path | None = None) -> Path | None:
+    """
+    変換キャッシュのディレクトリを、引数、環境変数 MVO_CACHE_DIR、設定ファイルの cache_dir の順に決める。
+    どれもなければ None（キャッシュを使わない）。
+    """
+    if cache_dir is not None:
+        return cache_dir.expanduser()
+    env_cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if env_cache_dir:
+        return Path(env_cache_dir).expanduser()
+    return config_cache_dir
+
+@functools.cache
+def get_compiler_digest() -> str:
+    """コンパイラのソースと Python のバージョンから求めたダイジェスト。コンパイラを更新するとキーが変わる。"""
+    package_dir = Path(__file__).parent
+    hasher = hashlib.sha256(sys.version.encode("utf-8"))
+    for source_path in sorted(package_dir.rglob("*.py")):
+        hasher.update(source_path.relative_to(package_dir).as_posix().encode("utf-8"))
+        hasher.update(source_path.read_bytes())
+    return hasher.hexdigest()
+
+
+# --- ヘルパー関数 ---
+def _canonicalize(value):
+    # 集合・辞書の順序に左右されない repr() のための変換
+    if isinstance(value, dict):
+        return sorted((repr(_canonicalize(k)), _canonicalize(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return sorted(repr(_canonicalize(item)) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(item) for item in value]
+    return value
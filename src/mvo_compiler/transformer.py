@@ -1,33 +1,73 @@
 import ast
 
 from .util import ast_util
+from .analysis.constructor_analyzer import ConstructorFactoryPlan
+from .analysis.project_usage import ProjectUsage, collect_project_usage
+from .analysis.static_switch_analyzer import StaticSwitchPlan
+from .analysis.version_inference_analyzer import ClientCallPlan
 from .symbol_table.symbol_table import SymbolTable
+from .builder.migration_generator import build_migration_imports
 from .builder.unified_class_builder import build_unified_class
 from .symbol_table.symbol_table_builder import SymbolTableBuilder
+from .transform_cache import CachedClassGroup, TransformCache
 from .util import logger
-from .util.constants import DEFAULT_VERSION_SELECTION_STRATEGY
+from .util.constants import DEFAULT_VERSION_SELECTION_STRATEGY, VERSION_SELECTION_STATIC
 
 def transform_module(
     source_ast: ast.AST,
     sync_functions_dict: dict,
     incompatibilities: dict | None,
     version_selection_strategy: str = DEFAULT_VERSION_SELECTION_STRATEGY,
+    project_usage: ProjectUsage | None = None,
+    constructor_factories: dict[str, ConstructorFactoryPlan] | None = None,
+    static_switch_plans: dict[str, StaticSwitchPlan] | None = None,
+    client_call_plans: dict[str, ClientCallPlan] | None = None,
+    symbol_table: SymbolTable | None = None,
+    transform_cache: TransformCache | None = None,
 ) -> ast.AST:
-    """ソースASTを変換して生成ASTを返す（versionedクラスのみ対象）。"""
-    symbol_table = _build_symbol_table(source_ast)
+    """
+    ソースASTを変換して生成ASTを返す（versionedクラスのみ対象）。
+
+    project_usage にはプロジェクト全体の使用状況を渡す。
+    省略時はこのモジュールのみから求め、全体解析が必要な最適化は行わない。
+    constructor_factories を渡すと、生成したファクトリをクラス名で登録する。
+    static_switch_plans を渡すと、static 戦略で決めたループ入口の切替先をクラス名で登録する。
+    client_call_plans を渡すと、クライアントの呼び出しの直接化に使う情報をクラス名で登録する。
+    symbol_table にはプロジェクトのシンボルインデックスで構築済みのこのモジュールの表を渡す。
+    省略時はこのモジュールから構築する。
+    transform_cache を渡すと、入力が前回と同じクラス群は生成し直さずキャッシュの結果を使う。
+    """
+    if symbol_table is None:
+        symbol_table = _build_symbol_table(source_ast)
     versioned_classes_by_name = _group_versioned_classes(source_ast)
     if not versioned_classes_by_name:
         return source_ast
+    if project_usage is None:
+        project_usage = collect_project_usage([source_ast], sync_functions_dict, is_whole_program=False)
 
-    unified_classes, all_sync_imports = _build_unified_classes(
+    unified_classes, all_sync_imports, runtime_imports = _build_unified_classes(
         versioned_classes_by_name,
         sync_functions_dict,
         incompatibilities,
         symbol_table,
         version_selection_strategy,
+        project_usage,
+        constructor_factories,
+        static_switch_plans,
+        client_call_plans,
+        transform_cache,
     )
 
-    return _rebuild_module_ast(source_ast, unified_classes, all_sync_imports)
+    # `from m import Base__1__` で取り込んだ親は、変換後の m では統合クラス Base として定義される
+    imported_base_names = {
+        parent_base_name
+        for class_name in versioned_classes_by_name
+        for parent_base_name, (_, reference) in symbol_table.lookup_class(class_name).imported_bases.items()
+        if reference == parent_base_name
+    }
+    return _rebuild_module_ast(
+        source_ast, unified_classes, all_sync_imports, runtime_imports, imported_base_names
+    )
 
 def contains_versioned_classes(source_ast: ast.AST) -> bool:
     return bool(_group_versioned_classes(source_ast))
@@ -36,7 +76,7 @@ def _build_symbol_table(source_ast: ast.AST) -> SymbolTable:
     symbol_table = SymbolTable()
     analysis_visitor = SymbolTableBuilder(symbol_table)
     analysis_visitor.visit(source_ast)
-    logger.no_header_log(symbol_table.get_representation())
+    logger.no_header_log(symbol_table.get_representation)
     return symbol_table
 
 def _group_versioned_classes(source_ast: ast.AST) -> dict[str, list[ast.ClassDef]]:
@@ -54,37 +94,123 @@ def _build_unified_classes(
     incompatibilities: dict | None,
     symbol_table: SymbolTable,
     version_selection_strategy: str,
-) -> tuple[dict[str, ast.ClassDef], list[ast.AST]]:
+    project_usage: ProjectUsage,
+    constructor_factories: dict[str, ConstructorFactoryPlan] | None = None,
+    static_switch_plans: dict[str, StaticSwitchPlan] | None = None,
+    client_call_plans: dict[str, ClientCallPlan] | None = None,
+    transform_cache: TransformCache | None = None,
+) -> tuple[dict[str, ast.ClassDef], list[ast.AST], list[ast.AST]]:
     unified_classes: dict[str, ast.ClassDef] = {}
     all_sync_imports: list[ast.AST] = []
+    # 生成したクラスが実行時に必要とする import
+    runtime_imports: list[ast.AST] = []
 
     for class_name in versioned_classes_by_name:
-        state_sync_components = sync_functions_dict.get(class_name, ([], []))
+        state_sync_components = sync_functions_dict.get(class_name, ([], [], {}))
         incompatibility = incompatibilities.get(class_name) if incompatibilities else None
 
-        sync_imports, _ = state_sync_components
+        sync_imports = state_sync_components[0]
         all_sync_imports.extend(sync_imports)
 
-        unified_class_ast = build_unified_class(
-            class_name,
-            state_sync_components,
-            symbol_table,
-            incompatibility,
-            version_selection_strategy,
-        )
+        with logger.timed_event(
+            "class_built", class_name=class_name, versions=len(versioned_classes_by_name[class_name])
+        ) as event_fields:
+            # static 戦略の切替計画はクライアントのループの AST を指すため、キャッシュしない
+            if transform_cache is not None and version_selection_strategy != VERSION_SELECTION_STATIC:
+                hit_count = transform_cache.hit_count
+                unified_class_ast = _build_unified_class_cached(
+                    transform_cache,
+                    class_name,
+                    versioned_classes_by_name[class_name],
+                    state_sync_components,
+                    symbol_table,
+                    incompatibility,
+                    version_selection_strategy,
+                    project_usage,
+                    constructor_factories,
+                    client_call_plans,
+                )
+                event_fields["cached"] = transform_cache.hit_count > hit_count
+            else:
+                unified_class_ast = build_unified_class(
+                    class_name,
+                    state_sync_components,
+                    symbol_table,
+                    incompatibility,
+                    version_selection_strategy,
+                    project_usage,
+                    constructor_factories,
+                    static_switch_plans,
+                    client_call_plans,
+                )
         unified_classes[class_name] = unified_class_ast
+        runtime_imports.extend(build_migration_imports(unified_class_ast))
+
+    return unified_classes, all_sync_imports, runtime_imports
+
+def _build_unified_class_cached(
+    transform_cache: TransformCache,
+    class_name: str,
+    class_nodes: list[ast.ClassDef],
+    state_sync_components: tuple,
+    symbol_table: SymbolTable,
+    incompatibility: dict | None,
+    version_selection_strategy: str,
+    project_usage: ProjectUsage,
+    constructor_factories: dict[str, ConstructorFactoryPlan] | None,
+    client_call_plans: dict[str, ClientCallPlan] | None,
+) -> ast.ClassDef:
+    # 生成中に元のクラスの AST が書き換わりうるため、キーは生成前に求める
+    cache_key = transform_cache.make_key(
+        class_nodes, state_sync_components, incompatibility, version_selection_strategy, project_usage
+    )
+    entry = transform_cache.load(cache_key)
+    if entry is not None:
+        logger.debug_log(lambda: f"Reusing cached unified class for: {class_name}")
+        logger.replay(entry.messages)
+    else:
+        # 呼び出し側が登録先を渡さない場合も、次回のためにファクトリと直接化の情報は残す
+        group_factories: dict[str, ConstructorFactoryPlan] = {}
+        group_client_plans: dict[str, ClientCallPlan] = {}
+        with logger.capture() as messages:
+            unified_class_ast = build_unified_class(
+                class_name,
+                state_sync_components,
+                symbol_table,
+                incompatibility,
+                version_selection_strategy,
+                project_usage,
+                group_factories,
+                None,
+                group_client_plans,
+            )
+        entry = CachedClassGroup(
+            unified_class_ast,
+            group_factories.get(class_name),
+            group_client_plans.get(class_name),
+            messages,
+        )
+        # エラーを出した結果は次回も生成し直してエラーを出す
+        if all(level != "error" for level, _ in messages):
+            transform_cache.store(cache_key, entry)
 
-    return unified_classes, all_sync_imports
+    if entry.constructor_factory is not None and constructor_factories is not None:
+        constructor_factories[class_name] = entry.constructor_factory
+    if entry.client_call_plan is not None and client_call_plans is not None:
+        client_call_plans[class_name] = entry.client_call_plan
+    return entry.unified_class
 
 def _rebuild_module_ast(
     source_ast: ast.AST,
     unified_classes: dict[str, ast.ClassDef],
     sync_imports: list[ast.AST],
+    runtime_imports: list[ast.AST] | None = None,
+    imported_base_names: set[str] | None = None,
 ) -> ast.AST:
     new_body: list[ast.AST] = []
     processed_class_names = set()
 
-    final_required_imports = _merge_imports([], sync_imports)
+    final_required_imports = _merge_imports(runtime_imports or [], sync_imports)
     new_body.extend(final_required_imports)
 
     for node in source_ast.body:
@@ -96,12 +222,29 @@ def _rebuild_module_ast(
                     processed_class_names.add(class_name)
             else:
                 new_body.append(node)
+        elif isinstance(node, ast.ImportFrom) and imported_base_names:
+            new_body.append(_rewrite_versioned_base_imports(node, imported_base_names))
         else:
             new_body.append(node)
     source_ast.body = new_body
 
     return source_ast
 
+def _rewrite_versioned_base_imports(node: ast.ImportFrom, imported_base_names: set[str]) -> ast.ImportFrom:
+    """`from m import Base__1__, Base__2__` を、親の統合クラスを取り込む `from m import Base` に書き換える。"""
+    names = []
+    seen = set()
+    for alias in node.names:
+        parent_base_name, _ = ast_util.get_class_version_info_from_name(alias.name)
+        if parent_base_name in imported_base_names:
+            alias = ast.alias(name=parent_base_name)
+        key = (alias.name, alias.asname)
+        if key not in seen:
+            seen.add(key)
+            names.append(alias)
+    node.names = names
+    return node
+
 def _merge_imports(infra_imports: list[ast.AST], sync_imports: list[ast.AST]) -> list[ast.AST]:
     merged = {}
     for imp in infra_imports + sync_imports:
@@ -14,12 +14,78 @@ def get_version_instances_singleton_name(class_name: str) -> str:
     """
     return f"_{class_name.upper()}_VERSION_INSTANCES_SINGLETON"
 
+def get_dispatch_cache_name(class_name: str) -> str:
+    """
+    呼び出し形ごとのオーバーロード解決キャッシュ名を生成する。
+    """
+    return f"_{class_name.upper()}_DISPATCH_CACHE"
+
+def get_miss_target_table_name(class_name: str) -> str:
+    """
+    ミス時の切替先表（メソッド名 -> 現在のバージョン -> 切替先）の名前を生成する。
+    """
+    return f"_{class_name.upper()}_MISS_TARGETS"
+
+def get_bulk_versions_name(class_name: str) -> str:
+    """
+    build_many()/build_columns() で生成できるバージョンの集合の名前を生成する。
+    """
+    return f"_{class_name.upper()}_BULK_VERSIONS"
+
+def get_column_storage_name(class_name: str) -> str:
+    """
+    build_columns() で列名から格納先の属性名を引く表の名前を生成する。
+    """
+    return f"_{class_name.upper()}_COLUMN_STORAGE"
+
 def get_current_state_field_name(class_name: str) -> str:
     """
     現在状態フィールド名を生成する。
     """
     return f"_{class_name.lower()}_current_state"
 
+def get_sync_cache_field_name(class_name: str) -> str:
+    """
+    切り戻し用に同期前の状態を保持するフィールド名を生成する。
+    """
+    return f"_{class_name.lower()}_sync_cache"
+
+def get_dirty_flag_field_name(class_name: str) -> str:
+    """
+    直前の切替以降の書き込みの有無を示すフィールド名を生成する。
+    """
+    return f"_{class_name.lower()}_dirty"
+
+def get_adaptive_miss_method_name(class_name: str) -> str:
+    """
+    adaptive 戦略でミス時の切替先を決めるメソッド名を生成する。
+    """
+    return f"_{class_name.lower()}_adaptive_miss"
+
+def get_adaptive_state_field_name(class_name: str) -> str:
+    """
+    adaptive 戦略でインスタンスごとのミスの記録を持つフィールド名を生成する。
+    """
+    return f"_{class_name.lower()}_adaptive_state"
+
+def get_pin_depth_field_name(class_name: str) -> str:
+    """
+    pinned() によるピン留めの入れ子の深さを示すフィールド名を生成する。
+    """
+    return f"_{class_name.lower()}_pin_depth"
+
+def get_pinned_view_class_name(class_name: str) -> str:
+    """
+    pinned() が返すビュークラスの名前を生成する。
+    """
+    return f"_{class_name.upper()}_PINNED_VIEW"
+
+def get_epoch_field_name(class_name: str) -> str:
+    """
+    migrate_all() の遅延移行で、オブジェクトが最後に確認したエポックを示すフィールド名を生成する。
+    """
+    return f"_{class_name.lower()}_epoch"
+
 def get_switch_to_version_method_name(class_name: str) -> str:
     """
     バージョン切替メソッド名を生成する。
@@ -73,6 +139,37 @@ def get_class_version_info_from_name(class_name: str) -> Tuple[Optional[str], Op
         return base_name, version_num_str
     return None, None
 
+def resolve_import_module(node: ast.ImportFrom, module_name: str | None, is_package: bool) -> str | None:
+    """
+    `from ... import` の取り込み元モジュール名を絶対名で返す。
+    相対 import で module_name が分からない場合や、パッケージの外を指す場合は None。
+    """
+    if node.level == 0:
+        return node.module
+    if module_name is None:
+        return None
+    package_parts = module_name.split(".") if is_package else module_name.split(".")[:-1]
+    if node.level - 1 > len(package_parts):
+        return None
+    base_parts = package_parts[:len(package_parts) - (node.level - 1)]
+    if node.module:
+        base_parts = [*base_parts, node.module]
+    return ".".join(base_parts) or None
+
+def create_dotted_name(dotted_name: str) -> ast.expr:
+    """`a.b.C` のような名前を参照する式を生成する。"""
+    parts = dotted_name.split(".")
+    expr: ast.expr = ast.Name(id=parts[0], ctx=ast.Load())
+    for part in parts[1:]:
+        expr = ast.Attribute(value=expr, attr=part, ctx=ast.Load())
+    return expr
+
+def get_factory_method_name(version_num_str: str) -> str:
+    """
+    バージョンごとの生成用ファクトリメソッド名を生成する。
+    """
+    return f"_new_v{version_num_str}"
+
 def get_impl_class_name(version_num_str: str) -> str:
     """
     実装クラス名を生成する。
@@ -1,142 +1,139 @@
 import ast
+import re
 
 from ..symbol_table.method_info import MethodInfo, ParameterInfo
 from ..util.ast_util import *
-from ..util.constants import WRAPPER_SELF_ARG_NAME
+from ..util.constants import DISPATCH_CACHE_MAX_SIZE
+from ..util.template_util import get_template_string
 
-def _create_slow_path_dispatcher(class_name: str, method_name: str, overloads: list[MethodInfo]) -> list[ast.AST]:
-    """
-    スローパス用の静的 if-elif 連鎖を生成する。
+_SHAPE_DISPATCH_TEMPLATE = "shape_dispatch_template.py"
+_SIGNATURE_CHECK_PLACEHOLDER = "_SIGNATURE_CHECK_PLACEHOLDER_"
+
+def _create_shape_dispatcher(class_name: str, method_name: str, overloads: list[MethodInfo]) -> list[ast.AST]:
     """
+    実行時引数 (*args, **kwargs) からバージョンを選んで呼び出す文の列を生成する。
 
-    sorted_overloads = sorted(overloads, key=lambda m: int(m.version))
-    
-    top_if_stmt = None
-    current_if_stmt = None
+    呼び出し形（位置引数の数とキーワード引数名）ごとに受け付けるバージョンの組をクラス単位で
+    キャッシュし、同じ形の呼び出しでは条件式を再評価しない。現在のバージョンが受け付ければ
+    そのまま呼び出し、そうでなければ受け付ける最小のバージョンへ切り替える。
+    """
+    template_string = get_template_string(_SHAPE_DISPATCH_TEMPLATE)
+    if not template_string:
+        return []
 
-    for method_info in sorted_overloads:
-        # a. if 条件を作成
-        condition = _create_signature_check_condition(method_info.parameters)
+    replacements = {
+        r'\[METHOD_NAME\]': repr(method_name),
+        r'\[METHOD\]': method_name,
+        r'\[CACHE_SIZE\]': str(DISPATCH_CACHE_MAX_SIZE),
+        r'\[NO_MATCH_MESSAGE\]': repr(f"No version of '{method_name}' matches the provided arguments."),
+        r'_DISPATCH_CACHE_PLACEHOLDER': get_dispatch_cache_name(class_name),
+        r'_CURRENT_STATE_PLACEHOLDER': get_current_state_field_name(class_name),
+        r'_SWITCH_TO_VERSION_PLACEHOLDER': get_switch_to_version_method_name(class_name),
+    }
+    for pattern, value in replacements.items():
+        template_string = re.sub(pattern, value, template_string)
+    dispatch_func = ast.parse(template_string).body[0]
 
-        # b. if ブロック本体を生成
-        if_body = [
-            # self._xxx_switch_to_version(...)
-            ast.Expr(value=ast.Call(
-                func=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=get_switch_to_version_method_name(class_name), ctx=ast.Load()),
+    # シグネチャ判定の if 文で置換: if <条件>: matching_versions.append(<version>)
+    signature_checks = []
+    for method_info in sorted(overloads, key=lambda m: int(m.version)):
+        signature_checks.append(ast.If(
+            test=_create_signature_check_condition(method_info.parameters),
+            body=[ast.Expr(value=ast.Call(
+                func=ast.Attribute(value=ast.Name(id='matching_versions', ctx=ast.Load()), attr='append', ctx=ast.Load()),
                 args=[ast.Constant(value=int(method_info.version))], keywords=[]
-            )),
-            # return self._xxx_current_state.method_name(...)
-            ast.Return(value=ast.Call(
-                func=ast.Attribute(
-                    value=ast.Attribute(value=ast.Name(id='self', ctx=ast.Load()), attr=get_current_state_field_name(class_name), ctx=ast.Load()),
-                    attr=method_name, ctx=ast.Load()
-                ),
-                args=[ast.Starred(value=ast.Name(id='args', ctx=ast.Load()), ctx=ast.Load())],
-                keywords=[
-                    ast.keyword(arg=WRAPPER_SELF_ARG_NAME, value=ast.Name(id='self', ctx=ast.Load())),
-                    ast.keyword(arg=None, value=ast.Name(id='kwargs', ctx=ast.Load()))
-                ]
-            ))
-        ]
-        
-        # c. if-else 連鎖を構成
-        if_stmt = ast.If(test=condition, body=if_body, orelse=[])
-        if top_if_stmt is None:
-            top_if_stmt = if_stmt
-            current_if_stmt = top_if_stmt
-        else:
-            current_if_stmt.orelse = [if_stmt]
-            current_if_stmt = if_stmt
-    
-    # 最後の else: TypeError を送出
-    if current_if_stmt:
-        current_if_stmt.orelse = [ast.Raise(exc=ast.Call(
-            func=ast.Name(id='TypeError', ctx=ast.Load()),
-            args=[ast.Constant(value=f"No version of '{method_name}' matches the provided arguments.")],
-            keywords=[]
-        ), cause=None)]
-
-    return [top_if_stmt] if top_if_stmt else []
+            ))],
+            orelse=[]
+        ))
+    _SignatureCheckInserter(signature_checks).visit(dispatch_func)
+
+    return dispatch_func.body
 
 def _create_signature_check_condition(params: list[ParameterInfo]) -> ast.AST:
     """
     実行時引数 (*args, **kwargs) がメソッドシグネチャに合致するかを
-    静的に判定するための複合ブール式を生成する。
+    判定する複合ブール式を生成する（MethodInfo.accepts と同じ規則）。
+    判定は呼び出し形のみに依存するため、結果はキャッシュできる。
     """
-    # --- 前提 ---
-    # 対象のメソッドシグネチャに
-    # 位置専用引数 (/), キーワード専用引数 (*),
-    # 可変長引数 (*args, **kwargs) が含まれない前提。
-    
-    param_names = [p.name for p in params]
-    num_params = len(param_names)
-    required_param_indices = [i for i, p in enumerate(params) if not p.has_default_value]
+    positional = [p for p in params if p.kind in ('POSITIONAL_ONLY', 'POSITIONAL_OR_KEYWORD')]
+    keyword_capable = [p.name for p in params if p.kind in ('POSITIONAL_OR_KEYWORD', 'KEYWORD_ONLY')]
+    has_var_positional = any(p.kind == 'VAR_POSITIONAL' for p in params)
+    has_var_keyword = any(p.kind == 'VAR_KEYWORD' for p in params)
 
     conditions = []
 
-    # 条件1: 位置引数の数が総引数数を超えない
+    # 条件1: 位置引数の数が位置パラメータ数を超えない（*args がない場合）
     # 例: len(args) <= 3
-    conditions.append(ast.Compare(
-        left=ast.Call(func=ast.Name(id='len', ctx=ast.Load()), args=[ast.Name(id='args', ctx=ast.Load())], keywords=[]),
-        ops=[ast.LtE()],
-        comparators=[ast.Constant(value=num_params)]
-    ))
+    if not has_var_positional:
+        conditions.append(ast.Compare(
+            left=_len_of('args'),
+            ops=[ast.LtE()],
+            comparators=[ast.Constant(value=len(positional))]
+        ))
 
-    # 条件2: すべてのキーワード引数が有効な名前である
+    # 条件2: すべてのキーワード引数が有効な名前である（**kwargs がない場合）
     # 例: kwargs.keys() <= {'param1', 'param2', ...}
-    conditions.append(ast.Compare(
-        left=ast.Call(func=ast.Attribute(value=ast.Name(id='kwargs', ctx=ast.Load()), attr='keys', ctx=ast.Load()), args=[], keywords=[]),
-        ops=[ast.LtE()],
-        comparators=[ast.Set(elts=[ast.Constant(value=name) for name in param_names])]
-    ))
+    if not has_var_keyword:
+        conditions.append(ast.Compare(
+            left=ast.Call(func=ast.Attribute(value=ast.Name(id='kwargs', ctx=ast.Load()), attr='keys', ctx=ast.Load()), args=[], keywords=[]),
+            ops=[ast.LtE()],
+            comparators=[ast.Set(elts=[ast.Constant(value=name) for name in keyword_capable])
+                         if keyword_capable else ast.Call(func=ast.Name(id='set', ctx=ast.Load()), args=[], keywords=[])]
+        ))
 
     # 条件3: 位置引数とキーワード引数で同じパラメータを二重に束縛しない
     # 例: not (len(args) > 0 and 'param1' in kwargs)
-    for i, name in enumerate(param_names):
+    for i, param in enumerate(positional):
+        if param.kind != 'POSITIONAL_OR_KEYWORD':
+            continue
         conditions.append(ast.UnaryOp(
             op=ast.Not(),
             operand=ast.BoolOp(op=ast.And(), values=[
-                ast.Compare(
-                    left=ast.Call(func=ast.Name(id='len', ctx=ast.Load()), args=[ast.Name(id='args', ctx=ast.Load())], keywords=[]),
-                    ops=[ast.Gt()],
-                    comparators=[ast.Constant(value=i)]
-                ),
-                ast.Compare(
-                    left=ast.Constant(value=name),
-                    ops=[ast.In()],
-                    comparators=[ast.Name(id='kwargs', ctx=ast.Load())]
-                )
+                _len_of_args_greater_than(i),
+                _name_in_kwargs(param.name),
             ])
         ))
 
     # 条件4: 必須パラメータがすべて満たされる
     # 例: (len(args) > 0 or 'param1' in kwargs)
-    for i in required_param_indices:
-        name = param_names[i]
-        conditions.append(ast.BoolOp(op=ast.Or(), values=[
-            ast.Compare(
-                left=ast.Call(func=ast.Name(id='len', ctx=ast.Load()), args=[ast.Name(id='args', ctx=ast.Load())], keywords=[]),
-                ops=[ast.Gt()],
-                comparators=[ast.Constant(value=i)]
-            ),
-            ast.Compare(
-                left=ast.Constant(value=name),
-                ops=[ast.In()],
-                comparators=[ast.Name(id='kwargs', ctx=ast.Load())]
-            )
-        ]))
-
-    # 条件5（冗長だが安全）: 位置引数+キーワード引数の合計が総引数数を超えない
-    # 例: len(args) + len(kwargs) <= 3
-    conditions.append(ast.Compare(
-        left=ast.BinOp(
-            left=ast.Call(func=ast.Name(id='len', ctx=ast.Load()), args=[ast.Name(id='args', ctx=ast.Load())], keywords=[]),
-            op=ast.Add(),
-            right=ast.Call(func=ast.Name(id='len', ctx=ast.Load()), args=[ast.Name(id='kwargs', ctx=ast.Load())], keywords=[])
-        ),
-        ops=[ast.LtE()],
-        comparators=[ast.Constant(value=num_params)]
-    ))
+    for i, param in enumerate(positional):
+        if param.has_default_value:
+            continue
+        if param.kind == 'POSITIONAL_ONLY':
+            conditions.append(_len_of_args_greater_than(i))
+        else:
+            conditions.append(ast.BoolOp(op=ast.Or(), values=[
+                _len_of_args_greater_than(i),
+                _name_in_kwargs(param.name),
+            ]))
+    for param in params:
+        if param.kind == 'KEYWORD_ONLY' and not param.has_default_value:
+            conditions.append(_name_in_kwargs(param.name))
 
+    if not conditions:
+        return ast.Constant(value=True)
+    if len(conditions) == 1:
+        return conditions[0]
     # 全条件を AND で結合
     return ast.BoolOp(op=ast.And(), values=conditions)
+
+
+# --- ヘルパー ---
+def _len_of(name: str) -> ast.Call:
+    return ast.Call(func=ast.Name(id='len', ctx=ast.Load()), args=[ast.Name(id=name, ctx=ast.Load())], keywords=[])
+
+def _len_of_args_greater_than(index: int) -> ast.Compare:
+    return ast.Compare(left=_len_of('args'), ops=[ast.Gt()], comparators=[ast.Constant(value=index)])
+
+def _name_in_kwargs(name: str) -> ast.Compare:
+    return ast.Compare(left=ast.Constant(value=name), ops=[ast.In()], comparators=[ast.Name(id='kwargs', ctx=ast.Load())])
+
+class _SignatureCheckInserter(ast.NodeTransformer):
+    """テンプレート内のシグネチャ判定プレースホルダを if 文の列で置換する。"""
+    def __init__(self, signature_checks: list[ast.If]):
+        self.signature_checks = signature_checks
+
+    def visit_Assign(self, node):
+        if isinstance(node.targets[0], ast.Name) and node.targets[0].id == _SIGNATURE_CHECK_PLACEHOLDER:
+            return self.signature_checks
+        return node
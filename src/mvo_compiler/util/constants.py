@@ -1,18 +1,84 @@
 DEFAULT_VERSION_SELECTION_STRATEGY = "continuity"
 VERSION_SELECTION_CONTINUITY = "continuity"
 VERSION_SELECTION_LATEST = "latest"
-VERSION_SELECTION_STRATEGIES = (VERSION_SELECTION_CONTINUITY, VERSION_SELECTION_LATEST)
+VERSION_SELECTION_ADAPTIVE = "adaptive"
+VERSION_SELECTION_STATIC = "static"
+VERSION_SELECTION_STRATEGIES = (
+    VERSION_SELECTION_CONTINUITY,
+    VERSION_SELECTION_LATEST,
+    VERSION_SELECTION_ADAPTIVE,
+    VERSION_SELECTION_STATIC,
+)
 
 INITIALIZE_METHOD_NAME = "__initialize__"
 WRAPPER_SELF_ARG_NAME = "_wrapper_self"
 SWITCH_COUNT_ATTR_NAME = "_switch_count"
+# バージョンを固定して直接呼び出すビューを返すメソッド名
+PINNED_METHOD_NAME = "pinned"
+# 指定バージョンのオブジェクトをまとめて生成するメソッド名
+BUILD_MANY_METHOD_NAME = "build_many"
+BUILD_COLUMNS_METHOD_NAME = "build_columns"
+# 統合クラスが生成する pickle/copy のプロトコルメソッド名
+COPY_PROTOCOL_METHOD_NAMES = (
+    "__reduce__", "__reduce_ex__", "__getstate__", "__setstate__", "__getnewargs__",
+    "__getnewargs_ex__", "__copy__", "__deepcopy__",
+)
+# 生存インスタンスをまとめて別バージョンへ移行するメソッド名
+MIGRATE_ALL_METHOD_NAME = "migrate_all"
+# 呼び出し形ごとのオーバーロード解決キャッシュの上限（超えたら全消去）
+DISPATCH_CACHE_MAX_SIZE = 256
+
+# 同期モジュールの設定名
+SYNC_OPTION_DIRTY_TRACKING = "DIRTY_TRACKING"
+SYNC_OPTION_SYNC_COSTS = "SYNC_COSTS"
+SYNC_OPTION_ADAPTIVE_THRESHOLD = "ADAPTIVE_THRESHOLD"
+
+# adaptive 戦略で往復と判定するまでの連続した逆向きのミス回数
+ADAPTIVE_PINGPONG_THRESHOLD = 8
 
 TEMPLATE_CURRENT_STATE_ATTR = "_CURRENT_STATE_PLACEHOLDER"
 TEMPLATE_VERSION_SINGLETON_ATTR = "_VERSION_INSTANCES_SINGLETON_PLACEHOLDER"
 TEMPLATE_SWITCH_TO_VERSION_FUNC = "_SWITCH_TO_VERSION_PLACEHOLDER"
 TEMPLATE_SYNC_CALL_PLACEHOLDER = "_SYNC_CALL_PLACEHOLDER_"
+TEMPLATE_INITIAL_VERSION_PLACEHOLDER = "_INITIAL_VERSION_PLACEHOLDER"
+TEMPLATE_SYNC_CACHE_ATTR = "_SYNC_CACHE_PLACEHOLDER"
+TEMPLATE_DIRTY_FLAG_ATTR = "_DIRTY_FLAG_PLACEHOLDER"
 
 # Project structure keys
 PROJECT_SYNC_MODULES_KEY = "sync_modules"
 PROJECT_INCOMPATIBILITIES_KEY = "incompatibilities"
 PROJECT_NORMAL_FILES_KEY = "normal_files"
+PROJECT_SYMBOL_INDEX_KEY = "symbol_index"
+PROJECT_VERSIONED_FILES_KEY = "versioned_files"
+PROJECT_CONFIG_KEY = "config"
+# Project scanning
+IGNORE_FILE_NAME = ".mvoignore"
+PYPROJECT_FILE_NAME = "pyproject.toml"
+PYPROJECT_TOOL_SECTION = "tool.mvo"
+# pyproject.toml より優先する設定ファイル（トップレベルに [tool.mvo] と同じ項目を書く）
+MVO_CONFIG_FILE_NAME = "mvo.toml"
+TOOL_OPTION_IGNORE = "ignore"
+TOOL_OPTION_INCOMPATIBILITIES = "incompatibilities"
+TOOL_OPTION_SYNC = "sync"
+TOOL_OPTION_STRATEGY = "strategy"
+TOOL_OPTION_CACHE_DIR = "cache_dir"
+# versionedクラスの本体に書く互換性定義（`__incompatible__ = ["x", "y"]`）
+INCOMPATIBILITY_MARKER_NAME = "__incompatible__"
+# 設定がなくても走査しないディレクトリ名
+DEFAULT_IGNORED_DIR_NAMES = frozenset({
+    ".git", ".hg", ".svn", ".venv", "venv", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox", "node_modules",
+})
+# Watch mode
+# 入力ディレクトリの変更を調べる間隔（秒）
+WATCH_POLL_INTERVAL = 0.5
+WATCH_COMMAND_STATUS = "status"
+WATCH_COMMAND_BUILD = "build"
+WATCH_COMMAND_RUN = "run"
+WATCH_COMMAND_STOP = "stop"
+# Transform cache
+# 変換キャッシュのディレクトリを指定する環境変数（設定ファイルの cache_dir より優先）
+CACHE_DIR_ENV_VAR = "MVO_CACHE_DIR"
+TRANSFORM_CACHE_FILE_SUFFIX = ".pickle"
+# 書き出し待ちにできる変換済みモジュールの数
+OUTPUT_WRITE_QUEUE_SIZE = 16
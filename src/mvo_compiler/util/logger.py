@@ -1,32 +1,177 @@
 # トランスパイラ用の簡易ロガー。
+#
+# メッセージには文字列のほか、文字列を返す関数を渡せる。関数はそのレベルの出力が有効な場合にのみ呼ぶため、
+# `debug_log(lambda: f"...")` と書けばデバッグ出力が無効なときに文字列を組み立てない。
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, TextIO
 
-# デバッグ出力を有効化するフラグ。
-# コマンドライン引数で有効化できる。
-DEBUG_MODE = False
+Message = str | Callable[[], str]
 
-def debug_log(message: str):
+# --- ログレベル ---
+DEBUG = 10
+REPORT = 20
+INFO = 30
+WARNING = 40
+ERROR = 50
+
+_LEVEL_NAMES = {DEBUG: "debug", REPORT: "report", INFO: "info", WARNING: "warning", ERROR: "error"}
+
+# このレベル以上のメッセージを出力する。
+# コマンドライン引数（--debug / --report）で下げられる。
+LEVEL = INFO
+
+# capture() 中に出力したレポート・警告・エラーの記録（記録中でなければ None）
+_captured: list[tuple[str, str]] | None = None
+
+# JSON Lines でイベントを書き出す先（open_event_sink() で開く）
+_event_sink: TextIO | None = None
+_event_sink_lock = threading.Lock()
+
+def set_level(level: int):
+    """出力するメッセージの最低レベルを設定する。"""
+    global LEVEL
+    LEVEL = level
+
+def is_enabled(level: int) -> bool:
+    """指定レベルのメッセージが出力されるかを返す。"""
+    return level >= LEVEL
+
+def debug_log(message: Message):
     """デバッグメッセージを出力する。"""
-    if DEBUG_MODE:
-        print(f"[LOG]     {message}")
+    if DEBUG >= LEVEL:
+        _emit(DEBUG, "[LOG]     ", _resolve(message))
 
-def success_log(message: str):
+def success_log(message: Message):
     """成功メッセージを出力する。"""
-    if DEBUG_MODE:
-        print(f"[SUCCESS] {message}")
+    if DEBUG >= LEVEL:
+        _emit(DEBUG, "[SUCCESS] ", _resolve(message))
 
-def error_log(message: str):
+def error_log(message: Message):
     """エラーメッセージを出力する。"""
-    print(f"[ERROR]   {message}")
+    message = _resolve(message)
+    _record("error", message)
+    _emit(ERROR, "[ERROR]   ", message)
 
-def warning_log(message: str):
+def warning_log(message: Message):
     """警告メッセージを出力する。"""
-    print(f"[WARNING] {message}")
+    message = _resolve(message)
+    _record("warning", message)
+    _emit(WARNING, "[WARNING] ", message)
+
+def report_log(message: Message):
+    """最適化レポートを出力する。"""
+    # 記録中はレポートを表示しない場合も記録する
+    if REPORT < LEVEL and _captured is None:
+        return
+    message = _resolve(message)
+    _record("report", message)
+    if REPORT >= LEVEL:
+        _emit(REPORT, "[REPORT]  ", message)
 
-def no_header_log(message: str):
+def no_header_log(message: Message):
     """ヘッダ無しでメッセージを出力する。"""
-    if DEBUG_MODE:
-        print(message)
+    if DEBUG >= LEVEL:
+        _emit(DEBUG, "", _resolve(message))
 
-def log(message: str):
+def log(message: Message):
     """常に表示したい一般メッセージを出力する。"""
+    message = _resolve(message)
     print(message)
+    _write_event("message", level=_LEVEL_NAMES[INFO], message=message)
+
+@contextmanager
+def capture() -> Iterator[list[tuple[str, str]]]:
+    """
+    ブロック内で出力したレポート・警告・エラーを (種類, メッセージ) のリストに記録する。
+    レポートは表示の有無によらず記録し、replay() で出力し直せる。
+    """
+    global _captured
+    previous, _captured = _captured, []
+    try:
+        yield _captured
+    finally:
+        records, _captured = _captured, previous
+        if previous is not None:
+            previous.extend(records)
+
+def replay(records: list[tuple[str, str]]):
+    """capture() で記録したメッセージを出力し直す。"""
+    for level, message in records:
+        if level == "report":
+            report_log(message)
+        elif level == "warning":
+            warning_log(message)
+        elif level == "error":
+            error_log(message)
+
+# --- 構造化イベント ---
+def open_event_sink(path: Path):
+    """
+    イベントを JSON Lines で path へ追記する。
+    以降は event() / timed_event() のイベントと、出力が有効なメッセージを1行ずつ書き出す。
+    """
+    global _event_sink
+    close_event_sink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _event_sink = open(path, "a", encoding="utf-8")
+
+def close_event_sink():
+    """イベントの書き出し先を閉じる。"""
+    global _event_sink
+    with _event_sink_lock:
+        sink, _event_sink = _event_sink, None
+    if sink is not None:
+        sink.close()
+
+def is_event_sink_open() -> bool:
+    """イベントの書き出し先が開いているかを返す。"""
+    return _event_sink is not None
+
+def event(name: str, **fields):
+    """名前と任意の値を持つイベントを書き出す（書き出し先がなければ何もしない）。"""
+    if _event_sink is not None:
+        _write_event(name, **fields)
+
+@contextmanager
+def timed_event(name: str, **fields) -> Iterator[dict]:
+    """
+    ブロックの実行時間を elapsed_ms として付けたイベントを書き出す。
+    ブロック内で yield された辞書に値を追加すると、イベントに含まれる。
+    """
+    if _event_sink is None:
+        yield fields
+        return
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        fields["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        _write_event(name, **fields)
+
+
+# --- ヘルパー関数 ---
+def _resolve(message: Message) -> str:
+    return message() if callable(message) else message
+
+def _emit(level: int, header: str, message: str):
+    if level >= LEVEL:
+        print(f"{header}{message}")
+        _write_event("message", level=_LEVEL_NAMES[level], message=message)
+
+def _write_event(name: str, **fields):
+    if _event_sink is None:
+        return
+    line = json.dumps({"time": round(time.time(), 6), "event": name, **fields}, ensure_ascii=False, default=str)
+    # 書き出しスレッドからも呼ばれうる
+    with _event_sink_lock:
+        if _event_sink is not None:
+            _event_sink.write(line + "\n")
+            _event_sink.flush()
+
+def _record(level: str, message: str):
+    if _captured is not None:
+        _captured.append((level, message))
@@ -1,3 +1,4 @@
+import functools
 from pathlib import Path
 from . import logger
 from .constants import (
@@ -5,14 +6,19 @@ from .constants import (
     TEMPLATE_VERSION_SINGLETON_ATTR,
     TEMPLATE_SWITCH_TO_VERSION_FUNC,
     TEMPLATE_SYNC_CALL_PLACEHOLDER,
+    TEMPLATE_INITIAL_VERSION_PLACEHOLDER,
+    TEMPLATE_SYNC_CACHE_ATTR,
+    TEMPLATE_DIRTY_FLAG_ATTR,
 )
 import ast
 
 _TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
 
+@functools.cache
 def get_template_string(template_filename: str) -> str | None:
     """
     templatesディレクトリ内のテンプレートファイルを読み込む。
+    読み込んだ内容はプロセス内で共有し、2回目以降はファイルを読まない。
 
     Args:
         template_filename: 読み込むテンプレートファイル名 (例: "stub_method_template.py")
@@ -51,9 +57,15 @@ def load_template_ast(template_filename: str) -> ast.Module | None:
         return None
     
 class TemplateRenamer(ast.NodeTransformer):
-    def __init__(self, class_name: str, sync_dispatch_chain: ast.If | None = None):
+    def __init__(self, class_name: str, sync_dispatch_chain: ast.If | None = None, initial_version: int = 1):
         self.class_name = class_name
         self.sync_dispatch_chain = sync_dispatch_chain
+        self.initial_version = initial_version
+
+    def visit_Name(self, node):
+        if node.id == TEMPLATE_INITIAL_VERSION_PLACEHOLDER:
+            return ast.Constant(value=self.initial_version)
+        return node
 
     def visit_Attribute(self, node):
         node = self.generic_visit(node)
@@ -61,6 +73,10 @@ class TemplateRenamer(ast.NodeTransformer):
             node.attr = f'_{self.class_name.lower()}_current_state'
         elif node.attr == TEMPLATE_VERSION_SINGLETON_ATTR:
             node.attr = f'_{self.class_name.upper()}_VERSION_INSTANCES_SINGLETON'
+        elif node.attr == TEMPLATE_SYNC_CACHE_ATTR:
+            node.attr = f'_{self.class_name.lower()}_sync_cache'
+        elif node.attr == TEMPLATE_DIRTY_FLAG_ATTR:
+            node.attr = f'_{self.class_name.lower()}_dirty'
         return node
     
     def visit_FunctionDef(self, node):
@@ -0,0 +1,201 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .pipeline import compile_project, execute_generated
+from .runner import load_generated_project, run_in_process
+from .scanner import snapshot_project_files
+from .util import logger
+from .util.constants import (
+    WATCH_COMMAND_BUILD,
+    WATCH_COMMAND_RUN,
+    WATCH_COMMAND_STATUS,
+    WATCH_COMMAND_STOP,
+    WATCH_POLL_INTERVAL,
+)
+
+@dataclass
+class BuildResult:
+    """監視モードでの1回のコンパイル（と実行）の結果。"""
+    succeeded: bool
+    elapsed_ms: float
+    changed_files: list[str] = field(default_factory=list)
+    error: str | None = None
+    # エントリファイルを実行した場合の標準出力
+    output: str | None = None
+
+class ProjectWatcher:
+    """
+    入力ディレクトリを監視し、変更があるたびに同じプロセス内で再コンパイルする。
+
+    インタプリタの起動とコンパイラの import は最初の1回だけで済む。出力ディレクトリは消さず、
+    前回と内容が同じファイルは書き出さない。entry_file を指定すると、コンパイル後に実行する
+    （in_process=True の場合は新しいインタプリタを起動せず、このプロセス内で実行する）。
+    serve() で UNIX ソケットを開くと、他のプロセスから1行のコマンド
+    （status / build / run / stop）を送り、JSON で結果を受け取れる。
+    """
+
+    def __init__(
+        self,
+        input_dir: Path,
+        output_dir: Path,
+        *,
+        version_selection_strategy: str | None = None,
+        entry_file: str | None = None,
+        interval: float = WATCH_POLL_INTERVAL,
+        cache_dir: Path | None = None,
+        in_process: bool = False,
+    ):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.version_selection_strategy = version_selection_strategy
+        self.entry_file = entry_file
+        self.interval = interval
+        self.cache_dir = cache_dir
+        self.in_process = in_process
+        self.build_count = 0
+        self.last_result: BuildResult | None = None
+        self._snapshot: dict[str, tuple[int, int]] = {}
+        self._output_digests: dict[Path, str] = {}
+        self._build_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._stop_lock = threading.Lock()
+        self._server: socketserver.BaseServer | None = None
+        self._socket_path: Path | None = None
+
+    def poll_changes(self) -> list[str]:
+        """前回の確認以降に追加・変更・削除されたファイルの相対パスを返す。"""
+        snapshot = snapshot_project_files(self.input_dir, [self.output_dir])
+        changed = sorted(
+            rel_path for rel_path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(rel_path) != self._snapshot.get(rel_path)
+        )
+        self._snapshot = snapshot
+        return changed
+
+    def build(self, changed_files: list[str] | None = None, *, run: bool | None = None) -> BuildResult:
+        """
+        プロジェクトを再コンパイルする。run を省略した場合は entry_file があれば実行する。
+        """
+        with self._build_lock:
+            start = time.perf_counter()
+            result = BuildResult(succeeded=True, elapsed_ms=0.0, changed_files=changed_files or [])
+            try:
+                compile_project(
+                    self.input_dir,
+                    self.output_dir,
+                    version_selection_strategy=self.version_selection_strategy,
+                    delete_output_dir=False,
+                    output_digests=self._output_digests,
+                    cache_dir=self.cache_dir,
+                )
+                if self.entry_file and (run is None or run):
+                    result.output = self._execute_entry()
+            except Exception as e:
+                result.succeeded = False
+                result.error = str(e)
+                # 出力が途中までしか書かれていない可能性があるため、次回はすべて書き直す
+                self._output_digests.clear()
+            result.elapsed_ms = (time.perf_counter() - start) * 1000
+            self.build_count += 1
+            self.last_result = result
+            return result
+
+    def run_entry(self) -> BuildResult:
+        """コンパイルせずにエントリファイルを実行する。"""
+        with self._build_lock:
+            start = time.perf_counter()
+            result = BuildResult(succeeded=True, elapsed_ms=0.0)
+            try:
+                if not self.entry_file:
+                    raise RuntimeError("No entry file is configured.")
+                result.output = self._execute_entry()
+            except Exception as e:
+                result.succeeded = False
+                result.error = str(e)
+            result.elapsed_ms = (time.perf_counter() - start) * 1000
+            return result
+
+    def watch(self) -> None:
+        """stop() が呼ばれるまで入力ディレクトリを監視し、変更のたびに再コンパイルする。"""
+        self._log_result(self.build(self.poll_changes()))
+        while not self._stopped.wait(self.interval):
+            changed_files = self.poll_changes()
+            if changed_files:
+                self._log_result(self.build(changed_files))
+
+    def stop(self) -> None:
+        """監視とソケットサーバを停止する。"""
+        self._stopped.set()
+        # ソケットの stop コマンドと呼び出し元の両方から呼ばれうる
+        with self._stop_lock:
+            server, self._server = self._server, None
+            socket_path, self._socket_path = self._socket_path, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+
+    def serve(self, socket_path: Path) -> threading.Thread:
+        """UNIX ソケットでコマンドを受け付けるスレッドを開始する。既存のソケットファイルは置き換える。"""
+        socket_path.unlink(missing_ok=True)
+        watcher = self
+
+        class _CommandHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                command = self.rfile.readline().decode("utf-8").strip()
+                response = watcher.handle_command(command)
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(socket_path), _CommandHandler)
+        self._socket_path = socket_path
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        logger.log(f"Listening on {socket_path}")
+        return thread
+
+    def handle_command(self, command: str) -> dict:
+        """ソケットから受け取ったコマンドを処理し、JSON にできる応答を返す。"""
+        if command == WATCH_COMMAND_STATUS:
+            return {
+                "build_count": self.build_count,
+                "watched_files": len(self._snapshot),
+                "last_result": asdict(self.last_result) if self.last_result else None,
+            }
+        if command == WATCH_COMMAND_BUILD:
+            return asdict(self.build(self.poll_changes()))
+        if command == WATCH_COMMAND_RUN:
+            return asdict(self.run_entry())
+        if command == WATCH_COMMAND_STOP:
+            # 応答を返してから停止する
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {"stopped": True}
+        return {"error": f"Unknown command: {command!r}"}
+
+    def _execute_entry(self) -> str:
+        if self.in_process:
+            return run_in_process(load_generated_project(self.output_dir), self.entry_file)
+        return execute_generated(self.entry_file, self.output_dir)
+
+    def _log_result(self, result: BuildResult) -> None:
+        if result.succeeded:
+            logger.log(f"Rebuilt in {result.elapsed_ms:.1f} ms ({len(result.changed_files)} changed file(s)).")
+        else:
+            logger.error_log(f"Rebuild failed after {result.elapsed_ms:.1f} ms: {result.error}")
+        if result.output:
+            logger.log(result.output)
+
+def send_watch_command(socket_path: Path, command: str, timeout: float | None = None) -> dict:
+    """監視中のプロセスへコマンドを送り、応答を返す。"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(os.fspath(socket_path))
+        client.sendall(f"{command}\n".encode("utf-8"))
+        with client.makefile("rb") as reader:
+            return json.loads(reader.readline().decode("utf-8"))
@@ -7,10 +7,14 @@ TEST_ROOT = PROJECT_ROOT / "test"
 RESOURCES_ROOT = TEST_ROOT / "resources"
 
 def pytest_addoption(parser):
-    """Adds the --target_dir command-line option to pytest."""
+    """Adds the --target_dir and --subprocess command-line options to pytest."""
     parser.addoption(
         "--target_dir", action="store", default="", help="Run tests only on a specific directory"
     )
+    parser.addoption(
+        "--subprocess", action="store_true", default=False,
+        help="Run the generated code in a new interpreter instead of in the test process"
+    )
 
 def pytest_generate_tests(metafunc):
     """
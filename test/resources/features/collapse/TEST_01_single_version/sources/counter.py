@@ -0,0 +1,14 @@
+class Base:
+    def describe(self):
+        return f"{type(self).__name__}({self.value})"
+
+class Counter__1__(Base):
+    def __init__(self, start=0):
+        self.value = start
+
+    def increment(self, step=1):
+        self.value += step
+        return self
+
+    def describe(self):
+        return "Counter: " + super().describe()
@@ -0,0 +1,12 @@
+from counter import Counter
+
+def main():
+    c = Counter(10)
+    c.increment().increment(step=5)
+    print(c.describe())
+    print(Counter().value)
+    print(hasattr(Counter, "_V1_Impl"))
+    print(Counter._switch_count)
+
+if __name__ == "__main__":
+    main()
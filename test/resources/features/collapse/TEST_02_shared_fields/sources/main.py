@@ -0,0 +1,41 @@
+class Greeter__1__:
+    def __init__(self, name):
+        self.name = name
+
+    def greet(self):
+        return f"Hello, {self.name}!"
+
+class Greeter__2__:
+    def __init__(self, name):
+        self.name = name
+
+    def greet(self):
+        return f"Hi, {self.name}!"
+
+class Shape__1__:
+    def __init__(self, width):
+        self.width = width
+
+    def area(self):
+        return self.width * self.width
+
+class Shape__2__:
+    def __init__(self, radius):
+        self.radius = radius
+
+    def area(self):
+        return 3 * self.radius * self.radius
+
+def main():
+    g = Greeter("Alice")
+    print(g.greet())
+    print(hasattr(Greeter, "_V1_Impl"))
+
+    s = Shape(2)
+    print(s.area())
+    c = Shape(radius=2)
+    print(c.area())
+    print(hasattr(Shape, "_V1_Impl"))
+
+if __name__ == "__main__":
+    main()
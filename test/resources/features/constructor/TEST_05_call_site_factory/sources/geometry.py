@@ -0,0 +1,8 @@
+from shapes.vector import Vector as V
+
+def make_all():
+    flat = V(1, -2)
+    deep = V(1, 2, 3)
+    args = (4, 5)
+    dynamic = V(*args)
+    return flat, deep, dynamic
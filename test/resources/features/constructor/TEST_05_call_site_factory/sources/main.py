@@ -0,0 +1,12 @@
+from geometry import make_all
+from shapes.vector import Vector
+
+def main():
+    flat, deep, dynamic = make_all()
+    print(flat.norm1(), deep.norm1(), dynamic.norm1())
+    print(deep.scaled(2).norm1())
+    print(isinstance(flat, Vector), isinstance(deep.scaled(1), Vector))
+    print(Vector._switch_count)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+class Vector__1__:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def norm1(self):
+        return abs(self.x) + abs(self.y)
+
+class Vector__2__:
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def norm1(self):
+        return abs(self.x) + abs(self.y) + abs(self.z)
+
+    def scaled(self, k):
+        return Vector(self.x * k, self.y * k, z=self.z * k)
@@ -0,0 +1,17 @@
+class Cell__1__:
+    def __init__(self, raw, note="-"):
+        self.raw = raw
+        self.note = note
+
+    def show(self):
+        return f"v1 {self.raw} {self.note}"
+
+class Cell__2__:
+    def __init__(self, raw, scale=1):
+        self.raw = raw * scale
+
+    def show(self):
+        return f"v2 {self.raw}"
+
+    def double(self):
+        return self.raw * 2
@@ -0,0 +1,24 @@
+from cell import Cell
+
+def main():
+    # バージョンを一度だけ決め、初期化子をまとめて呼ぶ
+    cells = Cell.build_many(2, [(1,), (2, 10), (3,)])
+    print([c.show() for c in cells])
+    print([c.double() for c in cells])
+
+    # 列ごとの値から __dict__ を直接作り、初期化子を呼ばない
+    rows = Cell.build_columns(1, raw=[4, 5], note=["a", "b"])
+    print([r.show() for r in rows], rows[1].note)
+    print(isinstance(rows[0], Cell))
+
+    try:
+        Cell.build_columns(1, raw=[1, 2], note=["x"])
+    except ValueError as e:
+        print("ValueError")
+    try:
+        Cell.build_many(3, [])
+    except ValueError as e:
+        print(e)
+    print(Cell._switch_count)
+
+main()
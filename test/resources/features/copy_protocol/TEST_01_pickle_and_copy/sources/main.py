@@ -0,0 +1,33 @@
+import copy
+import pickle
+
+from node import Node
+
+def current_state(obj):
+    # 実装シングルトンへの参照（内部フィールド）
+    return next(value for name, value in vars(obj).items() if name.endswith("_current_state"))
+
+def main():
+    a = Node("a")
+    b = Node("b")
+    a.next = b
+    b.next = a
+    b.shout()
+
+    # 循環参照を含むグラフを pickle で往復させる
+    a2 = pickle.loads(pickle.dumps(a))
+    b2 = a2.next
+    print(a2.show(), b2.shout(), b2.next is a2)
+    print(current_state(b2) is current_state(b), current_state(a2) is current_state(a))
+
+    # deepcopy も実装シングルトンを複製しない
+    a3 = copy.deepcopy(a)
+    print(a3.next.next is a3, current_state(a3.next) is current_state(b))
+    print(sorted(name for name in vars(a3) if not name.endswith("_current_state")))
+
+    # copy はフィールドを共有する
+    b4 = copy.copy(b)
+    print(b4.next is a, b4.shout(), b4 is not b)
+    print(Node._switch_count)
+
+main()
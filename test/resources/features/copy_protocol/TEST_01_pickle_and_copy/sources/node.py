@@ -0,0 +1,15 @@
+class Node__1__:
+    def __init__(self, label):
+        self.label = label
+        self.next = None
+
+    def show(self):
+        return f"v1:{self.label}"
+
+class Node__2__:
+    def __init__(self, label):
+        self.label = label
+        self.next = None
+
+    def shout(self):
+        return f"v2:{self.label.upper()}"
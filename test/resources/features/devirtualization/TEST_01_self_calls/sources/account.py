@@ -0,0 +1,27 @@
+class Account__1__:
+    def __init__(self, balance):
+        self.balance = balance
+
+    def deposit(self, amount):
+        self.balance = self.add_fee(self.balance + amount)
+        return self.describe()
+
+    def add_fee(self, value):
+        return value - 1
+
+    def describe(self):
+        return f"v1 balance={self.balance}"
+
+    def audit(self):
+        self.freeze()
+        return self.describe()
+
+class Account__2__:
+    def __init__(self, balance):
+        self.balance = balance
+
+    def describe(self):
+        return f"v2 balance={self.balance}"
+
+    def freeze(self):
+        self.frozen = True
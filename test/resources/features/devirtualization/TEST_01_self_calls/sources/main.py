@@ -0,0 +1,13 @@
+from account import Account
+
+def main():
+    account = Account(10)
+    print(account.deposit(5))
+    print(account.deposit(5))
+    print(type(account)._switch_count)
+    # freeze() は v2 にしかないため切替が起き、続く describe() は v2 の実装になる
+    print(account.audit())
+    print(type(account)._switch_count)
+
+if __name__ == "__main__":
+    main()
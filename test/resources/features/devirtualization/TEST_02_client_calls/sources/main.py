@@ -0,0 +1,47 @@
+class Counter__1__:
+    def __init__(self):
+        self.count = 0
+
+    def inc(self):
+        self.count += 1
+        return self.count
+
+    def name(self):
+        return "v1"
+
+class Counter__2__:
+    def __init__(self):
+        self.count = 0
+
+    def name(self):
+        return "v2"
+
+    def double(self):
+        self.count *= 2
+        return self.count
+
+def bump(counter):
+    return counter.double()
+
+def main():
+    # 生成直後はバージョン 1 と分かるため、スタブを経由せずに呼び出す
+    c = Counter()
+    for _ in range(3):
+        c.inc()
+    print(c.name())
+    # ミスでバージョン 2 へ切り替わった後も、バージョンを追跡できる
+    print(c.double())
+    print(c.name())
+    if c.count > 2:
+        c.inc()
+    # 分岐の合流後はバージョンが定まらないため、スタブを経由する
+    print(c.name(), c.count)
+
+    # 関数へ渡した後は別名から切り替えられうる
+    d = Counter()
+    print(d.name())
+    bump(d)
+    print(d.name())
+    print(Counter._switch_count)
+
+main()
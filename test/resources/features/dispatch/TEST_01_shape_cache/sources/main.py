@@ -0,0 +1,49 @@
+class Formatter__1__:
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def render(self, text, upper=False):
+        value = f"{self.prefix}{text}"
+        return value.upper() if upper else value
+
+    def parse(self, text):
+        return int(text)
+
+class Formatter__2__:
+    def __init__(self, prefix, *, width):
+        self.prefix = prefix
+        self.width = width
+
+    def render(self, text, *, fill, align="<"):
+        return f"{self.prefix}{text:{fill}{align}5}"
+
+    def parse(self, text, base):
+        return int(text, base)
+
+def main():
+    f = Formatter("> ")
+    print(f.render("a"))
+    print(f.render("b", upper=True))
+    print(f.render("c", align=">", fill="."))
+    print(f.render("d", fill="-", align="^"))
+    print(f.render(text="e"))
+    print(Formatter._switch_count)
+    # 同じ呼び出し形はキャッシュされ、キーワードの順序は区別しない
+    print(sorted(Formatter._FORMATTER_DISPATCH_CACHE))
+
+    # メソッド本体で送出された TypeError は別バージョンへの切替の契機にならない
+    try:
+        f.parse(None)
+    except TypeError:
+        print("TypeError")
+    print(Formatter._switch_count)
+
+    g = Formatter("# ", width=6)
+    print(g.render("x", fill="*"))
+    try:
+        f.render()
+    except TypeError as e:
+        print(e)
+
+if __name__ == "__main__":
+    main()
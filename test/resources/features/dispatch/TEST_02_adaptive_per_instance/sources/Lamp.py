@@ -0,0 +1,10 @@
+class Lamp__1__:
+    def __init__(self, name):
+        self.name = name
+
+    def on(self):
+        print(self.name, "on")
+
+class Lamp__2__:
+    def off(self):
+        print(self.name, "off")
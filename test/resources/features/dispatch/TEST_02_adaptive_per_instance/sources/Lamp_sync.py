@@ -0,0 +1 @@
+ADAPTIVE_THRESHOLD = 2
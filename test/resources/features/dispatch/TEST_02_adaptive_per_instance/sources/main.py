@@ -0,0 +1,15 @@
+from Lamp import Lamp
+
+first = Lamp("first")
+second = Lamp("second")
+for _ in range(4):
+    first.on()
+    first.off()
+# first は往復が続いたため、以後は切り替えずに実装を借りる
+print(Lamp._switch_count)
+
+# 往復の記録はインスタンスごとのため、second は切り替えながら呼び出す
+second.on()
+second.off()
+second.on()
+print(Lamp._switch_count)
@@ -0,0 +1,13 @@
+from shape import Shape__1__, Shape__2__
+
+class Circle__1__(Shape__1__):
+    def __init__(self, r):
+        self.name = "circle"
+        self.r = r
+
+    def area(self):
+        return 3 * self.r * self.r
+
+class Circle__2__(Shape__2__):
+    def perimeter(self):
+        return 6 * self.r
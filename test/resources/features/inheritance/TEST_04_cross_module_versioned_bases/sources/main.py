@@ -0,0 +1,12 @@
+from circle import Circle
+from square import Square
+
+circle = Circle(2)
+print(circle.describe())
+print(circle.area())
+print(circle.perimeter())
+
+square = Square(3)
+print(square.describe())
+print(square.area())
+print(square.perimeter())
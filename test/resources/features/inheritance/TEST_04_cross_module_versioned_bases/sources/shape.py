@@ -0,0 +1,7 @@
+class Shape__1__:
+    def describe(self):
+        return f"{self.name} (v1)"
+
+class Shape__2__:
+    def describe(self):
+        return f"{self.name} (v2)"
@@ -0,0 +1,13 @@
+import shape
+
+class Square__1__(shape.Shape__1__):
+    def __init__(self, side):
+        self.name = "square"
+        self.side = side
+
+    def area(self):
+        return self.side * self.side
+
+class Square__2__(shape.Shape__2__):
+    def perimeter(self):
+        return 4 * self.side
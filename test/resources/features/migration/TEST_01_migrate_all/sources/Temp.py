@@ -0,0 +1,13 @@
+class Temp__1__:
+    def __init__(self, celsius):
+        self.celsius = celsius
+
+    def show(self):
+        return f"{self.celsius}C"
+
+class Temp__2__:
+    def __init__(self, fahrenheit):
+        self.fahrenheit = fahrenheit
+
+    def show(self):
+        return f"{self.fahrenheit}F"
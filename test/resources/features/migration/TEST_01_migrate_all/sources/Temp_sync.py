@@ -0,0 +1,7 @@
+def _sync_from_v1_to_v2(wrapper_obj):
+    wrapper_obj.fahrenheit = wrapper_obj.celsius * 9 // 5 + 32
+    del wrapper_obj.celsius
+
+def _sync_from_v2_to_v1(wrapper_obj):
+    wrapper_obj.celsius = (wrapper_obj.fahrenheit - 32) * 5 // 9
+    del wrapper_obj.fahrenheit
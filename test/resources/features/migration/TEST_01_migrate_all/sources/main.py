@@ -0,0 +1,25 @@
+from Temp import Temp
+
+def main():
+    temps = [Temp(0), Temp(100), Temp(-40)]
+    # 生存インスタンスをまとめて同期し、切り替える
+    print(Temp.migrate_all(2))
+    print([t.show() for t in temps], Temp._switch_count)
+
+    # 遅延移行: エポックを進めるだけで、各オブジェクトは次のアクセス時に移行する
+    Temp.migrate_all(1, lazy=True)
+    print(Temp._switch_count)
+    print(temps[0].show(), Temp._switch_count)
+    print([t.show() for t in temps], Temp._switch_count)
+
+    # 移行を指示した後に生成したオブジェクトは移行しない
+    Temp.migrate_all(2, lazy=True)
+    fresh = Temp(5)
+    print(fresh.show(), temps[2].show())
+
+    # 回収されたインスタンスは対象にならない
+    del temps[1:]
+    print(Temp.migrate_all(2))
+    print(temps[0].show(), fresh.show())
+
+main()
@@ -0,0 +1,49 @@
+class Meter__1__:
+    def __init__(self):
+        self.value = 0
+
+    def add(self, amount):
+        self.value += amount
+        return self.value
+
+    def name(self):
+        return "v1"
+
+class Meter__2__:
+    def __init__(self):
+        self.value = 0
+
+    def scale(self, factor):
+        self.value *= factor
+        return self.value
+
+    def name(self):
+        return "v2"
+
+def main():
+    m = Meter()
+    m.add(3)
+    # 入るときに一度だけ切り替え、ビューからはバージョン 2 の実装を直接呼び出す
+    with m.pinned(2) as v:
+        for _ in range(3):
+            v.scale(2)
+        print(v.name(), v.value)
+        # 同じバージョンへの入れ子のピン留めは切り替えない
+        with m.pinned(2) as inner:
+            print(inner.name())
+        print(m.name())
+        # ピン留め中の切替は失敗する
+        try:
+            m.add(1)
+        except RuntimeError as e:
+            print("RuntimeError:", e)
+        try:
+            with m.pinned(1):
+                pass
+        except RuntimeError as e:
+            print("RuntimeError:", e)
+    # 抜けるとピン留め前のバージョンへ戻る
+    print(m.name(), m.value)
+    print(Meter._switch_count)
+
+main()
@@ -0,0 +1,30 @@
+class Document__1__:
+    def __init__(self, title):
+        self.title = title
+
+    def render(self):
+        return f"<h1>{self.title}</h1>"
+
+    def unused_helper(self):
+        return "never called"
+
+class Document__2__:
+    def __init__(self, title):
+        self.title = title
+
+    def render(self):
+        return f"# {self.title}"
+
+    def word_count(self):
+        return len(self.title.split())
+
+class Document__3__:
+    def __init__(self, title, body):
+        self.title = title
+        self.body = body
+
+    def render(self):
+        return f"{self.title}\n{self.body}"
+
+    def summary(self):
+        return self.body[:10]
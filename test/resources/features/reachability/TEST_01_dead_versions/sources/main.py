@@ -0,0 +1,12 @@
+from document import Document
+
+def main():
+    doc = Document("Multi version objects")
+    print(doc.render())
+    print(doc.word_count())
+    print(doc.render())
+    print(hasattr(type(doc), "_V1_Impl"), hasattr(type(doc), "_V2_Impl"), hasattr(type(doc), "_V3_Impl"))
+    print([name for name in vars(type(doc)) if not name.startswith("_")])
+
+if __name__ == "__main__":
+    main()
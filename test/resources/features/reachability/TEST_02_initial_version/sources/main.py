@@ -0,0 +1,40 @@
+class Temperature__1__:
+    def __init__(self, celsius):
+        self.celsius = celsius
+
+    def show(self):
+        print(f"{self.celsius} C")
+
+class Temperature__2__:
+    def __init__(self, celsius, unit):
+        self.celsius = celsius
+        self.unit = unit
+
+    def show(self):
+        print(f"{self.celsius} C ({self.unit})")
+
+    def to_fahrenheit(self):
+        return self.celsius * 9 / 5 + 32
+
+class Temperature__4__:
+    def __init__(self, celsius, unit):
+        self.celsius = celsius
+        self.unit = unit
+
+    def show(self):
+        print(f"{self.celsius} C [{self.unit}]")
+
+    def to_kelvin(self):
+        return self.celsius + 273.15
+
+def main():
+    t = Temperature(20, unit="metric")
+    t.show()
+    print(t.to_fahrenheit())
+    print(t.to_kelvin())
+    t.show()
+    print(Temperature._switch_count)
+    print(sorted(Temperature._TEMPERATURE_VERSION_INSTANCES_SINGLETON))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+class Vec__1__:
+    def __init__(self, x):
+        self.x = x
+
+    def grow(self):
+        return type(self)(self.x, 1)
+
+    def show(self):
+        print("v1", self.x)
+
+class Vec__2__:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def grow(self):
+        return type(self)(self.x, self.y + 1)
+
+    def show(self):
+        print("v2", self.x, self.y)
+
+class Pair__1__:
+    def __init__(self, left):
+        self.left = left
+
+    def widen(self):
+        return self.__class__(self.left, self.left * 2)
+
+    def show(self):
+        print("pair v1", self.left)
+
+class Pair__2__:
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def widen(self):
+        return self.__class__(self.left, self.right * 2)
+
+    def show(self):
+        print("pair v2", self.left, self.right)
+
+def main():
+    Vec(3).grow().show()
+    Pair(4).widen().show()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+from sink import Sink
+
+def main():
+    sink = Sink()
+    print("hello", file=sink)
+    print("world", file=sink, flush=True)
+    print(repr(sink.text()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+class Sink__1__:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, text):
+        self.chunks.append(text)
+
+    def flush(self):
+        pass
+
+    def text(self):
+        return "".join(self.chunks)
+
+class Sink__2__:
+    def __init__(self):
+        self.chunks = []
+
+    def text(self):
+        return "".join(reversed(self.chunks))
@@ -0,0 +1,19 @@
+import os
+
+from point import Point
+
+def list_outputs(root):
+    names = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = sorted(d for d in dir_names if d != "__pycache__")
+        for name in sorted(file_names):
+            names.append(os.path.relpath(os.path.join(dir_path, name), root))
+    return names
+
+if __name__ == "__main__":
+    p = Point(3, -4)
+    print(p.norm1())
+    print(p.scaled(2))
+    print(p.norm1())
+    for name in list_outputs(os.path.dirname(os.path.abspath(__file__))):
+        print(name)
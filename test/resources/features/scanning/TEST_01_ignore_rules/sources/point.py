@@ -0,0 +1,15 @@
+class Point__1__:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def norm1(self):
+        return abs(self.x) + abs(self.y)
+
+class Point__2__:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def scaled(self, k):
+        return (self.x * k, self.y * k)
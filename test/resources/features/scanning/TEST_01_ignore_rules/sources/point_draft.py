@@ -0,0 +1,3 @@
+class Point__3__:
+    def broken(self:
+        pass
@@ -0,0 +1,4 @@
+from point import Point
+
+class Point__1__:
+    pass
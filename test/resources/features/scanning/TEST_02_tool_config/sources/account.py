@@ -0,0 +1,38 @@
+class Account__1__:
+    __incompatible__ = ["balance"]
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.balance = 0
+
+    def deposit(self, amount):
+        self.balance += amount
+
+    def describe(self):
+        return f"v1 {self.owner}: {self.balance}"
+
+class Account__2__:
+    __incompatible__ = ["cents"]
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.cents = 0
+
+    def describe(self):
+        return f"v2 {self.owner}: {self.cents} cents"
+
+    def audit(self):
+        return "audit v2"
+
+class Account__3__:
+    __incompatible__ = ["cents"]
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.cents = 0
+
+    def describe(self):
+        return f"v3 {self.owner}: {self.cents} cents"
+
+    def audit(self):
+        return "audit v3"
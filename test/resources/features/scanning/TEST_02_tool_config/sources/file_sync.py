@@ -0,0 +1,3 @@
+# 名前が *_sync.py でも、同期モジュールとして宣言していなければ通常のモジュール
+def sync_files(names):
+    return sorted(set(names))
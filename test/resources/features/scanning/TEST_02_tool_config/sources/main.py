@@ -0,0 +1,10 @@
+from account import Account
+from file_sync import sync_files
+
+if __name__ == "__main__":
+    a = Account("alice")
+    a.deposit(3)
+    print(a.describe())
+    print(a.audit())
+    print(a.describe())
+    print(sync_files(["b", "a", "b"]))
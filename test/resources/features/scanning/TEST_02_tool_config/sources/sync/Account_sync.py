@@ -0,0 +1,7 @@
+def _sync_from_v1_to_v2(wrapper_obj):
+    wrapper_obj._cents = wrapper_obj._balance * 100
+    del wrapper_obj._balance
+
+def _sync_from_v1_to_v3(wrapper_obj):
+    wrapper_obj._cents = wrapper_obj._balance * 100
+    del wrapper_obj._balance
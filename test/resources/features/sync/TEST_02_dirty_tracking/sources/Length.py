@@ -0,0 +1,13 @@
+class Length__1__:
+    def __init__(self, mm):
+        self.mm = mm
+
+    def in_mm(self):
+        return f"{self.mm} mm"
+
+class Length__2__:
+    def in_cm(self):
+        return f"{self.cm} cm"
+
+    def grow_cm(self, delta):
+        self.cm += delta
@@ -0,0 +1,11 @@
+DIRTY_TRACKING = True
+
+def _sync_from_v1_to_v2(wrapper_obj):
+    print("sync v1 -> v2")
+    wrapper_obj.cm = wrapper_obj.mm / 10
+    del wrapper_obj.mm
+
+def _sync_from_v2_to_v1(wrapper_obj):
+    print("sync v2 -> v1")
+    wrapper_obj.mm = wrapper_obj.cm * 10
+    del wrapper_obj.cm
@@ -0,0 +1,12 @@
+from Length import Length
+
+length = Length(250)
+print(length.in_mm())
+print(length.in_cm())
+# v2 では書き込んでいないため、同期せずに切替前の状態へ戻る
+print(length.in_mm())
+print(length.in_cm())
+length.grow_cm(5)
+# v2 で書き込んだため同期が必要
+print(length.in_mm())
+print(Length._switch_count)
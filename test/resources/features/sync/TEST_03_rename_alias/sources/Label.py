@@ -0,0 +1,10 @@
+class Label__1__:
+    def __init__(self, text):
+        self.text = text
+
+    def shout(self):
+        return self.text.upper()
+
+class Label__2__:
+    def caption(self):
+        return f"[{self.caption_text}]"
@@ -0,0 +1,7 @@
+def _sync_from_v1_to_v2(wrapper_obj):
+    wrapper_obj._caption_text = wrapper_obj._text
+    del wrapper_obj._text
+
+def _sync_from_v2_to_v1(wrapper_obj):
+    wrapper_obj._text = wrapper_obj._caption_text
+    del wrapper_obj._caption_text
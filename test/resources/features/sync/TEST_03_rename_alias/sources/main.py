@@ -0,0 +1,9 @@
+from Label import Label
+
+label = Label("hello")
+print(label.shout())
+print(label.caption())
+label.caption_text = "bye"
+print(label.shout())
+print(label.text, label.caption_text)
+print(Label._switch_count)
@@ -0,0 +1,14 @@
+class Temp__1__:
+    def __init__(self, c):
+        self.c = c
+
+    def describe(self):
+        return f"{self.c} C"
+
+class Temp__2__:
+    def describe(self):
+        return f"{self.k} K"
+
+class Temp__3__:
+    def to_f(self):
+        return self.f
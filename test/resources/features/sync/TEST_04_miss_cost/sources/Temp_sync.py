@@ -0,0 +1,32 @@
+# v3 -> v1 の変換は高コストとみなす
+SYNC_COSTS = {(3, 1): 5}
+
+def _sync_from_v1_to_v2(wrapper_obj):
+    print("sync 1 -> 2")
+    wrapper_obj.k = wrapper_obj.c + 273
+    del wrapper_obj.c
+
+def _sync_from_v2_to_v1(wrapper_obj):
+    print("sync 2 -> 1")
+    wrapper_obj.c = wrapper_obj.k - 273
+    del wrapper_obj.k
+
+def _sync_from_v1_to_v3(wrapper_obj):
+    print("sync 1 -> 3")
+    wrapper_obj.f = wrapper_obj.c * 9 // 5 + 32
+    del wrapper_obj.c
+
+def _sync_from_v3_to_v1(wrapper_obj):
+    print("sync 3 -> 1")
+    wrapper_obj.c = (wrapper_obj.f - 32) * 5 // 9
+    del wrapper_obj.f
+
+def _sync_from_v2_to_v3(wrapper_obj):
+    print("sync 2 -> 3")
+    wrapper_obj.f = (wrapper_obj.k - 273) * 9 // 5 + 32
+    del wrapper_obj.k
+
+def _sync_from_v3_to_v2(wrapper_obj):
+    print("sync 3 -> 2")
+    wrapper_obj.k = (wrapper_obj.f - 32) * 5 // 9 + 273
+    del wrapper_obj.f
@@ -0,0 +1,8 @@
+from Temp import Temp
+
+temp = Temp(10)
+print(temp.describe())
+print(temp.to_f())
+# describe は v1 と v2 にあるが、v3 からは v2 への同期の方が安い
+print(temp.describe())
+print(Temp._switch_count)
@@ -0,0 +1,13 @@
+class Length__1__:
+    def __init__(self, mm):
+        self.mm = mm
+
+    def in_mm(self):
+        return self.mm
+
+class Length__2__:
+    def in_cm(self):
+        return self.cm
+
+    def grow_cm(self, delta):
+        self.cm += delta
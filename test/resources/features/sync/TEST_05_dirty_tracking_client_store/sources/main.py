@@ -0,0 +1,9 @@
+from Length import Length
+
+length = Length(250)
+print(length.in_mm())
+print(length.in_cm())
+# クラスの外から書き込んだ値も、切り戻し後に反映される
+length.cm = 100
+print(length.in_mm())
+print(Length._switch_count)
@@ -0,0 +1,15 @@
+class Basket__1__:
+    def __init__(self, items):
+        self.items = items
+
+    def count(self):
+        return len(self.items)
+
+class Basket__2__:
+    def total(self):
+        return sum(self.prices)
+
+    def add(self, price):
+        # ローカル変数を通した変更も書き込みとして扱う
+        prices = self.prices
+        prices.append(price)
@@ -0,0 +1,11 @@
+DIRTY_TRACKING = True
+
+def _sync_from_v1_to_v2(wrapper_obj):
+    print("sync v1 -> v2")
+    wrapper_obj.prices = list(wrapper_obj.items)
+    del wrapper_obj.items
+
+def _sync_from_v2_to_v1(wrapper_obj):
+    print("sync v2 -> v1")
+    wrapper_obj.items = list(wrapper_obj.prices)
+    del wrapper_obj.prices
@@ -0,0 +1,11 @@
+from Basket import Basket
+
+basket = Basket([100, 200])
+print(basket.count())
+print(basket.total())
+# v2 では書き込んでいないため、同期せずに切替前の状態へ戻る
+print(basket.count())
+basket.add(300)
+# v2 で別名を通して書き込んだため同期が必要
+print(basket.count())
+print(Basket._switch_count)
@@ -0,0 +1,18 @@
+class Temp__1__:
+    def __init__(self, c):
+        self.c = c
+
+    def show(self):
+        print("c", self.c)
+
+class Temp__2__:
+    def show(self):
+        print("k", self.k)
+
+class Temp__3__:
+    def fahrenheit(self):
+        print("f", self.f)
+
+class Temp__4__:
+    def rankine(self):
+        print("r", self.r)
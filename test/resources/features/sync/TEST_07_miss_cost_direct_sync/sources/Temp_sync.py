@@ -0,0 +1,22 @@
+# v3 からは v4 を経由すると v1 に安く戻れるが、切替時に実行されるのは直接の同期関数のみ
+SYNC_COSTS = {(3, 2): 3}
+
+def _sync_from_v1_to_v3(wrapper_obj):
+    print("sync 1 -> 3")
+    wrapper_obj.f = wrapper_obj.c * 9 // 5 + 32
+    del wrapper_obj.c
+
+def _sync_from_v3_to_v2(wrapper_obj):
+    print("sync 3 -> 2")
+    wrapper_obj.k = (wrapper_obj.f - 32) * 5 // 9 + 273
+    del wrapper_obj.f
+
+def _sync_from_v3_to_v4(wrapper_obj):
+    print("sync 3 -> 4")
+    wrapper_obj.r = wrapper_obj.f + 460
+    del wrapper_obj.f
+
+def _sync_from_v4_to_v1(wrapper_obj):
+    print("sync 4 -> 1")
+    wrapper_obj.c = (wrapper_obj.r - 492) * 5 // 9
+    del wrapper_obj.r
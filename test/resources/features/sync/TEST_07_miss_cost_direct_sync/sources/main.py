@@ -0,0 +1,9 @@
+from Temp import Temp
+
+def show_rankine(temp):
+    temp.rankine()
+
+temp = Temp(100)
+temp.fahrenheit()
+# v3 には直接の同期関数 3 -> 1 がないため、show を定義するもう一方の v2 へ切り替える
+temp.show()
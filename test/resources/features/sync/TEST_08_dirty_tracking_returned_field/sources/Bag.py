@@ -0,0 +1,19 @@
+class Bag__1__:
+    def __init__(self, items):
+        self.items = items
+
+    def show(self):
+        print(self.items)
+
+class Bag__2__:
+    def get(self):
+        # 呼び出し元へ渡したフィールドは、その先で変更されうる
+        return self.items2
+
+    def add_checked(self, value):
+        try:
+            if value < 0:
+                raise ExceptionGroup("invalid", [ValueError(value)])
+            self.items2.append(value)
+        except* ValueError:
+            self.items2.append(0)
@@ -0,0 +1,9 @@
+DIRTY_TRACKING = True
+
+def _sync_from_v1_to_v2(wrapper_obj):
+    wrapper_obj.items2 = list(wrapper_obj.items)
+    del wrapper_obj.items
+
+def _sync_from_v2_to_v1(wrapper_obj):
+    wrapper_obj.items = list(wrapper_obj.items2)
+    del wrapper_obj.items2
@@ -0,0 +1,12 @@
+from Bag import Bag
+
+def main():
+    b = Bag([1])
+    b.show()
+    b.get().append(5)
+    b.show()
+    b.add_checked(-1)
+    b.show()
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,13 @@ from mvo_compiler.mvo_compiler import compile, execute
 TEST_ROOT = Path(__file__).resolve().parent
 RESOURCES_ROOT = TEST_ROOT / "resources"
 
-def test_transpilation_and_execution(input_dir: Path, tmp_path: Path):
+def test_transpilation_and_execution(input_dir: Path, tmp_path: Path, request):
     """
     Each test case will run the transpiler and execute the generated code,
     then compare the output with the expected output.
 
     The "input_dir" argument is dynamically provided by conftest.py.
+    The generated code runs in the test process unless --subprocess is given.
     """
     # --- 1. Arrange ---
     input_dir = input_dir / "sources"
@@ -21,7 +22,8 @@ def test_transpilation_and_execution(input_dir: Path, tmp_path: Path):
 
     # --- 2. Act ---
     compile(input_dir, tmp_path)
-    actual_output = execute("main.py", tmp_path)
+    in_process = not request.config.getoption("--subprocess")
+    actual_output = execute("main.py", tmp_path, in_process=in_process)
 
     # --- 3. Assert ---
     assert expected_output.strip().replace('\r\n', '\n') == actual_output.strip().replace('\r\n', '\n'), "Runtime output does not match expected output."